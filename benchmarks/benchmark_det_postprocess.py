@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""benchmark_det_postprocess.py
+比較文字偵測後處理的速度：原本逐輪廓的 DBPostProcess 與向量化的 VectorizedDBPostProcess。
+
+提供 --images 時以 det 模型對考卷頁面圖片推論，記錄實際輸出的機率圖再量測；
+否則使用模擬的考卷機率圖（每頁 --lines 行）。同時回報兩者框數與座標的最大差異。
+
+    python benchmarks/benchmark_det_postprocess.py --model-dir model --images page_images
+    python benchmarks/benchmark_det_postprocess.py --pages 20 --lines 300
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+from extractor.db_postprocess import VectorizedDBPostProcess
+
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+def make_exam_map(line_count: int, rng: np.random.Generator,
+                  height: int = 1600, width: int = 1216) -> Tuple[np.ndarray, np.ndarray]:
+    """產生模擬的 det 輸出：雙欄排列的文字行，回傳 (maps, shape_list)"""
+    pred = np.zeros((height, width), dtype=np.float32)
+    rows = max(line_count // 2, 1)
+    row_height = (height - 20) // rows
+    line_height = max(min(row_height - 4, 14), 4)
+    for i in range(line_count):
+        column, row = divmod(i, rows)
+        x0 = 20 + column * (width // 2) + int(rng.integers(0, 10))
+        x1 = x0 + int(rng.integers(60, width // 2 - 40))
+        y0 = 10 + row * row_height
+        pred[y0:y0 + line_height, x0:x1] = rng.uniform(0.6, 0.95)
+    pred += rng.uniform(0.0, 0.1, pred.shape).astype(np.float32) * (pred > 0)
+    shape_list = np.array([[height * 2, width * 2, 0.5, 0.5]])
+    return pred[np.newaxis, np.newaxis], shape_list
+
+
+def record_det_maps(model_dir: Path, image_dir: Path, limit: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """以 det 模型推論考卷圖片，記錄後處理的輸入"""
+    import cv2
+    from doc_page_extractor import HuggingfaceModel
+    from extractor.ocr import ExamOCR
+
+    detector = ExamOCR("cpu", HuggingfaceModel(model_dir))._get_text_system().text_detector
+    postprocess = detector.postprocess_op
+    recorded = []
+
+    def record(outs_dict, shape_list):
+        recorded.append((outs_dict["maps"].copy(), shape_list.copy()))
+        return postprocess(outs_dict, shape_list)
+
+    detector.postprocess_op = record
+    paths = [p for p in sorted(image_dir.rglob("*")) if p.suffix.lower() in IMAGE_SUFFIXES][:limit]
+    for path in paths:
+        image = cv2.imread(str(path))
+        if image is not None:
+            detector(image)
+    return recorded
+
+
+def run(postprocess, samples) -> Tuple[list, float]:
+    start_time = time.perf_counter()
+    results = [postprocess({"maps": maps}, shape_list)[0]["points"] for maps, shape_list in samples]
+    return results, time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DB text-detection post-processing: per-contour loop vs vectorized")
+    parser.add_argument("--model-dir", type=Path, default=Path("model"), help="模型快取資料夾 (default: model)")
+    parser.add_argument("--images", type=Path, help="考卷頁面圖片資料夾，提供時使用實際的 det 輸出")
+    parser.add_argument("--pages", type=int, default=20, help="頁數 (default: 20)")
+    parser.add_argument("--lines", type=int, default=300, help="模擬頁面的文字行數 (default: 300)")
+    parser.add_argument("--repeat", type=int, default=3, help="重複次數，取最快一次 (default: 3)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from doc_page_extractor.onnxocr.db_postprocess import DBPostProcess
+
+    if args.images:
+        samples = record_det_maps(args.model_dir, args.images, args.pages)
+        print(f"🔍 det 實際輸出：{len(samples)} 頁")
+    else:
+        rng = np.random.default_rng(args.seed)
+        samples = [make_exam_map(args.lines, rng) for _ in range(args.pages)]
+        print(f"🔍 模擬機率圖：{len(samples)} 頁，每頁 {args.lines} 行")
+    if not samples:
+        print("❌ 沒有可用的頁面")
+        return
+
+    # 與 doc_page_extractor 預設的偵測參數相同
+    params = dict(thresh=0.3, box_thresh=0.6, max_candidates=1000, unclip_ratio=1.5)
+    original = DBPostProcess(**params)
+    vectorized = VectorizedDBPostProcess.from_postprocess(original)
+
+    reference, original_time = min((run(original, samples) for _ in range(args.repeat)), key=lambda r: r[1])
+    results, vectorized_time = min((run(vectorized, samples) for _ in range(args.repeat)), key=lambda r: r[1])
+
+    box_count = sum(len(boxes) for boxes in reference)
+    count_mismatch = sum(len(a) != len(b) for a, b in zip(reference, results))
+    max_offset = max(
+        (int(np.abs(np.asarray(a) - np.asarray(b)).max()) for a, b in zip(reference, results) if len(a) == len(b) and len(a)),
+        default=0,
+    )
+
+    print(f"{'方式':<12}{'毫秒/頁':>10}{'加速':>10}")
+    for name, elapsed in (("original", original_time), ("vectorized", vectorized_time)):
+        print(f"{name:<12}{elapsed / len(samples) * 1000:>10.2f}{original_time / elapsed:>9.2f}x")
+    print(f"📊 共 {box_count} 個框；框數不同 {count_mismatch} 頁，座標最大差異 {max_offset} 像素")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""benchmark_docx_reader.py
+比較讀取 .docx 段落文字的時間與峰值記憶體：python-docx 的 Document(path).paragraphs
+與 docx_reader.iter_docx_paragraphs 的串流解析。未指定檔案時以 python-docx 產生一份考卷大小的測試檔。
+同時檢查兩者輸出的段落文字完全相同。
+
+    python benchmarks/benchmark_docx_reader.py exams/*.docx --repeat 5
+    python benchmarks/benchmark_docx_reader.py --paragraphs 5000
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+from docx import Document
+
+sys.path.append(str(Path(__file__).parent.parent))
+from parsers.docx_reader import iter_docx_paragraphs
+
+
+def make_docx(paragraphs: int, path: Path) -> Path:
+    doc = Document()
+    doc.add_paragraph("一、單選題：每題2分")
+    for n in range(1, paragraphs // 2 + 1):
+        p = doc.add_paragraph(f"(　{'ABCD'[n % 4]}　) {n}.\t")
+        p.add_run("下列有關").bold = True
+        p.add_run(f"第{n}題敘述　何者正確？")
+        doc.add_paragraph("(A) 甲選項\t(B) 乙選項\t(C) 丙選項\t(D) 丁選項")
+    doc.save(path)
+    return path
+
+
+def python_docx_paragraphs(path: Path) -> List[str]:
+    return [p.text for p in Document(path).paragraphs]
+
+
+def streaming_paragraphs(path: Path) -> List[str]:
+    return list(iter_docx_paragraphs(path))
+
+
+def measure(reader: Callable[[Path], List[str]], files: List[Path], repeat: int) -> Tuple[float, int, List[List[str]]]:
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        results = [reader(path) for path in files]
+    elapsed = (time.perf_counter() - start_time) / repeat
+
+    peak = 0
+    for path in files:
+        tracemalloc.start()
+        reader(path)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return elapsed, peak, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark python-docx paragraphs vs streaming docx reader")
+    parser.add_argument("files", nargs="*", type=Path, help="要讀取的 .docx (default: 自動產生)")
+    parser.add_argument("--paragraphs", type=int, default=2000, help="自動產生的測試檔段落數 (default: 2000)")
+    parser.add_argument("--repeat", type=int, default=5, help="重複次數 (default: 5)")
+    args = parser.parse_args()
+
+    files = args.files or [make_docx(args.paragraphs, Path(tempfile.mkdtemp()) / "exam.docx")]
+    print(f"🔍 {len(files)} 個檔案，重複 {args.repeat} 次")
+
+    baseline_seconds, baseline_peak, expected = measure(python_docx_paragraphs, files, args.repeat)
+    seconds, peak, results = measure(streaming_paragraphs, files, args.repeat)
+    mismatches = sum(a != b for a, b in zip(expected, results))
+
+    print(f"{'讀取方式':<20}{'時間(ms)':>10}{'峰值記憶體(KB)':>16}")
+    print(f"{'python-docx':<20}{baseline_seconds * 1000:>10.1f}{baseline_peak / 1024:>16.0f}")
+    print(f"{'iter_docx_paragraphs':<20}{seconds * 1000:>10.1f}{peak / 1024:>16.0f}")
+    print(f"📊 加速 {baseline_seconds / seconds:.1f}x，峰值記憶體 {peak / max(baseline_peak, 1):.1%}")
+    if mismatches:
+        print(f"❌ {mismatches} 個檔案的段落文字不一致")
+        sys.exit(1)
+    print("✅ 段落文字與 python-docx 完全相同")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""benchmark_layoutreader_inference.py
+比較 LayoutReader 在 CPU 上的推論速度：
+    eager       PyTorch 模型逐頁推論（原本的行為）
+    onnx        layoutreader.onnx 逐頁推論
+    onnx-batch  layoutreader.onnx 依方塊數排序後分批推論
+    int8-batch  layoutreader.int8.onnx 分批推論
+測試頁面為模擬的考卷版面（雙欄文字行、選項列），方塊數在 --min-boxes 與 --max-boxes 之間。
+同時回報各方式與 eager 順序不一致的頁數。
+
+    python tools/export_layoutreader.py --model-dir <dir> --quantize
+    python benchmarks/benchmark_layoutreader_inference.py --model-dir <dir> --pages 50
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+import torch
+
+sys.path.append(str(Path(__file__).parent.parent))
+from extractor.layout_order import load_layoutreader_mmap
+from extractor.layoutreader_onnx import (
+    LAYOUTREADER_INT8_ONNX_NAME,
+    LAYOUTREADER_ONNX_NAME,
+    LayoutReaderONNX,
+    parse_logits,
+)
+
+DEFAULT_MODEL_DIR = Path("model/models--hantian--layoutreader/snapshots/629be376d86fbab624ddc4020804a4e93b5515bc")
+
+
+def make_exam_page(box_count: int, rng: random.Random) -> List[List[int]]:
+    """產生雙欄考卷版面的方塊（已縮放到 0-1000 並排序）"""
+    boxes = []
+    line_height = 18
+    for i in range(box_count):
+        column = i * 2 // box_count
+        row = i % max(box_count // 2, 1)
+        x0 = 60 + column * 480 + rng.randint(0, 8)
+        y0 = 50 + row * (900 // max(box_count // 2, 1))
+        width = rng.randint(120, 420)
+        boxes.append([x0, y0, min(x0 + width, 1000), min(y0 + line_height, 1000)])
+    boxes.sort()
+    return boxes
+
+
+def eager_orders(model, pages: List[List[List[int]]]) -> List[List[int]]:
+    results = []
+    with torch.no_grad():
+        for boxes in pages:
+            input_ids = torch.tensor([[0] + [3] * len(boxes) + [2]])
+            bbox = torch.tensor([[[0, 0, 0, 0]] + boxes + [[0, 0, 0, 0]]])
+            logits = model(input_ids=input_ids, bbox=bbox, attention_mask=torch.ones_like(input_ids)).logits
+            results.append(parse_logits(logits[0].numpy(), len(boxes)))
+    return results
+
+
+def timed(function, *args):
+    start_time = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LayoutReader inference on CPU: eager PyTorch vs exported ONNX")
+    parser.add_argument("--model-dir", type=Path, default=DEFAULT_MODEL_DIR, help="layoutreader snapshot 資料夾")
+    parser.add_argument("--pages", type=int, default=50, help="測試頁數 (default: 50)")
+    parser.add_argument("--min-boxes", type=int, default=20)
+    parser.add_argument("--max-boxes", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    pages = [make_exam_page(rng.randint(args.min_boxes, args.max_boxes), rng) for _ in range(args.pages)]
+    print(f"🔍 {len(pages)} 頁，平均 {sum(map(len, pages)) / len(pages):.0f} 個方塊，torch threads: {torch.get_num_threads()}")
+
+    model = load_layoutreader_mmap(args.model_dir)
+    eager_orders(model, pages[:1])
+    reference, eager_time = timed(eager_orders, model, pages)
+    rows = [("eager", eager_time, 0)]
+
+    readers = []
+    onnx_path = args.model_dir / LAYOUTREADER_ONNX_NAME
+    int8_path = args.model_dir / LAYOUTREADER_INT8_ONNX_NAME
+    if onnx_path.exists():
+        reader = LayoutReaderONNX(onnx_path, batch_size=args.batch_size)
+        readers += [("onnx", reader, True), ("onnx-batch", reader, False)]
+    if int8_path.exists():
+        readers.append(("int8-batch", LayoutReaderONNX(int8_path, batch_size=args.batch_size), False))
+    if not readers:
+        print(f"   ⚠️  {args.model_dir} 沒有匯出的 ONNX 模型，請先執行 tools/export_layoutreader.py")
+
+    for name, reader, per_page in readers:
+        reader.order(pages[0])
+        if per_page:
+            orders, elapsed = timed(lambda: [reader.order(boxes) for boxes in pages])
+        else:
+            orders, elapsed = timed(reader.order_many, pages)
+        mismatches = sum(order != expected for order, expected in zip(orders, reference))
+        rows.append((name, elapsed, mismatches))
+
+    print(f"{'方式':<12}{'頁/秒':>10}{'加速':>10}{'順序不同':>10}")
+    for name, elapsed, mismatches in rows:
+        print(f"{name:<12}{len(pages) / elapsed:>10.2f}{eager_time / elapsed:>9.2f}x{mismatches:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""benchmark_layoutreader_loading.py
+比較 LayoutReader 的兩種載入方式：
+    bin   from_pretrained 讀取 pytorch_model.bin（原本的行為，每個 worker 一份複本）
+    mmap  以記憶體映射讀取 safetensors（ExamLayoutOrder 的 CPU 路徑）
+同時啟動多個 worker，全部載入完成後才量測記憶體，回報冷啟動時間與每個 worker 的
+RSS / USS（該行程獨占）/ PSS（共用頁面按行程數均分）。
+
+    python benchmarks/benchmark_layoutreader_loading.py --workers 4
+"""
+
+import argparse
+import multiprocessing as mp
+import queue
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+DEFAULT_MODEL_DIR = Path("model/models--hantian--layoutreader/snapshots/629be376d86fbab624ddc4020804a4e93b5515bc")
+
+
+def _worker(mode: str, model_dir: str, results, release):
+    import psutil
+
+    start_time = time.perf_counter()
+    if mode == "bin":
+        from transformers import LayoutLMv3ForTokenClassification
+        model = LayoutLMv3ForTokenClassification.from_pretrained(
+            model_dir, local_files_only=True, use_safetensors=False,
+        ).eval()
+    else:
+        from extractor.layout_order import load_layoutreader_mmap
+        model = load_layoutreader_mmap(Path(model_dir))
+    load_time = time.perf_counter() - start_time
+
+    # 跑一次推論，確認權重真的被讀進來
+    import torch
+    with torch.no_grad():
+        input_ids = torch.tensor([[0, 3, 3, 2]])
+        bbox = torch.tensor([[[0, 0, 0, 0], [100, 100, 200, 120], [100, 140, 200, 160], [0, 0, 0, 0]]])
+        model(input_ids=input_ids, bbox=bbox, attention_mask=torch.ones_like(input_ids))
+
+    results.put(("loaded", load_time))
+    release.wait()
+    memory = psutil.Process().memory_full_info()
+    results.put(("memory", load_time, memory.rss, memory.uss, getattr(memory, "pss", 0)))
+
+
+def _collect(results, processes) -> tuple:
+    """等待任一 worker 回報；worker 異常結束時直接中止"""
+    while True:
+        try:
+            return results.get(timeout=1)
+        except queue.Empty:
+            failed = [p.exitcode for p in processes if p.exitcode not in (None, 0)]
+            if failed:
+                raise RuntimeError(f"worker 異常結束 (exit code {failed[0]})")
+
+
+def run_mode(mode: str, model_dir: Path, workers: int) -> dict:
+    """同時啟動 workers 個行程以指定方式載入模型"""
+    ctx = mp.get_context("spawn")
+    results = ctx.Queue()
+    release = ctx.Event()
+    processes = [ctx.Process(target=_worker, args=(mode, str(model_dir), results, release)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    for _ in processes:
+        _collect(results, processes)
+    release.set()
+    samples = [_collect(results, processes) for _ in processes]
+    for process in processes:
+        process.join()
+
+    mb = 1024 * 1024
+    return {
+        "load_time": statistics.median(s[1] for s in samples),
+        "rss": statistics.mean(s[2] for s in samples) / mb,
+        "uss": statistics.mean(s[3] for s in samples) / mb,
+        "pss": statistics.mean(s[4] for s in samples) / mb,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LayoutReader cold start and per-worker memory: .bin vs mmap safetensors")
+    parser.add_argument("--model-dir", type=Path, default=DEFAULT_MODEL_DIR, help="layoutreader snapshot 資料夾")
+    parser.add_argument("--workers", type=int, default=4, help="同時載入的 worker 數 (default: 4)")
+    parser.add_argument("--modes", nargs="+", choices=["bin", "mmap"], default=["bin", "mmap"])
+    args = parser.parse_args()
+
+    print(f"🔍 模型: {args.model_dir}，worker 數: {args.workers}")
+    print(f"{'方式':<8}{'冷啟動':>10}{'RSS/worker':>14}{'USS/worker':>14}{'PSS/worker':>14}")
+    for mode in args.modes:
+        stats = run_mode(mode, args.model_dir, args.workers)
+        print(f"{mode:<8}{stats['load_time']:>9.2f}s{stats['rss']:>11.0f} MB{stats['uss']:>11.0f} MB{stats['pss']:>11.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""benchmark_math_conversion.py
+比較數學符號轉 LaTeX 的速度：原本逐條 re.sub 套用規則，與整理成 translate 對照表加上
+預編譯結構規則的 convert_math_expressions。同時確認兩者輸出完全相同。
+另外比較 format_math_for_web 一次算出所有欄位（原本的 dict）與只讀取 display_text 的 MathText，
+回報時間與 tracemalloc 量到的記憶體峰值。
+
+提供 --corpus 時讀取資料夾內轉換好的數學考卷 Markdown，以段落（空行分隔）為單位量測；
+否則使用模擬的數學題目文字。
+
+    python benchmarks/benchmark_math_conversion.py --corpus output/math
+    python benchmarks/benchmark_math_conversion.py --texts 5000
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.append(str(Path(__file__).parent.parent))
+from parsers.math_conversion import MathText, convert_math_expressions, convert_sequential
+
+SAMPLE_PIECES = [
+    "設 *a* 為實數，且 ∣a－3∣＜2，則", "3/4＋1/6＝", "x²＋2x－3＝0 的兩根為 α、β，",
+    "求 √12×√3 之值", "已知 △ABC 中，∠A＝60°", "若 2^x＝8，則 x＝", "下列何者正確？",
+    "(A) 1/2 (B) 2/3 (C) 3/4 (D) 4/5", "f(x)≥0 恆成立", "π≈3.14", "甲、乙、丙三人",
+    "<u>　12　</u>", "![](media/image3.png)", "每題 5 分，共 40 分",
+]
+
+
+def load_corpus(corpus_dir: Path) -> List[str]:
+    """讀取考卷 Markdown，以空行分隔的段落為單位"""
+    texts = []
+    for path in sorted(corpus_dir.rglob("*.md")):
+        content = path.read_text(encoding="utf-8")
+        texts.extend(block.strip() for block in content.split("\n\n") if block.strip())
+    return texts
+
+
+def make_texts(count: int, rng: random.Random) -> List[str]:
+    return [" ".join(rng.choice(SAMPLE_PIECES) for _ in range(rng.randint(1, 6))) for _ in range(count)]
+
+
+def timed(function: Callable[[str], str], texts: List[str], repeat: int):
+    best, results = float("inf"), []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        results = [function(text) for text in texts]
+        best = min(best, time.perf_counter() - start_time)
+    return results, best
+
+
+def eager_format(text: str) -> dict:
+    """原本 format_math_for_web 的做法：所有欄位都先算好"""
+    return dict(MathText(text))
+
+
+def lazy_display(text: str) -> str:
+    return MathText(text).display_text
+
+
+def traced(function: Callable[[str], object], texts: List[str]):
+    """回傳 (保留所有結果時的記憶體峰值 bytes, 時間)"""
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    results = [function(text) for text in texts]
+    elapsed = time.perf_counter() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+    return peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark math symbol to LaTeX conversion")
+    parser.add_argument("--corpus", type=Path, help="數學考卷 Markdown 資料夾")
+    parser.add_argument("--texts", type=int, default=5000, help="沒有 --corpus 時模擬的段落數 (default: 5000)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.corpus:
+        texts = load_corpus(args.corpus)
+        if not texts:
+            print(f"❌ {args.corpus} 中沒有 Markdown 檔案")
+            return
+    else:
+        texts = make_texts(args.texts, random.Random(args.seed))
+    total_chars = sum(map(len, texts))
+    print(f"🔍 {len(texts)} 段文字，共 {total_chars} 字")
+
+    reference, sequential_time = timed(convert_sequential, texts, args.repeat)
+    results, staged_time = timed(convert_math_expressions, texts, args.repeat)
+    mismatches = sum(a != b for a, b in zip(reference, results))
+
+    print(f"{'方式':<12}{'總時間(ms)':>12}{'µs/段':>10}{'加速':>10}")
+    for name, elapsed in (("sequential", sequential_time), ("staged", staged_time)):
+        print(f"{name:<12}{elapsed * 1000:>12.1f}{elapsed * 1e6 / len(texts):>10.1f}{sequential_time / elapsed:>9.2f}x")
+    print(f"{'✅' if mismatches == 0 else '❌'} 輸出不同的段落數: {mismatches}")
+
+    print(f"\n{'格式化':<12}{'總時間(ms)':>12}{'記憶體峰值(KB)':>16}")
+    for name, function in (("eager dict", eager_format), ("lazy display", lazy_display)):
+        peak, elapsed = traced(function, texts)
+        print(f"{name:<12}{elapsed * 1000:>12.1f}{peak / 1024:>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
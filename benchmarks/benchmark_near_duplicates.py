@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""benchmark_near_duplicates.py
+量測 MinHash/LSH 近似重複偵測在不同題庫大小下的速度與召回率：
+產生隨機題目，再加入一定比例帶 OCR 雜訊（換字、標點、全形數字、選項順序打亂）的副本，
+檢查每個副本是否找到原題。每題耗時應大致固定（不隨題數平方成長）。
+
+    python benchmarks/benchmark_near_duplicates.py --sizes 10000 50000 200000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.append(str(Path(__file__).parent.parent))
+from parsers.near_duplicates import THRESHOLD, NearDuplicateIndex
+
+CHARS = "的一是在不了有和人中大為上個國以要他時來用們生到作地於出就分對成會可主發年動同工也能下過子說產種面而方後多定行學法所民得經之進著等部度家電力如水化高自理起小物現實加量都兩體制機當使點從業本去把性好應開它合還因由其些然前外天政日那社義事平形相全表間樣與關各重新線內數正心反明看原又利比或但質氣第向道命此變條只沒結解問意建月公無系軍"
+
+
+def make_question(rng: random.Random) -> Dict:
+    return {
+        "question": "".join(rng.choice(CHARS) for _ in range(rng.randint(20, 60))) + "？",
+        "options": {letter: "".join(rng.choice(CHARS) for _ in range(rng.randint(2, 8))) for letter in "ABCD"},
+    }
+
+
+def add_noise(question: Dict, rng: random.Random) -> Dict:
+    text = list(question["question"])
+    for _ in range(max(1, len(text) // 40)):
+        text[rng.randrange(len(text))] = rng.choice(CHARS)
+    values = list(question["options"].values())
+    rng.shuffle(values)
+    return {"question": f"１２．{''.join(text).replace('？', '?')}", "options": dict(zip("ABCD", values))}
+
+
+def make_corpus(size: int, noisy_ratio: float, rng: random.Random) -> Tuple[List[Dict], Dict[int, int]]:
+    originals = [make_question(rng) for _ in range(size)]
+    copies = {}
+    questions = list(originals)
+    for source in rng.sample(range(size), int(size * noisy_ratio)):
+        copies[len(questions)] = source
+        questions.append(add_noise(originals[source], rng))
+    return questions, copies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MinHash/LSH near-duplicate detection")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 40000], help="原始題數 (default: 10000 40000)")
+    parser.add_argument("--noisy", type=float, default=0.05, help="帶雜訊副本的比例 (default: 0.05)")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--batch", type=int, default=10000, help="每批加入的題數 (default: 10000)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'題數':>10}{'總時間(秒)':>12}{'µs/題':>10}{'召回率':>8}{'誤報':>8}")
+    for size in args.sizes:
+        questions, copies = make_corpus(size, args.noisy, random.Random(args.seed))
+        index = NearDuplicateIndex(args.threshold)
+        found, false_positives = 0, 0
+        start_time = time.perf_counter()
+        for start in range(0, len(questions), args.batch):
+            batch = questions[start:start + args.batch]
+            for n, matches in enumerate(index.add_many(batch), start):
+                keys = {int(key) for key, _ in matches}
+                if n in copies and copies[n] in keys:
+                    found += 1
+                false_positives += len(keys - {copies.get(n)})
+        elapsed = time.perf_counter() - start_time
+        recall = found / max(len(copies), 1)
+        print(f"{len(questions):>10}{elapsed:>12.2f}{elapsed * 1e6 / len(questions):>10.1f}{recall:>8.1%}{false_positives:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""benchmark_onnx_startup.py
+量測 OCR 模型的 session 建立時間：不使用快取、第一次建立快取、載入快取。
+每次量測都在新的子行程中進行，模擬批次轉換時短命 worker 的啟動成本。
+
+    python benchmarks/benchmark_onnx_startup.py --model-dir model --repeat 5
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+ROOT_DIR = Path(__file__).parent.parent
+OCR_ONNX_MODELS = (
+    ("ppocrv4", "det", "det.onnx"),
+    ("ppocrv4", "cls", "cls.onnx"),
+    ("ppocrv4", "rec", "rec.onnx"),
+)
+
+_CHILD_SCRIPT = """
+import sys, time
+sys.path.insert(0, {root!r})
+from extractor.onnx_session import create_onnx_session
+start = time.perf_counter()
+create_onnx_session({model!r}, use_gpu=False, cache_dir={cache!r})
+print(time.perf_counter() - start)
+"""
+
+
+def time_session_start(model_path: Path, cache_dir=None) -> float:
+    """在新的子行程中建立 session，回傳耗時（秒）"""
+    script = _CHILD_SCRIPT.format(root=str(ROOT_DIR), model=str(model_path),
+                                  cache=str(cache_dir) if cache_dir else None)
+    output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def find_onnx_ocr_dir(model_dir: Path) -> Path:
+    """在模型快取資料夾中找出 PP-OCR 模型所在位置"""
+    for det_path in model_dir.rglob("det.onnx"):
+        if det_path.parent.name == "det" and det_path.parent.parent.name == "ppocrv4":
+            return det_path.parent.parent.parent
+    raise FileNotFoundError(f"在 {model_dir} 找不到 ppocrv4/det/det.onnx")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ONNX session start-up with and without the optimized-graph cache")
+    parser.add_argument("--model-dir", type=Path, default=Path("model"), help="模型快取資料夾 (default: model)")
+    parser.add_argument("--repeat", type=int, default=5, help="每種情境重複次數 (default: 5)")
+    args = parser.parse_args()
+
+    onnx_ocr_dir = find_onnx_ocr_dir(args.model_dir)
+    print(f"🔍 模型位置: {onnx_ocr_dir}")
+    print(f"{'模型':<10}{'無快取':>12}{'建立快取':>12}{'載入快取':>12}{'加速':>10}")
+
+    for parts in OCR_ONNX_MODELS:
+        model_path = onnx_ocr_dir.joinpath(*parts)
+        no_cache = [time_session_start(model_path) for _ in range(args.repeat)]
+        cold, warm = [], []
+        for _ in range(args.repeat):
+            with tempfile.TemporaryDirectory() as cache_dir:
+                cold.append(time_session_start(model_path, cache_dir))
+                warm.append(time_session_start(model_path, cache_dir))
+        baseline = statistics.median(no_cache)
+        cached = statistics.median(warm)
+        print(f"{parts[-1]:<10}{baseline * 1000:>10.1f}ms{statistics.median(cold) * 1000:>10.1f}ms"
+              f"{cached * 1000:>10.1f}ms{baseline / cached:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
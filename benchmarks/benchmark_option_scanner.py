@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""benchmark_option_scanner.py
+最壞情況的選項切分與行首比對：OCR 常產生很長、沒有結尾標記的行，
+原本 lazy 量詞加 lookahead（或相鄰 \\s*）的 regex 在這些行上會回溯成平方時間。
+這裡對每種惡意輸入、不同長度分別量測舊 regex 與現在的線性掃描，並確認結果相同。
+
+    python benchmarks/benchmark_option_scanner.py --sizes 1000 4000 16000
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+sys.path.append(str(Path(__file__).parent.parent))
+from parsers.exam_lexer import HEADER_RE, LEAD_RE, option_items, scan_markers
+from parsers.normalize import fold_width
+
+OLD_OPTION_RE = re.compile(r"[（(]([Ａ-ＤABCD])[）)]\s*([^（()]+?)(?=[（(][Ａ-ＤABCD][）)]|$)")
+OLD_LEAD_RE = re.compile(r"[（(]\s*([Ａ-ＦA-F]?)\s*[）)]\s*")
+OLD_HEADER_RE = re.compile(r"(?:#+\s*)?(\*\*)?\s*(?:([一二三四五六七八九十]+)、|[AＡBＢ]部分)")
+
+# 名稱 -> 依長度 n 產生惡意輸入
+ADVERSARIAL: Dict[str, Callable[[int], str]] = {
+    "option + spaces, no end": lambda n: "(A)" + " " * n + "x)",
+    "many options, no stops": lambda n: "(A)" * (n // 3) + "x" * n,
+    "options + unclosed text": lambda n: "(A)x " * (n // 5) + "(",
+    "lead paren + spaces": lambda n: "(" + " " * n + "x",
+    "header # + spaces": lambda n: "#" + " " * n + "x",
+}
+
+
+def old_options(text: str) -> List[Tuple[str, str]]:
+    return [(m.group(1), m.group(2).strip()) for m in OLD_OPTION_RE.finditer(text)]
+
+
+def new_options(text: str) -> List[Tuple[str, str]]:
+    items = option_items(text, scan_markers(text), "ＡＢＣＤABCD", stops="（()", terminated=True, nonempty=True)
+    return [(item.letter, item.content) for item in items]
+
+
+def old_prefixes(text: str):
+    lead, header = OLD_LEAD_RE.match(text), OLD_HEADER_RE.match(text)
+    return (lead and (lead.end(), lead.group(1))), (header and header.span())
+
+
+def new_prefixes(text: str):
+    folded = fold_width(text)
+    lead, header = LEAD_RE.match(folded), HEADER_RE.match(folded)
+    return (lead and (lead.end(), text[lead.start(1):lead.end(1)] if lead.group(1) else "")), (header and header.span())
+
+
+def timed(func: Callable, text: str) -> Tuple[float, object]:
+    start_time = time.perf_counter()
+    result = func(text)
+    return time.perf_counter() - start_time, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worst-case benchmark: backtracking regexes vs linear option scanner")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 4000, 16000], help="惡意輸入的長度 (default: 1000 4000 16000)")
+    args = parser.parse_args()
+
+    print(f"{'輸入':<28}{'長度':>8}{'regex(ms)':>12}{'掃描(ms)':>12}")
+    mismatches = 0
+    for name, make in ADVERSARIAL.items():
+        for size in args.sizes:
+            text = make(size)
+            old_seconds, old_result = timed(old_options, text)
+            new_seconds, new_result = timed(new_options, text)
+            prefix_old_seconds, prefix_old = timed(old_prefixes, text)
+            prefix_new_seconds, prefix_new = timed(new_prefixes, text)
+            mismatches += (old_result != new_result) + (prefix_old != prefix_new)
+            print(f"{name:<28}{len(text):>8}{(old_seconds + prefix_old_seconds) * 1000:>12.2f}"
+                  f"{(new_seconds + prefix_new_seconds) * 1000:>12.2f}")
+
+    if mismatches:
+        print(f"❌ {mismatches} 組結果與舊 regex 不同")
+        sys.exit(1)
+    print("✅ 所有輸入的結果與舊 regex 相同")
+
+
+if __name__ == "__main__":
+    main()
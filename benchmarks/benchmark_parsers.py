@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""benchmark_parsers.py
+各科 parser 的速度與正確率：以 tests/fixtures/parsers 的黃金測試資料量測
+
+* 正確率：每份考卷解析一次，與 .expected.json 比對（漏題數、找到率、完全正確率）
+* 速度：把考卷的行重複 --repeat 次當成一份大考卷，取 --rounds 次中最快的一次，換算每秒行數與題數
+* 記憶體：以 tracemalloc 量測解析重複後考卷的峰值
+
+加上 --history 會把結果連同目前的 commit 附加到 JSONL，方便比較每個 commit 的變化。
+
+    python benchmarks/benchmark_parsers.py
+    python benchmarks/benchmark_parsers.py --repeat 500 --history benchmarks/parser_history.jsonl
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.append(str(Path(__file__).parent.parent))
+from parsers.corpus import parser_for
+from parsers.golden import FIXTURE_ROOT, find_fixtures, load_expected, parse_fixture, read_fixture, score_questions
+
+
+def current_commit() -> str:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=Path(__file__).parent, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return result.stdout.strip()
+
+
+def benchmark_fixture(path: Path, root: Path, repeat: int, rounds: int) -> Dict:
+    lines = read_fixture(path)
+    score = score_questions(load_expected(path), parse_fixture(path, lines))
+
+    document = lines * repeat
+    best, questions = float("inf"), 0
+    for _ in range(rounds):
+        start_time = time.perf_counter()
+        questions = len(parse_fixture(path, document))
+        best = min(best, time.perf_counter() - start_time)
+
+    tracemalloc.start()
+    parse_fixture(path, document)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "fixture": path.relative_to(root).as_posix(),
+        "parser": parser_for(str(path)),
+        "expected": score.expected,
+        "parsed": score.parsed,
+        "lost": len(score.lost),
+        "wrong": len(score.wrong),
+        "recall": round(score.recall, 4),
+        "accuracy": round(score.accuracy, 4),
+        "lines_per_sec": round(len(document) / best),
+        "questions_per_sec": round(questions / best),
+        "peak_mb": round(peak / 1024 / 1024, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parser throughput and accuracy on golden fixtures")
+    parser.add_argument("--root", default=str(FIXTURE_ROOT), help="黃金測試資料資料夾 (default: tests/fixtures/parsers)")
+    parser.add_argument("--repeat", type=int, default=200, help="量測速度時考卷重複的次數 (default: 200)")
+    parser.add_argument("--rounds", type=int, default=3, help="速度量測次數，取最快的一次 (default: 3)")
+    parser.add_argument("--history", help="把結果附加到這個 JSONL 檔")
+    args = parser.parse_args()
+
+    root = Path(args.root)
+    fixtures = find_fixtures(root)
+    if not fixtures:
+        print(f"❌ {args.root} 中沒有黃金測試資料")
+        sys.exit(1)
+
+    results: List[Dict] = []
+    print(f"{'考卷':<42}{'parser':<9}{'題數':>6}{'漏題':>6}{'錯誤':>6}{'正確率':>8}{'行/秒':>10}{'題/秒':>10}{'峰值MB':>8}")
+    for path in fixtures:
+        result = benchmark_fixture(path, root, args.repeat, args.rounds)
+        results.append(result)
+        print(f"{result['fixture']:<42}{result['parser']:<9}{result['expected']:>6}{result['lost']:>6}{result['wrong']:>6}"
+              f"{result['accuracy']:>8.1%}{result['lines_per_sec']:>10}{result['questions_per_sec']:>10}{result['peak_mb']:>8.2f}")
+
+    expected = sum(r["expected"] for r in results)
+    exact = sum(r["expected"] - r["lost"] - r["wrong"] for r in results)
+    lost = sum(r["lost"] for r in results)
+    print(f"\n📊 共 {expected} 題，完全正確 {exact} 題（{exact / expected:.1%}），漏題 {lost} 題")
+    if lost:
+        print("⚠️ 有題目沒有被擷取，詳見上表的漏題欄")
+
+    if args.history:
+        record = {"commit": current_commit(), "time": datetime.now().isoformat(timespec="seconds"),
+                  "repeat": args.repeat, "results": results}
+        with open(args.history, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        print(f"✅ 結果已附加到 {args.history}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""benchmark_question_records.py
+比較題目輸出格式的時間與記憶體：原本每題都解析檔案路徑、建立 10 個欄位 dict 的做法，
+與同一檔案共用 FileInfo 的 QuestionRecord。記憶體以 tracemalloc 量測保留所有題目時平均每題的用量。
+
+    python benchmarks/benchmark_question_records.py --files 2000 --questions 40
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+sys.path.append(str(Path(__file__).parent.parent))
+from parsers.base_parser import extract_file_info, file_info, question_record
+
+SUBJECTS = ("Math", "Chinese", "English", "Physics_and_Chemistry", "Biology", "History", "Geography")
+PUBLISHERS = ("Hanlin", "Knsh", "Nani")
+
+
+def make_files(count: int, rng: random.Random) -> List[str]:
+    return [
+        f"input_md/{rng.choice(('111A', '111B', '112A'))}/{rng.randint(7, 9)}/{rng.choice(PUBLISHERS)}/"
+        f"{rng.choice(SUBJECTS)}/Ch{rng.randint(1, 6)}-{i}.md"
+        for i in range(count)
+    ]
+
+
+def legacy_question_dict(question_text, options, answer, file_path):
+    """原本的 standard_question_dict：每題重新解析檔案路徑"""
+    info = extract_file_info(file_path)
+    return {
+        "question": question_text,
+        "options": options,
+        "image_path": None,
+        "scope": info["scope"],
+        "grade": info["grade"],
+        "subject": info["subject"],
+        "semester": info["semester"],
+        "publisher": info["publisher"],
+        "chapter": info["chapter"],
+        "answer": answer,
+    }
+
+
+def build(factory: Callable, files: List[str], questions_per_file: int) -> Tuple[list, float]:
+    start_time = time.perf_counter()
+    questions = [
+        factory(f"第 {n} 題題目", {"A": "甲", "B": "乙", "C": "丙", "D": "丁"}, "A", file_path)
+        for file_path in files
+        for n in range(questions_per_file)
+    ]
+    return questions, time.perf_counter() - start_time
+
+
+def measure(factory: Callable, files: List[str], questions_per_file: int) -> Tuple[float, int]:
+    file_info.cache_clear()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    questions, elapsed = build(factory, files, questions_per_file)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, (after - before) // max(len(questions), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark question dicts vs compact question records")
+    parser.add_argument("--files", type=int, default=2000, help="檔案數 (default: 2000)")
+    parser.add_argument("--questions", type=int, default=40, help="每個檔案的題數 (default: 40)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    files = make_files(args.files, random.Random(args.seed))
+    total = args.files * args.questions
+    print(f"🔍 {args.files} 個檔案，共 {total} 題")
+
+    print(f"{'格式':<24}{'總時間(ms)':>12}{'µs/檔案':>10}{'bytes/題':>10}")
+    rows = (("dict per question", legacy_question_dict), ("question_record", question_record))
+    for name, factory in rows:
+        elapsed, per_question = measure(factory, files, args.questions)
+        print(f"{name:<24}{elapsed * 1000:>12.1f}{elapsed * 1e6 / args.files:>10.1f}{per_question:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 import os
 import sys
 from pathlib import Path
-from pdf_craft import create_pdf_page_extractor, MarkDownWriter, ExtractedTableFormat, analyse, CorrectionMode
+from pdf_craft import create_pdf_page_extractor, PDFPageExtractor, MarkDownWriter, ExtractedTableFormat, analyse, CorrectionMode
 import time
 import re
 import multiprocessing as mp
@@ -13,10 +13,19 @@ import psutil
 import gc
 import traceback
 import logging
+from extractor.doc_extractor import ExamDocExtractor
+from extractor.text_system import OCRRoutingStats, diff_routing_stats
+from parsers.blocks import BlockWriter, blocks_path_for
+from parsers.profiling import active_profiler, enable_profiling, profiled
 
+@profiled("convert", lambda pdf_path, output_dir, *args, **kwargs: Path(output_dir) / f"{Path(pdf_path).stem}.md")
 def convert_pdf_to_markdown(pdf_path, output_dir, image_output_dir, extractor, encoding="utf-8", 
-                          enable_multilingual_ocr=True):
-    """轉換單個PDF檔案為Markdown，支援多重OCR"""
+                          enable_multilingual_ocr=True, doc_extractor=None):
+    """轉換單個PDF檔案為Markdown，支援多重OCR
+
+    enable_multilingual_ocr 啟用時，每頁先判斷主要是中文或英文，再交給對應的單一辨識模型；
+    需傳入 doc_extractor（ExamDocExtractor）才能切換與統計。
+    """
     try:
         # 驗證PDF檔案
         is_valid, validation_msg = validate_pdf_file(pdf_path)
@@ -31,15 +40,25 @@ def convert_pdf_to_markdown(pdf_path, output_dir, image_output_dir, extractor, e
         output_md_path = output_dir / f"{pdf_name}.md"
         print(f"🔄 正在轉換: {pdf_path.name}")
         print(f"   🌐 多語言OCR: {'啟用' if enable_multilingual_ocr else '停用'}")
+        routing_before = None
+        if doc_extractor is not None:
+            doc_extractor.set_multilingual_ocr(enable_multilingual_ocr)
+            if doc_extractor.ocr_routing_stats is not None:
+                routing_before = doc_extractor.ocr_routing_stats.snapshot()
         start_time = time.time()
         try:
-            with MarkDownWriter(output_md_path, image_output_dir, encoding) as md:
-                for block in extractor.extract(str(pdf_path)):
-                    md.write(block)
+            # 同時輸出帶型別、頁碼與 bbox 的區塊檔，parser 讀區塊檔時不必從 Markdown 猜回區塊型別
+            with BlockWriter(blocks_path_for(output_md_path), encoding) as blocks, \
+                    MarkDownWriter(output_md_path, image_output_dir, encoding) as md:
+                for page_index, page_blocks, _ in extractor.extract_enumerated_blocks_and_image(str(pdf_path)):
+                    for block in page_blocks:
+                        md.write(block)
+                        blocks.write(block, page_index)
         except ModuleNotFoundError as module_error:
             if "struct_eqtable" in str(module_error):
                 print(f"   ⚠️  跳過此檔案 - 表格處理模組缺失")
                 print(f"   📝 創建基本文字版本...")
+                blocks_path_for(output_md_path).unlink(missing_ok=True)
                 with open(output_md_path, 'w', encoding=encoding) as f:
                     f.write(f"# {pdf_name}\n\n")
                     f.write(f"*此檔案因表格處理模組缺失而無法完整轉換*\n\n")
@@ -56,6 +75,13 @@ def convert_pdf_to_markdown(pdf_path, output_dir, image_output_dir, extractor, e
         elapsed_time = time.time() - start_time
         print(f"✅ 完成轉換: {pdf_name} (耗時: {elapsed_time:.2f}秒)")
         print(f"   輸出檔案: {output_md_path}")
+        routing_stats = doc_extractor.ocr_routing_stats if doc_extractor is not None else None
+        if routing_stats is not None:
+            before = routing_before or OCRRoutingStats().snapshot()
+            current = diff_routing_stats(before, routing_stats.snapshot())
+            if enable_multilingual_ocr:
+                print_ocr_routing_stats(current, routing_stats.estimated_saved_seconds(before))
+            print_orientation_stats(current)
         return True, output_md_path
     except Exception as e:
         print(f"❌ 轉換失敗: {pdf_path.name}")
@@ -65,6 +91,28 @@ def convert_pdf_to_markdown(pdf_path, output_dir, image_output_dir, extractor, e
         logging.error(f"轉換失敗: {pdf_path.name}\n錯誤詳情: {error_details}")
         return False, None
 
+def print_ocr_routing_stats(stats, saved_seconds, prefix="OCR分流"):
+    """輸出 OCR 分流統計（stats 為 OCRRoutingStats.snapshot() 格式）"""
+    if stats is None:
+        return
+    pages = stats["pages"]
+    if pages["unrouted"] and not (pages["cjk"] or pages["latin"] or pages["unknown"]):
+        print(f"   🔀 {prefix}：未使用（找不到英文辨識模型 ppocrv4/rec_en）")
+        return
+    print(f"   🔀 {prefix}：中文頁 {pages['cjk']}，英文頁 {pages['latin']}，無法判斷 {pages['unknown']}；"
+          f"英文模型辨識 {stats['lines']['english']} 行，預估節省 {saved_seconds:.2f} 秒")
+
+def print_orientation_stats(stats, prefix="文字方向"):
+    """輸出整頁方向判斷統計（stats 為 OCRRoutingStats.snapshot() 格式）"""
+    if stats is None:
+        return
+    orientation = stats["orientation"]
+    if not (orientation["upright"] or orientation["rotated"] or orientation["mixed"]):
+        return
+    print(f"   🧭 {prefix}：正向頁 {orientation['upright']}，倒置頁 {orientation['rotated']}，"
+          f"逐行判斷 {orientation['mixed']}；方向分類 {orientation['cls_lines']} 行，"
+          f"略過 {orientation['cls_skipped']} 行")
+
 def validate_pdf_file(pdf_path):
     """驗證PDF檔案是否可讀取"""
     try:
@@ -84,42 +132,182 @@ def validate_pdf_file(pdf_path):
     except Exception as e:
         return False, f"檔案驗證失敗: {str(e)}"
 
-def batch_convert_all_pdfs(root_dir, output_base_dir, image_output_dir, model_cache_path, device, encoding, enable_multilingual_ocr, extract_table_format):
-    """批次轉換所有PDF檔案，單線程處理"""
+# 多行程轉換時，父行程載入模型後以 fork 建立 worker，worker 透過這些全域變數取得轉換器，
+# 模型權重以 copy-on-write 共用，不會在每個 worker 各載入一份
+_worker_extractor = None
+_worker_doc_extractor = None
+_worker_options = {}
+
+
+def _init_convert_worker():
+    """worker 初始化：限制每個 worker 的 torch 執行緒數，避免多個 worker 互搶 CPU"""
+    import torch
+    torch.set_num_threads(1)
+
+
+def _convert_in_worker(task):
+    """在 worker 中轉換一個 PDF，回傳結果與此 worker 的記憶體用量"""
+    pdf_path, out_dir, img_dir = task
+    success, _ = convert_pdf_to_markdown(
+        pdf_path,
+        out_dir,
+        img_dir,
+        _worker_extractor,
+        encoding=_worker_options["encoding"],
+        enable_multilingual_ocr=_worker_options["enable_multilingual_ocr"],
+        doc_extractor=_worker_doc_extractor
+    )
+    memory = psutil.Process().memory_full_info()
+    order_cache = _worker_doc_extractor.reading_order_cache
+    cache_stats = order_cache.stats() if order_cache is not None else None
+    routing_stats = _worker_doc_extractor.ocr_routing_stats
+    routing = (routing_stats.snapshot(), routing_stats.estimated_saved_seconds()) if routing_stats is not None else None
+    profiler = active_profiler()
+    profile_record = profiler.records.pop() if profiler is not None and profiler.records else None
+    return success, os.getpid(), memory.uss, memory.rss, cache_stats, routing, profile_record
+
+
+def print_reading_order_cache_stats(stats_list):
+    """輸出閱讀順序快取統計（多個 worker 時加總）"""
+    stats_list = [stats for stats in stats_list if stats]
+    if not stats_list:
+        return
+    hits = sum(stats["hits"] for stats in stats_list)
+    misses = sum(stats["misses"] for stats in stats_list)
+    ambiguous = sum(stats["ambiguous"] for stats in stats_list)
+    lookups = hits + misses + ambiguous
+    hit_rate = hits / lookups if lookups else 0.0
+    print(f"   📐 閱讀順序快取：命中 {hits}，未命中 {misses}，"
+          f"版面模糊 {ambiguous}（命中率 {hit_rate:.1%}）")
+
+
+def batch_convert_all_pdfs(root_dir, output_base_dir, image_output_dir, model_cache_path, device, encoding, enable_multilingual_ocr, extract_table_format,
+                           ocr_variant="fp32", reading_order_tolerance=0, workers=1, profile=False):
+    """批次轉換所有PDF檔案，workers > 1 時以多個 fork 出來的行程共用已載入的模型
+
+    profile 為 True（或設定環境變數 PDF2MD_PROFILE=1）時，每個 PDF 的 cProfile 與記憶體配置
+    寫在輸出的 .md 旁邊，結束時列出耗時或記憶體明顯高於中位數的檔案。
+    """
+    global _worker_extractor, _worker_doc_extractor, _worker_options
+
+    profiler = enable_profiling() if profile else active_profiler()
+
     pdf_files = list(Path(root_dir).rglob("*.pdf"))
     print(f"\n🔍 共找到 {len(pdf_files)} 個 PDF 檔案於 {root_dir}")
+
+    if workers > 1 and (device != "cpu" or "fork" not in mp.get_all_start_methods()):
+        # CUDA context 無法跨 fork 使用；沒有 fork 的平台也無法共用權重
+        print(f"   ⚠️  多行程轉換僅支援 CPU 與 fork，改為單行程處理")
+        workers = 1
     
-    # 初始化PDF解析器（共用）
-    extractor = create_pdf_page_extractor(
+    # 初始化PDF解析器（共用），OCR 模型精度由 ocr_variant 決定
+    print(f"   🧮 OCR 模型精度: {ocr_variant}")
+    doc_extractor = ExamDocExtractor(
+        model_cache_path,
         device=device,
-        model_dir_path=str(model_cache_path),
+        ocr_variant=ocr_variant,
+        reading_order_tolerance=reading_order_tolerance,
+    )
+    extractor = PDFPageExtractor(
+        device=device,
+        doc_extractor=doc_extractor,
         extract_formula=True,
         extract_table_format=extract_table_format,
     )
     
     success_count = 0
     fail_count = 0
-    
-    for i, pdf_path in enumerate(pdf_files, 1):
+    tasks = []
+    for pdf_path in pdf_files:
         # 依據 PDF 所在目錄建立對應輸出資料夾
         rel_dir = pdf_path.parent.relative_to(root_dir)
-        out_dir = output_base_dir / rel_dir
-        img_dir = image_output_dir / rel_dir
-        print(f"\n[{i}/{len(pdf_files)}] 處理 {pdf_path}")
-        success, output_path = convert_pdf_to_markdown(
-            pdf_path,
-            out_dir,
-            img_dir,
-            extractor,
-            encoding=encoding,
-            enable_multilingual_ocr=enable_multilingual_ocr
-        )
-        
-        if success:
-            success_count += 1
-        else:
-            fail_count += 1
-    print(f"\n📊 批次轉換完成：成功 {success_count}，失敗 {fail_count}")
+        tasks.append((pdf_path, output_base_dir / rel_dir, image_output_dir / rel_dir))
+
+    if workers <= 1:
+        for i, (pdf_path, out_dir, img_dir) in enumerate(tasks, 1):
+            print(f"\n[{i}/{len(pdf_files)}] 處理 {pdf_path}")
+            success, output_path = convert_pdf_to_markdown(
+                pdf_path,
+                out_dir,
+                img_dir,
+                extractor,
+                encoding=encoding,
+                enable_multilingual_ocr=enable_multilingual_ocr,
+                doc_extractor=doc_extractor
+            )
+            
+            if success:
+                success_count += 1
+            else:
+                fail_count += 1
+        print(f"\n📊 批次轉換完成：成功 {success_count}，失敗 {fail_count}")
+        order_cache = doc_extractor.reading_order_cache
+        print_reading_order_cache_stats([order_cache.stats()] if order_cache is not None else [])
+        routing_stats = doc_extractor.ocr_routing_stats
+        if routing_stats is not None:
+            if enable_multilingual_ocr:
+                print_ocr_routing_stats(routing_stats.snapshot(), routing_stats.estimated_saved_seconds(), "OCR分流總計")
+            print_orientation_stats(routing_stats.snapshot(), "文字方向總計")
+        if profiler is not None:
+            profiler.print_summary()
+        return
+
+    # 先在父行程載入模型，再凍結 GC 追蹤的物件，避免 worker 的 GC 寫入物件標頭造成頁面被複製
+    print(f"   📦 父行程載入模型中...")
+    start_time = time.time()
+    doc_extractor.load_models()
+    parent_memory = psutil.Process().memory_full_info()
+    print(f"   📦 模型載入完成 (耗時: {time.time() - start_time:.1f}秒，RSS: {parent_memory.rss / 1024 ** 2:.0f} MB)")
+    _worker_extractor = extractor
+    _worker_doc_extractor = doc_extractor
+    _worker_options = {"encoding": encoding, "enable_multilingual_ocr": enable_multilingual_ocr}
+    gc.collect()
+    gc.freeze()
+
+    worker_memory = {}
+    worker_cache_stats = {}
+    worker_routing = {}
+    ctx = mp.get_context("fork")
+    try:
+        with ctx.Pool(processes=workers, initializer=_init_convert_worker) as pool:
+            for i, (success, pid, uss, rss, cache_stats, routing, profile_record) in enumerate(pool.imap_unordered(_convert_in_worker, tasks), 1):
+                print(f"[{i}/{len(tasks)}] worker {pid} 完成")
+                if success:
+                    success_count += 1
+                else:
+                    fail_count += 1
+                previous_uss, previous_rss = worker_memory.get(pid, (0, 0))
+                worker_memory[pid] = (max(previous_uss, uss), max(previous_rss, rss))
+                worker_cache_stats[pid] = cache_stats
+                if routing is not None:
+                    worker_routing[pid] = routing
+                if profiler is not None and profile_record is not None:
+                    profiler.records.append(profile_record)
+    finally:
+        # 轉換失敗或中斷時也要解除凍結，否則父行程之後的物件永遠不會被 GC 回收
+        gc.unfreeze()
+
+    print(f"\n📊 批次轉換完成：成功 {success_count}，失敗 {fail_count}（{workers} 個 worker）")
+    for pid, (uss, rss) in sorted(worker_memory.items()):
+        print(f"   🧠 worker {pid}: 獨占記憶體 (USS) {uss / 1024 ** 2:.0f} MB，RSS {rss / 1024 ** 2:.0f} MB")
+    if worker_memory:
+        average_uss = sum(uss for uss, _ in worker_memory.values()) / len(worker_memory)
+        print(f"   🧠 平均每個 worker 獨占 {average_uss / 1024 ** 2:.0f} MB"
+              f"（父行程載入模型後 RSS {parent_memory.rss / 1024 ** 2:.0f} MB，由所有 worker 共用）")
+    print_reading_order_cache_stats(worker_cache_stats.values())
+    if worker_routing:
+        # 各 worker 的統計是累計值，取每個 worker 最後一次回報加總
+        total = OCRRoutingStats().snapshot()
+        for snapshot, _ in worker_routing.values():
+            for group in total:
+                for key in total[group]:
+                    total[group][key] += snapshot[group][key]
+        if enable_multilingual_ocr:
+            saved = sum(saved_seconds for _, saved_seconds in worker_routing.values())
+            print_ocr_routing_stats(total, saved, "OCR分流總計")
+        print_orientation_stats(total, "文字方向總計")
+    if profiler is not None:
+        profiler.print_summary()
 
 def main():
     # === 設定路徑 ===
@@ -131,8 +319,12 @@ def main():
     encoding = "utf-8"
     enable_multilingual_ocr = True
     extract_table_format = ExtractedTableFormat.MARKDOWN
+    ocr_variant = "fp32"  # 或 "int8_dynamic"、"int8_static"（需先執行 tools/quantize_ocr_models.py build）
+    reading_order_tolerance = 4  # 閱讀順序快取的量化格距（0-1000 座標），0 表示停用
+    workers = 1  # 大於 1 時以多個行程轉換（僅限 device="cpu"），模型在父行程載入一次後共用
+    profile = False  # 每個 PDF 寫出 cProfile / 記憶體配置報告（也可設定環境變數 PDF2MD_PROFILE=1）
     
-    # === 單線程批次處理所有 PDF ===
+    # === 批次處理所有 PDF ===
     batch_convert_all_pdfs(
         base_input_dir,
         output_base_dir,
@@ -141,7 +333,11 @@ def main():
         device,
         encoding,
         enable_multilingual_ocr,
-        extract_table_format
+        extract_table_format,
+        ocr_variant,
+        reading_order_tolerance,
+        workers,
+        profile
     )
 
 if __name__ == "__main__":
@@ -0,0 +1,66 @@
+"""doc_extractor.py
+專案自用的 DocExtractor：沿用 doc_page_extractor 的流程，替換其中的 OCR 與閱讀順序元件。
+交給 pdf_craft 的 PDFPageExtractor(doc_extractor=...) 使用。
+"""
+
+from os import PathLike
+from pathlib import Path
+from typing import Literal, Optional
+
+from doc_page_extractor import DocExtractor
+
+from .layout_order import ExamLayoutOrder
+from .ocr import ExamOCR
+from .text_system import OCRRoutingStats
+from .reading_order_cache import ReadingOrderCache
+
+
+class ExamDocExtractor(DocExtractor):
+    """使用 ExamOCR 與 ExamLayoutOrder 的 DocExtractor"""
+
+    def __init__(
+        self,
+        model_cache_dir: PathLike,
+        device: Literal["cpu", "cuda"] = "cpu",
+        ocr_variant: str = "fp32",
+        onnx_cache_dir: Optional[PathLike] = None,
+        layout_backend: str = "auto",
+        reading_order_tolerance: int = 0,
+    ) -> None:
+        super().__init__(model_cache_dir=Path(model_cache_dir), device=device)
+        # 預設把 ONNX 最佳化快取放在模型資料夾底下
+        if onnx_cache_dir is None:
+            onnx_cache_dir = Path(model_cache_dir) / "onnx_cache"
+        self._ocr = ExamOCR(self._device, self._model, variant=ocr_variant, session_cache_dir=onnx_cache_dir)
+        self._layout_order = ExamLayoutOrder(
+            self._device,
+            self._model,
+            backend=layout_backend,
+            session_cache_dir=onnx_cache_dir,
+            # tolerance 為 0 時不使用閱讀順序快取
+            order_cache=ReadingOrderCache(reading_order_tolerance) if reading_order_tolerance > 0 else None,
+        )
+
+    @property
+    def ocr_routing_stats(self) -> Optional[OCRRoutingStats]:
+        return self._ocr.routing_stats
+
+    def set_multilingual_ocr(self, enabled: bool) -> None:
+        """啟用時依頁面文字種類（中文／英文）分流到對應的單一辨識模型"""
+        self._ocr.set_script_routing(enabled)
+
+    @property
+    def reading_order_cache(self) -> Optional[ReadingOrderCache]:
+        return self._layout_order.order_cache
+
+    def load_models(self) -> None:
+        """預先載入 PyTorch 模型（版面、閱讀順序、公式）
+
+        多行程轉換時在 fork 之前呼叫，worker 以 copy-on-write 共用這些唯讀權重。
+        OCR 與 ONNX 版閱讀順序的 onnxruntime session 帶有執行緒池，fork 後無法在子行程使用，
+        因此不在這裡建立，由各 worker 自行建立（有最佳化快取，建立很快）。
+        表格模型只能在 GPU 上執行，不適用 fork，也不在這裡載入。
+        """
+        self._get_yolo()
+        self._layout_order.load_model()
+        self._latex._get_model()
@@ -0,0 +1,304 @@
+"""layout_order.py
+擴充 doc_page_extractor 的 LayoutOrder（LayoutReader 閱讀順序模型）。
+
+原本以 from_pretrained 載入權重，每個 worker 都會在自己的 heap 裡複製一份完整權重。
+CPU 上改為以記憶體映射（mmap）讀取 safetensors，權重由 page cache 提供，
+多個 worker 載入同一個檔案時共用同一份實體記憶體。
+檔案中的權重若不是 float32（layoutreader 以 bfloat16 發佈），會先轉存一份
+`model.fp32.safetensors`，之後直接映射這份檔案。
+
+模型資料夾中有 `tools/export_layoutreader.py` 匯出的 ONNX 檔時，CPU 上改用
+onnxruntime 推論（見 layoutreader_onnx.py），不必載入 PyTorch 模型。
+給定 ReadingOrderCache 時，版面相同的頁面直接沿用先前算出的順序。
+"""
+
+import json
+import mmap
+import os
+import struct
+from contextlib import contextmanager
+from os import PathLike
+from pathlib import Path
+from typing import Dict, List, Literal, Optional, Sequence
+
+import torch
+from torch import nn
+from transformers import LayoutLMv3Config, LayoutLMv3ForTokenClassification
+
+from doc_page_extractor.layout_order import LayoutOrder, _BBox
+from doc_page_extractor.layoutreader import boxes2inputs, parse_logits, prepare_inputs
+from doc_page_extractor.model import Model
+from doc_page_extractor.types import Layout, LayoutClass
+
+from .layoutreader_onnx import LAYOUTREADER_INT8_ONNX_NAME, LAYOUTREADER_ONNX_NAME, LayoutReaderONNX
+from .reading_order_cache import ReadingOrderCache
+
+LAYOUT_BACKENDS = ("auto", "torch", "onnx", "onnx_int8")
+# 與 doc_page_extractor 相同：超過 200 個方塊就不排序
+MAX_ORDER_BOXES = 200
+LAYOUTREADER_SIZE = 1000.0
+
+SAFETENSORS_NAME = "model.safetensors"
+FP32_SAFETENSORS_NAME = "model.fp32.safetensors"
+
+_SAFETENSORS_DTYPES = {
+    "F64": torch.float64,
+    "F32": torch.float32,
+    "F16": torch.float16,
+    "BF16": torch.bfloat16,
+    "I64": torch.int64,
+    "I32": torch.int32,
+    "I16": torch.int16,
+    "I8": torch.int8,
+    "U8": torch.uint8,
+    "BOOL": torch.bool,
+}
+
+
+def read_safetensors_header(path: Path) -> Dict[str, dict]:
+    """讀取 safetensors 檔頭，回傳 {名稱: {dtype, shape, data_offsets}}"""
+    with open(path, "rb") as f:
+        (header_size,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_size))
+    header.pop("__metadata__", None)
+    header["__data_start__"] = 8 + header_size
+    return header
+
+
+def load_safetensors_mmap(path: Path) -> Dict[str, torch.Tensor]:
+    """以 mmap 載入 safetensors，張量直接指向檔案內容，不複製到 heap"""
+    header = read_safetensors_header(path)
+    data_start = header.pop("__data_start__")
+    with open(path, "rb") as f:
+        # ACCESS_COPY：對 torch 來說是可寫的 buffer，但寫入不會回寫檔案，
+        # 沒有被寫到的頁面與其他行程共用 page cache
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    raw = torch.frombuffer(buffer, dtype=torch.uint8)
+
+    tensors = {}
+    for name, info in header.items():
+        dtype = _SAFETENSORS_DTYPES[info["dtype"]]
+        begin, end = info["data_offsets"]
+        tensors[name] = raw[data_start + begin:data_start + end].view(dtype).reshape(info["shape"])
+    return tensors
+
+
+def ensure_fp32_safetensors(model_dir: Path) -> Path:
+    """確保有 float32 的 safetensors 可供映射，必要時轉存一份"""
+    source_path = model_dir / SAFETENSORS_NAME
+    header = read_safetensors_header(source_path)
+    header.pop("__data_start__")
+    if all(info["dtype"] != "BF16" and info["dtype"] != "F16" for info in header.values()):
+        return source_path
+
+    fp32_path = model_dir / FP32_SAFETENSORS_NAME
+    if fp32_path.exists() and fp32_path.stat().st_mtime >= source_path.stat().st_mtime:
+        return fp32_path
+
+    from safetensors.torch import save_file
+
+    print(f"   🔄 轉存 float32 權重: {fp32_path}")
+    tensors = {
+        name: tensor.float() if tensor.is_floating_point() else tensor
+        for name, tensor in load_safetensors_mmap(source_path).items()
+    }
+    temp_path = fp32_path.with_name(f"{fp32_path.name}.{os.getpid()}.tmp")
+    save_file(tensors, str(temp_path), metadata={"format": "pt"})
+    os.replace(temp_path, fp32_path)
+    return fp32_path
+
+
+@contextmanager
+def _parameters_on_meta():
+    """建立模型時把參數放到 meta device，buffer 仍在 CPU 上正常建立"""
+    register_parameter = nn.Module.register_parameter
+
+    def register_meta_parameter(module, name, param):
+        register_parameter(module, name, param)
+        if param is not None:
+            param_cls = type(module._parameters[name])
+            kwargs = module._parameters[name].__dict__
+            module._parameters[name] = param_cls(module._parameters[name].to("meta"), **kwargs)
+
+    nn.Module.register_parameter = register_meta_parameter
+    try:
+        yield
+    finally:
+        nn.Module.register_parameter = register_parameter
+
+
+def load_layoutreader_mmap(model_dir: Path) -> LayoutLMv3ForTokenClassification:
+    """以 mmap 的 float32 safetensors 建立 LayoutReader 模型"""
+    model_dir = Path(model_dir)
+    config = LayoutLMv3Config.from_pretrained(model_dir, local_files_only=True)
+    with _parameters_on_meta():
+        model = LayoutLMv3ForTokenClassification(config)
+
+    state_dict = load_safetensors_mmap(ensure_fp32_safetensors(model_dir))
+    model.load_state_dict(state_dict, strict=False, assign=True)
+    missing = [name for name, param in model.named_parameters() if param.is_meta]
+    if missing:
+        raise RuntimeError(f"LayoutReader 權重缺少參數: {', '.join(missing[:5])}")
+    return model.eval()
+
+
+class ExamLayoutOrder(LayoutOrder):
+    """可改用 ONNX 推論、CPU 上以 mmap 載入權重的 LayoutOrder
+
+    backend:
+        auto       CPU 且有匯出的 layoutreader.onnx 時用 ONNX，否則用 PyTorch
+        torch      一律用 PyTorch
+        onnx       使用 layoutreader.onnx
+        onnx_int8  使用 layoutreader.int8.onnx
+    """
+
+    def __init__(
+        self,
+        device: Literal["cpu", "cuda"],
+        model: Model,
+        backend: str = "auto",
+        session_cache_dir: Optional[PathLike] = None,
+        order_cache: Optional[ReadingOrderCache] = None,
+    ):
+        if backend not in LAYOUT_BACKENDS:
+            raise ValueError(f"未知的閱讀順序推論方式: {backend}，可用選項: {', '.join(LAYOUT_BACKENDS)}")
+        super().__init__(device, model)
+        self._backend = backend
+        self._session_cache_dir = session_cache_dir
+        self._onnx_reader: Optional[LayoutReaderONNX] = None
+        self._onnx_checked = False
+        self._order_cache = order_cache
+
+    @property
+    def order_cache(self) -> Optional[ReadingOrderCache]:
+        return self._order_cache
+
+    def _get_model(self) -> LayoutLMv3ForTokenClassification:
+        if self._order_model is None:
+            model_dir = self._model.get_layoutreader_path()
+            if self._device == "cpu" and (Path(model_dir) / SAFETENSORS_NAME).exists():
+                self._order_model = load_layoutreader_mmap(model_dir)
+            else:
+                # GPU 需要把權重搬到顯示卡上，映射沒有好處，沿用原本的載入方式
+                self._order_model = super()._get_model()
+        return self._order_model
+
+    def _onnx_model_path(self) -> Optional[Path]:
+        """依 backend 決定要使用的 ONNX 模型，不使用 ONNX 時回傳 None"""
+        if self._backend == "torch" or (self._backend == "auto" and self._device != "cpu"):
+            return None
+        file_name = LAYOUTREADER_INT8_ONNX_NAME if self._backend == "onnx_int8" else LAYOUTREADER_ONNX_NAME
+        model_path = Path(self._model.get_layoutreader_path()) / file_name
+        if model_path.exists():
+            return model_path
+        if self._backend != "auto" and not self._onnx_checked:
+            print(f"   ⚠️  找不到 {model_path.name}，閱讀順序改用 PyTorch 模型")
+        return None
+
+    def _get_onnx_reader(self) -> Optional[LayoutReaderONNX]:
+        if not self._onnx_checked:
+            model_path = self._onnx_model_path()
+            self._onnx_checked = True
+            if model_path is not None:
+                self._onnx_reader = LayoutReaderONNX(
+                    model_path,
+                    use_gpu=(self._device != "cpu"),
+                    session_cache_dir=self._session_cache_dir,
+                )
+        return self._onnx_reader
+
+    def load_model(self) -> None:
+        """預先載入 PyTorch 模型；使用 ONNX 時不做事，session 由各行程第一次推論時建立"""
+        if self._onnx_model_path() is None:
+            self._get_model()
+
+    def predict_orders(self, boxes: List[List[int]]) -> List[int]:
+        """依已縮放到 0-1000 且排序好的方塊回傳閱讀順序"""
+        if self._order_cache is not None:
+            orders = self._order_cache.lookup(boxes)
+            if orders is None:
+                orders = self._run_model(boxes)
+                self._order_cache.store(boxes, orders)
+            return orders
+        return self._run_model(boxes)
+
+    def _run_model(self, boxes: List[List[int]]) -> List[int]:
+        onnx_reader = self._get_onnx_reader()
+        if onnx_reader is not None:
+            return onnx_reader.order(boxes)
+
+        model = self._get_model()
+        with torch.no_grad():
+            inputs = boxes2inputs(boxes)
+            inputs = prepare_inputs(inputs, model)
+            logits = model(**inputs).logits.cpu().squeeze(0)
+            return parse_logits(logits, len(boxes))
+
+    def predict_orders_many(self, box_lists: Sequence[List[List[int]]]) -> List[List[int]]:
+        """多頁一起推論；ONNX 路徑會依方塊數分批，PyTorch 路徑逐頁執行"""
+        results: List[Optional[List[int]]] = [None] * len(box_lists)
+        pending = []
+        for index, boxes in enumerate(box_lists):
+            if self._order_cache is not None:
+                results[index] = self._order_cache.lookup(boxes)
+            if results[index] is None:
+                pending.append(index)
+
+        onnx_reader = self._get_onnx_reader()
+        if onnx_reader is not None:
+            computed = onnx_reader.order_many([box_lists[index] for index in pending])
+        else:
+            computed = [self._run_model(box_lists[index]) if box_lists[index] else [] for index in pending]
+
+        for index, orders in zip(pending, computed):
+            results[index] = orders
+            if self._order_cache is not None:
+                self._order_cache.store(box_lists[index], orders)
+        return results
+
+    def _order_and_get_bbox_list(
+        self,
+        layouts: List[Layout],
+        width: int,
+        height: int,
+    ) -> Optional[List[_BBox]]:
+        # 與 doc_page_extractor 的實作相同，只把模型推論改成 predict_orders
+        line_height = self._line_height(layouts)
+        bbox_list: List[_BBox] = []
+
+        for i, layout in enumerate(layouts):
+            if layout.cls == LayoutClass.PLAIN_TEXT and len(layout.fragments) > 0:
+                for j, fragment in enumerate(layout.fragments):
+                    bbox_list.append(_BBox(
+                        layout_index=i,
+                        fragment_index=j,
+                        virtual=False,
+                        order=0,
+                        value=fragment.rect.wrapper,
+                    ))
+            else:
+                bbox_list.extend(self._generate_virtual_lines(
+                    layout=layout,
+                    layout_index=i,
+                    line_height=line_height,
+                    width=width,
+                    height=height,
+                ))
+
+        if len(bbox_list) > MAX_ORDER_BOXES:
+            return None
+
+        x_scale = LAYOUTREADER_SIZE / float(width)
+        y_scale = LAYOUTREADER_SIZE / float(height)
+        for bbox in bbox_list:
+            x0, y0, x1, y1 = self._squeeze(bbox, width, height)
+            bbox.value = (round(x0 * x_scale), round(y0 * y_scale), round(x1 * x_scale), round(y1 * y_scale))
+
+        # 必須排序，亂序傳入 layoutreader 會令它無法識別正確順序
+        bbox_list.sort(key=lambda b: b.value)
+        orders = self.predict_orders([list(bbox.value) for bbox in bbox_list])
+
+        sorted_bbox_list = [bbox_list[i] for i in orders]
+        for i, bbox in enumerate(sorted_bbox_list):
+            bbox.order = i
+        return sorted_bbox_list
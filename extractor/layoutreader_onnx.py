@@ -0,0 +1,114 @@
+"""layoutreader_onnx.py
+以 onnxruntime 執行匯出後的 LayoutReader（閱讀順序模型）。
+
+模型由 `tools/export_layoutreader.py` 匯出，batch 與序列長度皆為動態。
+order_many 會先依方塊數排序再分批，同一批的長度相近，padding 最少。
+輸入格式與 doc_page_extractor.layoutreader 的 boxes2inputs / DataCollator 相同：
+    [CLS] + 每個方塊一個 UNK + [EOS]，不足的部分以 EOS 補齊並遮罩
+"""
+
+from os import PathLike
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from .onnx_session import create_onnx_session
+
+MAX_LEN = 510
+CLS_TOKEN_ID = 0
+UNK_TOKEN_ID = 3
+EOS_TOKEN_ID = 2
+
+LAYOUTREADER_ONNX_NAME = "layoutreader.onnx"
+LAYOUTREADER_INT8_ONNX_NAME = "layoutreader.int8.onnx"
+
+Boxes = Sequence[Sequence[int]]
+
+
+def build_batch_inputs(box_lists: Sequence[Boxes]) -> dict:
+    """把多頁的方塊組成一個 batch，回傳 input_ids / bbox / attention_mask"""
+    seq_len = max(len(boxes) for boxes in box_lists) + 2
+    batch_size = len(box_lists)
+    input_ids = np.full((batch_size, seq_len), EOS_TOKEN_ID, dtype=np.int64)
+    bbox = np.zeros((batch_size, seq_len, 4), dtype=np.int64)
+    attention_mask = np.zeros((batch_size, seq_len), dtype=np.int64)
+
+    for i, boxes in enumerate(box_lists):
+        length = len(boxes)
+        input_ids[i, 0] = CLS_TOKEN_ID
+        input_ids[i, 1:length + 1] = UNK_TOKEN_ID
+        if length > 0:
+            bbox[i, 1:length + 1] = np.asarray(boxes, dtype=np.int64)
+        attention_mask[i, :length + 2] = 1
+
+    return {"input_ids": input_ids, "bbox": bbox, "attention_mask": attention_mask}
+
+
+def parse_logits(logits: np.ndarray, length: int) -> List[int]:
+    """numpy 版的 layoutreader.parse_logits：每個方塊取分數最高的位置，衝突時讓分數低的改用下一個候選"""
+    logits = logits[1:length + 1, :length]
+    orders = [list(row) for row in np.argsort(logits, axis=1, kind="stable")]
+    result = [candidates.pop() for candidates in orders]
+    while True:
+        order_to_indexes = {}
+        for index, order in enumerate(result):
+            order_to_indexes.setdefault(order, []).append(index)
+        conflicts = {order: indexes for order, indexes in order_to_indexes.items() if len(indexes) > 1}
+        if not conflicts:
+            break
+        for order, indexes in conflicts.items():
+            ranked = sorted(indexes, key=lambda index: logits[index, order], reverse=True)
+            for index in ranked[1:]:
+                result[index] = orders[index].pop()
+    return [int(order) for order in result]
+
+
+class LayoutReaderONNX:
+    """LayoutReader 的 onnxruntime 推論"""
+
+    def __init__(
+        self,
+        model_path: PathLike,
+        use_gpu: bool = False,
+        session_cache_dir: Optional[PathLike] = None,
+        batch_size: int = 8,
+    ):
+        self._model_path = Path(model_path)
+        self._session = create_onnx_session(self._model_path, use_gpu, cache_dir=session_cache_dir)
+        self._input_names = {node.name for node in self._session.get_inputs()}
+        self._batch_size = batch_size
+
+    @property
+    def model_path(self) -> Path:
+        return self._model_path
+
+    def logits(self, box_lists: Sequence[Boxes]) -> np.ndarray:
+        """回傳 (batch, seq_len, MAX_LEN) 的 logits"""
+        inputs = build_batch_inputs(box_lists)
+        feed = {name: value for name, value in inputs.items() if name in self._input_names}
+        return self._session.run(None, feed)[0]
+
+    def order(self, boxes: Boxes) -> List[int]:
+        """單頁：回傳方塊的閱讀順序"""
+        return self.order_many([boxes])[0]
+
+    def order_many(self, box_lists: Sequence[Boxes]) -> List[List[int]]:
+        """多頁：依方塊數排序後分批推論，結果依輸入順序回傳"""
+        results: List[Optional[List[int]]] = [None] * len(box_lists)
+        pending = []
+        for index, boxes in enumerate(box_lists):
+            if len(boxes) == 0:
+                results[index] = []
+            elif len(boxes) > MAX_LEN:
+                raise ValueError(f"方塊數 {len(boxes)} 超過 LayoutReader 上限 {MAX_LEN}")
+            else:
+                pending.append(index)
+
+        pending.sort(key=lambda index: len(box_lists[index]))
+        for start in range(0, len(pending), self._batch_size):
+            batch = pending[start:start + self._batch_size]
+            logits = self.logits([box_lists[index] for index in batch])
+            for row, index in enumerate(batch):
+                results[index] = parse_logits(logits[row], len(box_lists[index]))
+        return results
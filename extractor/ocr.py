@@ -0,0 +1,138 @@
+"""ocr.py
+擴充 doc_page_extractor 的 OCR，讓轉換流程可以選用量化後的 PP-OCR 模型。
+
+量化模型由 `tools/quantize_ocr_models.py` 產生，與原始 FP32 模型放在同一個資料夾：
+    ppocrv4/det/det.onnx               (fp32)
+    ppocrv4/det/det.int8_dynamic.onnx  (動態量化)
+    ppocrv4/det/det.int8_static.onnx   (靜態校正量化)
+
+指定 session_cache_dir 時，det / cls / rec 的 session 改由 onnx_session.create_onnx_session
+建立，重複啟動時直接載入已最佳化的圖。
+
+偵測模型的後處理換成 db_postprocess.VectorizedDBPostProcess。
+
+英文頁分流（見 text_system.py）使用的英文辨識模型需另外放置（PaddleOCR 的
+en_PP-OCRv4_rec 以 paddle2onnx 轉換）：
+    ppocrv4/rec_en/rec.onnx
+    ppocrv4/rec_en/en_dict.txt
+"""
+
+from dataclasses import replace
+from functools import partial
+from os import PathLike
+from pathlib import Path
+from typing import List, Literal, Optional
+
+from doc_page_extractor.model import Model
+from doc_page_extractor.ocr import OCR
+from doc_page_extractor.onnxocr.predict_rec import TextRecognizer
+
+from .db_postprocess import VectorizedDBPostProcess
+from .onnx_session import create_onnx_session
+from .text_system import ExamTextSystem, OCRRoutingStats
+
+# 與 doc_page_extractor.ocr 內部使用的順序一致：rec, cls, det, 字典
+OCR_MODEL_FILES = (
+    ("ppocrv4", "rec", "rec.onnx"),
+    ("ppocrv4", "cls", "cls.onnx"),
+    ("ppocrv4", "det", "det.onnx"),
+    ("ch_ppocr_server_v2.0", "ppocr_keys_v1.txt"),
+)
+ENGLISH_REC_FILES = (
+    ("ppocrv4", "rec_en", "rec.onnx"),
+    ("ppocrv4", "rec_en", "en_dict.txt"),
+)
+OCR_VARIANTS = ("fp32", "int8_dynamic", "int8_static")
+# 只有 det / rec 會量化，cls 模型很小，一律使用 fp32
+QUANTIZED_MODELS = ("det", "rec")
+
+
+def variant_model_path(model_path: Path, variant: str) -> Path:
+    """回傳指定精度的模型路徑，如 det.onnx -> det.int8_dynamic.onnx"""
+    if variant == "fp32":
+        return model_path
+    return model_path.with_name(f"{model_path.stem}.{variant}{model_path.suffix}")
+
+
+def resolve_ocr_model_paths(onnx_ocr_dir: Path, variant: str = "fp32") -> List[Path]:
+    """依精度決定 rec, cls, det 與字典檔的路徑，量化檔案不存在時退回 fp32"""
+    if variant not in OCR_VARIANTS:
+        raise ValueError(f"未知的 OCR 模型精度: {variant}，可用選項: {', '.join(OCR_VARIANTS)}")
+
+    paths = []
+    for parts in OCR_MODEL_FILES:
+        path = Path(onnx_ocr_dir).joinpath(*parts)
+        if parts[1] in QUANTIZED_MODELS:
+            candidate = variant_model_path(path, variant)
+            if candidate.exists():
+                path = candidate
+            else:
+                print(f"   ⚠️  找不到 {candidate.name}，{parts[1]} 模型改用 fp32")
+        paths.append(path)
+    return paths
+
+
+class ExamOCR(OCR):
+    """可選擇模型精度、可依頁面文字種類分流辨識模型的 OCR"""
+
+    def __init__(
+        self,
+        device: Literal["cpu", "cuda"],
+        model: Model,
+        variant: str = "fp32",
+        session_cache_dir: Optional[PathLike] = None,
+    ):
+        if variant not in OCR_VARIANTS:
+            raise ValueError(f"未知的 OCR 模型精度: {variant}，可用選項: {', '.join(OCR_VARIANTS)}")
+        super().__init__(device, model)
+        self._variant = variant
+        self._session_cache_dir = Path(session_cache_dir) if session_cache_dir else None
+        self._script_routing = False
+
+    @property
+    def variant(self) -> str:
+        return self._variant
+
+    def _make_model_paths(self) -> List[str]:
+        model_dir = self._model.get_onnx_ocr_path()
+        return [str(path) for path in resolve_ocr_model_paths(model_dir, self._variant)]
+
+    @property
+    def routing_stats(self) -> Optional[OCRRoutingStats]:
+        if self._text_system is None:
+            return None
+        return self._text_system.routing_stats
+
+    def set_script_routing(self, enabled: bool) -> None:
+        """啟用時依頁面文字種類分流辨識模型，否則所有行都用預設模型"""
+        self._script_routing = enabled
+        if self._text_system is not None:
+            self._text_system.script_routing = enabled
+
+    def _get_text_system(self) -> ExamTextSystem:
+        if self._text_system is None:
+            args = super()._get_text_system().args
+            text_system = ExamTextSystem(args, english_recognizer=self._create_english_recognizer(args))
+            text_system.script_routing = self._script_routing
+            detector = text_system.text_detector
+            detector.postprocess_op = VectorizedDBPostProcess.from_postprocess(detector.postprocess_op)
+            predictors = [text_system.text_detector, text_system.text_classifier, text_system.text_recognizer]
+            if text_system.english_recognizer is not None:
+                predictors.append(text_system.english_recognizer)
+            if self._session_cache_dir is not None:
+                # 各 predictor 的 session 是第一次使用時才建立，這裡換掉建立方式即可
+                create_session = partial(create_onnx_session, cache_dir=self._session_cache_dir)
+                for predictor in predictors:
+                    predictor.get_onnx_session = create_session
+            self._text_system = text_system
+        return self._text_system
+
+    def _create_english_recognizer(self, args) -> Optional[TextRecognizer]:
+        model_dir = Path(self._model.get_onnx_ocr_path())
+        rec_path, dict_path = [model_dir.joinpath(*parts) for parts in ENGLISH_REC_FILES]
+        if not rec_path.exists() or not dict_path.exists():
+            return None
+        candidate = variant_model_path(rec_path, self._variant)
+        if candidate.exists():
+            rec_path = candidate
+        return TextRecognizer(replace(args, rec_model_dir=str(rec_path), rec_char_dict_path=str(dict_path)))
@@ -0,0 +1,74 @@
+"""onnx_session.py
+建立 onnxruntime InferenceSession，並把圖最佳化後的模型存到快取資料夾。
+
+onnxruntime 每次建立 session 都會重新做 graph optimization，批次轉換開很多短命
+worker 時這段時間會一再重複。第一次建立時以 ORT_ENABLE_ALL 最佳化並輸出到快取，
+之後直接載入已最佳化的圖並關閉最佳化。快取檔名包含：
+    模型內容雜湊、onnxruntime 版本、execution providers、最佳化層級、CPU 架構
+任一項改變都會產生新的快取，不會誤用舊的圖。
+"""
+
+import hashlib
+import os
+import platform
+from pathlib import Path
+from typing import List, Optional, Union
+
+import onnxruntime
+
+CACHE_OPTIMIZATION_LEVEL = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+
+def session_providers(use_gpu: bool) -> List[str]:
+    """與 onnxocr 的 PredictBase 相同的 provider 選擇"""
+    return ["CUDAExecutionProvider"] if use_gpu else ["CPUExecutionProvider"]
+
+
+def session_cache_key(model_path: Union[str, Path], providers: List[str],
+                      optimization_level=CACHE_OPTIMIZATION_LEVEL) -> str:
+    """計算快取鍵：模型雜湊 + 執行環境"""
+    digest = hashlib.sha256()
+    with open(model_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    environment = "|".join([
+        onnxruntime.__version__,
+        ",".join(providers),
+        str(int(optimization_level)),
+        platform.machine(),
+    ])
+    digest.update(environment.encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+def create_onnx_session(model_path: Union[str, Path], use_gpu: bool = False,
+                        cache_dir: Optional[Union[str, Path]] = None) -> onnxruntime.InferenceSession:
+    """建立 session；有 cache_dir 時讀寫最佳化後的模型快取"""
+    providers = session_providers(use_gpu)
+    if cache_dir is None:
+        return onnxruntime.InferenceSession(str(model_path), None, providers=providers)
+
+    model_path = Path(model_path)
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    key = session_cache_key(model_path, providers)
+    cache_path = cache_dir / f"{model_path.stem}.{key}.onnx"
+
+    if cache_path.exists():
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL
+        try:
+            return onnxruntime.InferenceSession(str(cache_path), options, providers=providers)
+        except Exception as e:
+            print(f"   ⚠️  最佳化快取無法載入，重新建立: {cache_path.name} ({e})")
+            cache_path.unlink(missing_ok=True)
+
+    # 先寫到暫存檔再 rename，多個 worker 同時建立時不會讀到寫一半的檔案
+    temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    options = onnxruntime.SessionOptions()
+    options.graph_optimization_level = CACHE_OPTIMIZATION_LEVEL
+    options.optimized_model_filepath = str(temp_path)
+    session = onnxruntime.InferenceSession(str(model_path), options, providers=providers)
+    if temp_path.exists():
+        os.replace(temp_path, cache_path)
+    return session
@@ -0,0 +1,38 @@
+"""orientation.py
+整頁方向判斷：考卷掃描檔幾乎都是整頁正向或整頁倒置，
+只對少數取樣行執行方向分類（cls），依投票結果決定整頁方向，
+只有結果不一致或信心不足的頁面才逐行執行方向分類。
+"""
+
+from typing import Sequence, Tuple
+
+ORIENTATION_UPRIGHT = "upright"
+ORIENTATION_ROTATED = "rotated"
+ORIENTATION_MIXED = "mixed"
+
+
+def vote_page_orientation(
+    cls_results: Sequence[Tuple[str, float]],
+    cls_thresh: float = 0.9,
+    min_lines: int = 3,
+) -> str:
+    """依取樣行的方向分類結果判斷整頁方向
+
+    全部取樣行都以高信心判為 0 度 → upright；全部以高信心判為 180 度 → rotated；
+    取樣太少、有低信心或方向不一致 → mixed（交回逐行分類）。
+    """
+    if len(cls_results) < min_lines:
+        return ORIENTATION_MIXED
+    upright = rotated = 0
+    for label, score in cls_results:
+        if score <= cls_thresh:
+            return ORIENTATION_MIXED
+        if "180" in label:
+            rotated += 1
+        else:
+            upright += 1
+    if rotated == 0:
+        return ORIENTATION_UPRIGHT
+    if upright == 0:
+        return ORIENTATION_ROTATED
+    return ORIENTATION_MIXED
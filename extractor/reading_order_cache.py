@@ -0,0 +1,78 @@
+"""reading_order_cache.py
+閱讀順序快取：同一出版社模板的考卷版面幾乎相同（欄位、選項格、頁首），
+以方塊幾何的量化簽章為鍵，保存 LayoutReader 算出的排列，命中時不必執行模型。
+
+簽章是依原本順序（已排序）把每個方塊座標以 tolerance 為格距量化後的序列，
+兩頁簽章相同代表每個位置上的方塊座標都落在同一格內，可以直接套用相同排列；
+座標剛好跨過格線時只會造成未命中，不會套用錯誤的排列。
+若同一頁有兩個方塊起點落在同一格，兩者的先後取決於格距以下的差異，
+此時視為模糊（ambiguous），改由模型判斷。
+"""
+
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+
+Signature = Tuple[Tuple[int, int, int, int], ...]
+
+
+class ReadingOrderCache:
+    """以量化版面簽章為鍵的 LRU 閱讀順序快取"""
+
+    def __init__(self, tolerance: int = 4, max_entries: int = 1024):
+        if tolerance <= 0:
+            raise ValueError("tolerance 必須大於 0")
+        self.tolerance = tolerance
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Signature, Tuple[int, ...]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.ambiguous = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def signature(self, boxes: Sequence[Sequence[int]]) -> Optional[Signature]:
+        """計算版面簽章；版面模糊時回傳 None"""
+        tolerance = self.tolerance
+        quantized = tuple(
+            (x0 // tolerance, y0 // tolerance, x1 // tolerance, y1 // tolerance)
+            for x0, y0, x1, y1 in boxes
+        )
+        corners = {(box[0], box[1]) for box in quantized}
+        if len(corners) != len(quantized):
+            return None
+        return quantized
+
+    def lookup(self, boxes: Sequence[Sequence[int]]) -> Optional[List[int]]:
+        """查詢快取，命中時回傳排列，未命中或版面模糊時回傳 None"""
+        key = self.signature(boxes)
+        if key is None:
+            self.ambiguous += 1
+            return None
+        orders = self._entries.get(key)
+        if orders is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return list(orders)
+
+    def store(self, boxes: Sequence[Sequence[int]], orders: Sequence[int]) -> None:
+        """保存模型算出的排列；模糊的版面不保存"""
+        key = self.signature(boxes)
+        if key is None:
+            return
+        self._entries[key] = tuple(orders)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.ambiguous
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "ambiguous": self.ambiguous,
+            "entries": len(self._entries),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
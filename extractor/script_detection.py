@@ -0,0 +1,54 @@
+"""script_detection.py
+判斷頁面文字主要是中文還是英文，供 OCR 分流使用。
+
+以預設（中英混合）辨識模型辨識頁面上少數幾行的結果為樣本：
+樣本中幾乎沒有 CJK 字元、且有足夠的拉丁字母時判定為英文頁，
+其餘（中文頁、中英混排、樣本太少）一律交給預設模型，寧可不分流也不誤判。
+"""
+
+from typing import Iterable, List
+
+SCRIPT_CJK = "cjk"
+SCRIPT_LATIN = "latin"
+SCRIPT_UNKNOWN = "unknown"
+
+
+def is_cjk(char: str) -> bool:
+    """CJK 統一表意文字、擴充 A、相容表意文字與注音符號"""
+    code = ord(char)
+    return (
+        0x4E00 <= code <= 0x9FFF
+        or 0x3400 <= code <= 0x4DBF
+        or 0xF900 <= code <= 0xFAFF
+        or 0x3100 <= code <= 0x312F
+    )
+
+
+def count_scripts(texts: Iterable[str]) -> tuple:
+    """回傳 (CJK 字元數, 拉丁字母數)"""
+    cjk = latin = 0
+    for text in texts:
+        for char in text:
+            if is_cjk(char):
+                cjk += 1
+            elif char.isascii() and char.isalpha():
+                latin += 1
+    return cjk, latin
+
+
+def classify_script(texts: Iterable[str], min_letters: int = 12, max_cjk_ratio: float = 0.02) -> str:
+    """依樣本文字判斷頁面文字種類"""
+    cjk, latin = count_scripts(texts)
+    if cjk + latin < min_letters:
+        return SCRIPT_UNKNOWN
+    if cjk / (cjk + latin) <= max_cjk_ratio:
+        return SCRIPT_LATIN
+    return SCRIPT_CJK
+
+
+def sample_indices(count: int, sample_size: int) -> List[int]:
+    """在 count 行中平均取樣 sample_size 行（頁首、頁中、頁尾都涵蓋）"""
+    if count <= sample_size:
+        return list(range(count))
+    step = (count - 1) / (sample_size - 1) if sample_size > 1 else 0
+    return sorted({round(i * step) for i in range(sample_size)})
@@ -0,0 +1,185 @@
+"""text_system.py
+擴充 onnxocr 的 TextSystem：依頁面文字種類把文字行分流給單一辨識模型。
+
+預設辨識模型（ppocrv4 中文模型）同時涵蓋中文與英文，但字典有六千多字，
+英文頁改用英文辨識模型（字典只有英文字母、數字與符號）較快也較準。
+流程：偵測 → 裁切 → 整頁方向判斷 → 取樣幾行以預設模型辨識判斷文字種類
+      → 中文頁：其餘行以預設模型辨識（樣本結果直接沿用）
+      → 英文頁：全部行以英文模型辨識
+沒有英文模型或未啟用分流時，辨識行為與原本的 TextSystem 相同。
+
+方向分類（cls）原本對每一行執行；這裡先對取樣行分類並投票決定整頁方向
+（見 orientation.py），只有方向不一致或信心不足的頁面才逐行分類。
+"""
+
+import copy
+import time
+from typing import List, Optional
+
+import cv2
+
+from doc_page_extractor.onnxocr import TextSystem
+from doc_page_extractor.onnxocr.predict_rec import TextRecognizer
+from doc_page_extractor.onnxocr.predict_system import sorted_boxes
+from doc_page_extractor.onnxocr.utils import get_minarea_rect_crop, get_rotate_crop_image
+
+from .orientation import ORIENTATION_MIXED, ORIENTATION_ROTATED, vote_page_orientation
+from .script_detection import SCRIPT_LATIN, classify_script, sample_indices
+
+
+class OCRRoutingStats:
+    """OCR 分流統計：各類頁數、各模型辨識行數與耗時，以及整頁方向判斷結果"""
+
+    def __init__(self):
+        self.pages = {"cjk": 0, "latin": 0, "unknown": 0, "unrouted": 0}
+        self.lines = {"default": 0, "english": 0}
+        self.seconds = {"default": 0.0, "english": 0.0, "sampling": 0.0}
+        self.orientation = {"upright": 0, "rotated": 0, "mixed": 0, "cls_lines": 0, "cls_skipped": 0}
+
+    def snapshot(self) -> dict:
+        return {
+            "pages": dict(self.pages),
+            "lines": dict(self.lines),
+            "seconds": dict(self.seconds),
+            "orientation": dict(self.orientation),
+        }
+
+    def estimated_saved_seconds(self, snapshot: Optional[dict] = None) -> float:
+        """英文行若改用預設模型需要的時間，減去英文模型實際耗時與取樣成本"""
+        current = self.snapshot()
+        if snapshot is not None:
+            current = diff_routing_stats(snapshot, current)
+        default_lines = self.lines["default"]
+        if default_lines == 0 or current["lines"]["english"] == 0:
+            return 0.0
+        default_per_line = self.seconds["default"] / default_lines
+        return (current["lines"]["english"] * default_per_line
+                - current["seconds"]["english"] - current["seconds"]["sampling"])
+
+
+def diff_routing_stats(before: dict, after: dict) -> dict:
+    """兩個 snapshot 之間的差異（單一檔案的統計）"""
+    return {
+        group: {key: after[group][key] - before[group][key] for key in after[group]}
+        for group in after
+    }
+
+
+class ExamTextSystem(TextSystem):
+    """可依頁面文字種類分流辨識模型的 TextSystem"""
+
+    def __init__(
+        self,
+        args,
+        english_recognizer: Optional[TextRecognizer] = None,
+        sample_size: int = 6,
+        orientation_sample_size: int = 8,
+    ):
+        super().__init__(args)
+        self.english_recognizer = english_recognizer
+        self.sample_size = sample_size
+        self.orientation_sample_size = orientation_sample_size
+        self.script_routing = False
+        self.routing_stats = OCRRoutingStats()
+
+    def __call__(self, img, cls=True):
+        ori_im = img.copy()
+        dt_boxes = self.text_detector(img)
+        if dt_boxes is None:
+            return None, None
+
+        dt_boxes = sorted_boxes(dt_boxes)
+        img_crop_list = []
+        for box in dt_boxes:
+            tmp_box = copy.deepcopy(box)
+            if self.args.det_box_type == "quad":
+                img_crop_list.append(get_rotate_crop_image(ori_im, tmp_box))
+            else:
+                img_crop_list.append(get_minarea_rect_crop(ori_im, tmp_box))
+
+        if self.use_angle_cls and cls:
+            img_crop_list = self._classify_orientation(img_crop_list)
+
+        rec_res = self._recognize(img_crop_list)
+
+        filter_boxes, filter_rec_res = [], []
+        for box, rec_result in zip(dt_boxes, rec_res):
+            _, score = rec_result
+            if score >= self.drop_score:
+                filter_boxes.append(box)
+                filter_rec_res.append(rec_result)
+        return filter_boxes, filter_rec_res
+
+    def _classify_orientation(self, img_crop_list: List) -> List:
+        """先以取樣行決定整頁方向，只有無法確定時才逐行分類"""
+        if not img_crop_list:
+            return img_crop_list
+        stats = self.routing_stats.orientation
+        indices = sample_indices(len(img_crop_list), self.orientation_sample_size)
+        sample_crops, sample_res = self.text_classifier([img_crop_list[i] for i in indices])
+        orientation = vote_page_orientation(sample_res, self.text_classifier.cls_thresh)
+        stats[orientation] += 1
+
+        sampled = set(indices)
+        rest = [i for i in range(len(img_crop_list)) if i not in sampled]
+        result = list(img_crop_list)
+        for index, crop in zip(indices, sample_crops):
+            result[index] = crop
+
+        if orientation == ORIENTATION_MIXED:
+            # 無法確定整頁方向：取樣行沿用結果，其餘行逐行分類
+            stats["cls_lines"] += len(img_crop_list)
+            if rest:
+                rest_crops, _ = self.text_classifier([img_crop_list[i] for i in rest])
+                for index, crop in zip(rest, rest_crops):
+                    result[index] = crop
+            return result
+
+        stats["cls_lines"] += len(indices)
+        stats["cls_skipped"] += len(rest)
+        if orientation == ORIENTATION_ROTATED:
+            # 整頁倒置：取樣行已由分類器轉正，其餘行直接旋轉 180 度
+            for index in rest:
+                result[index] = cv2.rotate(img_crop_list[index], cv2.ROTATE_180)
+        return result
+
+    def _recognize(self, img_crop_list):
+        stats = self.routing_stats
+        if not self.script_routing or self.english_recognizer is None or not img_crop_list:
+            stats.pages["unrouted"] += 1
+            return self._run_default(img_crop_list)
+
+        # 取樣幾行判斷文字種類
+        indices = sample_indices(len(img_crop_list), self.sample_size)
+        start_time = time.perf_counter()
+        sample_res = self.text_recognizer([img_crop_list[i] for i in indices])
+        sample_seconds = time.perf_counter() - start_time
+        script = classify_script(text for text, _ in sample_res)
+        stats.pages[script] += 1
+
+        if script == SCRIPT_LATIN:
+            stats.seconds["sampling"] += sample_seconds
+            start_time = time.perf_counter()
+            rec_res = self.english_recognizer(img_crop_list)
+            stats.seconds["english"] += time.perf_counter() - start_time
+            stats.lines["english"] += len(img_crop_list)
+            return rec_res
+
+        # 中文頁：樣本結果直接沿用，只辨識其餘行
+        stats.seconds["default"] += sample_seconds
+        stats.lines["default"] += len(indices)
+        rec_res = [None] * len(img_crop_list)
+        for index, result in zip(indices, sample_res):
+            rec_res[index] = result
+        remaining = [i for i in range(len(img_crop_list)) if rec_res[i] is None]
+        if remaining:
+            for index, result in zip(remaining, self._run_default([img_crop_list[i] for i in remaining])):
+                rec_res[index] = result
+        return rec_res
+
+    def _run_default(self, img_crop_list):
+        start_time = time.perf_counter()
+        rec_res = self.text_recognizer(img_crop_list)
+        self.routing_stats.seconds["default"] += time.perf_counter() - start_time
+        self.routing_stats.lines["default"] += len(img_crop_list)
+        return rec_res
@@ -1,6 +1,12 @@
 import re
+import sys
+from collections.abc import Mapping
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Iterator, List, NamedTuple, Optional
+
+# 輸出的題目欄位順序
+QUESTION_KEYS = ("question", "options", "image_path", "scope", "grade", "subject", "semester", "publisher", "chapter", "answer")
 
 def extract_file_info(file_path: str) -> Dict[str, str]:
     """從檔案路徑提取學期、年級、出版社、科目等資訊"""
@@ -70,6 +76,95 @@ def extract_file_info(file_path: str) -> Dict[str, str]:
     
     return info
 
+class FileInfo(NamedTuple):
+    """檔案層級的資訊，同一檔案的所有題目共用一份"""
+    semester: str = ""
+    grade: str = ""
+    publisher: str = ""
+    subject: str = ""
+    chapter: str = ""
+    scope: str = "國中"
+
+@lru_cache(maxsize=1024)
+def file_info(file_path: str) -> FileInfo:
+    """解析並快取檔案資訊，字串經 intern 後在各檔案間共用"""
+    if not file_path:
+        return FileInfo()
+    info = extract_file_info(file_path)
+    return FileInfo(**{key: sys.intern(value) for key, value in info.items()})
+
+class QuestionRecord(Mapping):
+    """精簡的題目資料：只存題目本身的欄位，檔案資訊指向共用的 FileInfo
+
+    以唯讀 Mapping 提供與 standard_question_dict 相同的欄位，輸出 JSON 前再以 to_dict() 轉換。
+    """
+
+    __slots__ = ("question", "options", "image_path", "answer", "info")
+
+    def __init__(self, question: str, options: Dict[str, str], answer: str,
+                 image_path: Optional[str] = None, info: FileInfo = FileInfo()):
+        self.question = question
+        self.options = options
+        self.image_path = image_path
+        self.answer = answer
+        self.info = info
+
+    def __getitem__(self, key: str) -> Any:
+        if key in FileInfo._fields:
+            return getattr(self.info, key)
+        if key in QUESTION_KEYS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(QUESTION_KEYS)
+
+    def __len__(self) -> int:
+        return len(QUESTION_KEYS)
+
+    def __repr__(self) -> str:
+        return f"QuestionRecord({self.question!r}, answer={self.answer!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        info = self.info
+        return {
+            "question": self.question,
+            "options": self.options,
+            "image_path": self.image_path,
+            "scope": info.scope,
+            "grade": info.grade,
+            "subject": info.subject,
+            "semester": info.semester,
+            "publisher": info.publisher,
+            "chapter": info.chapter,
+            "answer": self.answer
+        }
+
+def question_record(
+    question_text: str,
+    options: Dict[str, str],
+    answer: str,
+    file_path: str = "",
+    image_path: Optional[str] = None,
+    subject: str = "",
+    grade: str = "",
+    publisher: str = "",
+    semester: str = "",
+    chapter: str = "",
+    scope: str = "國中"
+) -> QuestionRecord:
+    """建立 QuestionRecord，參數與 standard_question_dict 相同"""
+    info = file_info(file_path)
+    overrides = {
+        key: value
+        for key, value in (("subject", subject), ("grade", grade), ("publisher", publisher),
+                           ("semester", semester), ("chapter", chapter), ("scope", scope))
+        if value and value != getattr(info, key)
+    }
+    if overrides:
+        info = info._replace(**overrides)
+    return QuestionRecord(question_text, options, answer, image_path, info)
+
 def standard_question_dict(
     question_text: str,     # 題目內容
     options: Dict[str, str], # 選項
@@ -84,30 +179,11 @@ def standard_question_dict(
     scope: str = "國中"     # 範圍
 ) -> Dict[str, Any]:
     """創建標準化的題目字典格式"""
-    
-    # 從檔案路徑提取資訊
-    file_info = extract_file_info(file_path) if file_path else {}
-    
-    # 使用提供的參數或從檔案路徑提取的資訊
-    final_subject = subject or file_info.get("subject", "")
-    final_grade = grade or file_info.get("grade", "")
-    final_publisher = publisher or file_info.get("publisher", "")
-    final_semester = semester or file_info.get("semester", "")
-    final_chapter = chapter or file_info.get("chapter", "")
-    final_scope = scope or file_info.get("scope", "國中")
-    
-    # 不再添加前綴，直接使用原始問題文字
-    formatted_question = question_text
-    
-    return {
-        "question": formatted_question,
-        "options": options,
-        "image_path": image_path,
-        "scope": final_scope,
-        "grade": final_grade,
-        "subject": final_subject,
-        "semester": final_semester,
-        "publisher": final_publisher,
-        "chapter": final_chapter,
-        "answer": answer
-    }
+    return question_record(
+        question_text, options, answer, file_path, image_path,
+        subject=subject, grade=grade, publisher=publisher, semester=semester, chapter=chapter, scope=scope
+    ).to_dict()
+
+def question_dicts(questions: Iterable[Mapping]) -> List[Dict[str, Any]]:
+    """輸出前把 QuestionRecord 轉成 dict"""
+    return [q.to_dict() if isinstance(q, QuestionRecord) else dict(q) for q in questions]
@@ -0,0 +1,221 @@
+"""blocks.py
+PDF 轉換時與 Markdown 一起輸出的結構化區塊檔（<檔名>.blocks.jsonl）：每行一個帶型別的區塊與其頁碼、bbox。
+
+pdf_craft 擷取時已經知道每個區塊是標題、內文、表格、公式還是圖片，MarkDownWriter 卻把它們攤平成 Markdown，
+parser 只好再從行首的 <、|、**、$$、![ 猜回來。parser 改讀區塊檔時，表格、公式、圖片在讀入時就有型別
+（exam_lexer.lex_paragraph 直接轉成對應的 Token），不必對每一行做分類。
+
+每行一個 JSON：
+    {"kind":"title","page":0,"bbox":[72.0,64.5,300.0,88.0],"content":"一、單選題"}
+* kind：title / text / table / formula / figure（pdf_craft 捨棄的頁首頁尾等區塊不輸出）
+* text：與 MarkDownWriter 相同，接續到下一個區塊的段落（last_line_touch_end）合併成一筆，
+  因此區塊檔的內文與 Markdown 的段落一一對應；跨頁的段落記錄第一頁的頁碼與 bbox
+* table：另有 format（markdown / latex / html / unrecognizable），content 為表格內容
+* formula：content 為 LaTeX，無法辨識時為空字串
+* figure：content 為圖說
+* bbox 為頁面上的 [left, top, right, bottom]，取不到時為 null
+
+pdf_craft 各版本的區塊屬性不完全相同，這裡只以類別名稱與 getattr 讀取，parsers 不需要安裝 pdf_craft。
+
+    with BlockWriter(blocks_path_for(md_path)) as blocks, MarkDownWriter(md_path, image_dir, "utf-8") as md:
+        for page_index, page_blocks, _ in extractor.extract_enumerated_blocks_and_image(pdf_path):
+            for block in page_blocks:
+                md.write(block)
+                blocks.write(block, page_index)
+
+    questions = list(iter_math_markdown(iter_block_paragraphs(blocks_path_for(md_path)), md_path))
+
+交給 parser 時（iter_block_paragraphs）依 MarkDownWriter 的版面：標題加上 "# "、區塊之間空一行，
+parser 看到的段落與讀 Markdown 時相同，只是表格、公式、圖片多了型別。
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, Optional, Tuple, Union
+
+from .exam_lexer import FORMULA as FORMULA_TOKEN, IMAGE_REF, TABLE as TABLE_TOKEN
+from .jsonl_io import iter_jsonl
+
+PathLike = Union[str, Path]
+Bbox = Tuple[float, float, float, float]
+
+BLOCKS_SUFFIX = ".blocks.jsonl"
+
+TITLE = "title"
+TEXT = "text"
+TABLE = "table"
+FORMULA = "formula"
+FIGURE = "figure"
+
+# 區塊種類 -> 交給 parser 時的 Token 種類；標題與內文仍需逐行分類（題號、選項、區塊標題）
+TOKEN_KINDS = {TABLE: TABLE_TOKEN, FORMULA: FORMULA_TOKEN, FIGURE: IMAGE_REF}
+
+# pdf_craft 的區塊類別名稱 -> 區塊種類
+EXTRACTED_KINDS = {"TableBlock": TABLE, "FormulaBlock": FORMULA, "FigureBlock": FIGURE}
+
+
+@dataclass
+class Block:
+    kind: str
+    content: str
+    page: Optional[int] = None
+    bbox: Optional[Bbox] = None
+    format: Optional[str] = None
+
+    @property
+    def token_kind(self) -> Optional[str]:
+        return TOKEN_KINDS.get(self.kind)
+
+    @property
+    def text(self) -> str:
+        """交給 parser 的文字：與 MarkDownWriter 輸出的內容相同，無法轉成文字的表格與公式以圖片表示"""
+        if self.kind == TABLE and self.format != "markdown" or self.kind == FORMULA and not self.content:
+            return "![]()"
+        if self.kind == FORMULA:
+            return f"$$ {self.content} $$"
+        if self.kind == FIGURE:
+            return f"![{self.content}]()"
+        if self.kind == TITLE:
+            return f"# {self.content}"
+        return self.content
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {"kind": self.kind, "page": self.page,
+                                "bbox": list(self.bbox) if self.bbox else None, "content": self.content}
+        if self.format is not None:
+            data["format"] = self.format
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Block":
+        bbox = data.get("bbox")
+        return cls(data["kind"], data.get("content") or "", data.get("page"),
+                   tuple(bbox) if bbox else None, data.get("format"))
+
+
+def blocks_path_for(md_path: PathLike) -> Path:
+    """Markdown 旁的區塊檔：exam.md -> exam.blocks.jsonl"""
+    path = Path(md_path)
+    return path.with_name(path.stem + BLOCKS_SUFFIX)
+
+
+def find_blocks(md_path: PathLike) -> Optional[Path]:
+    """Markdown 旁可用的區塊檔；Markdown 在轉換之後又被修改過（比區塊檔新）時不使用"""
+    path = blocks_path_for(md_path)
+    try:
+        if path.stat().st_mtime >= Path(md_path).stat().st_mtime:
+            return path
+    except OSError:
+        pass
+    return None
+
+
+def iter_blocks(path: PathLike) -> Iterator[Block]:
+    """逐行讀取區塊檔"""
+    for data in iter_jsonl(path):
+        yield Block.from_dict(data)
+
+
+def iter_block_paragraphs(path: PathLike) -> Iterator[Union[Block, str]]:
+    """交給 parser 的段落：與 MarkDownWriter 相同，區塊之間以空行分隔（parser 往後看時遇到空行會停下）"""
+    for n, block in enumerate(iter_blocks(path)):
+        if n:
+            yield ""
+        yield block
+
+
+def _bbox(rect) -> Optional[Bbox]:
+    """doc_page_extractor 的 Rectangle（四個角）轉成 (left, top, right, bottom)"""
+    if rect is None:
+        return None
+    wrapper = getattr(rect, "wrapper", None)
+    if wrapper is None:
+        try:
+            xs = [point[0] for point in (rect.lt, rect.rt, rect.lb, rect.rb)]
+            ys = [point[1] for point in (rect.lt, rect.rt, rect.lb, rect.rb)]
+        except AttributeError:
+            return None
+        wrapper = (min(xs), min(ys), max(xs), max(ys))
+    return tuple(round(float(value), 1) for value in wrapper)
+
+
+def _union(a: Optional[Bbox], b: Optional[Bbox]) -> Optional[Bbox]:
+    if a is None or b is None:
+        return a or b
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def _texts_content(texts) -> str:
+    """與 MarkDownWriter 相同：每行去除前後空白、換行改成空白後直接相接"""
+    return "".join(text.content.strip().replace("\n", " ") for text in texts or ())
+
+
+def _kind_name(value) -> str:
+    return getattr(value, "name", str(value)).lower()
+
+
+class BlockWriter:
+    """把 pdf_craft 的區塊寫成區塊檔，段落合併的規則與 MarkDownWriter 相同"""
+
+    def __init__(self, path: PathLike, encoding: str = "utf-8"):
+        self.path = Path(path)
+        self.count = 0
+        self._file: IO[str] = open(self.path, "w", encoding=encoding)
+        self._paragraph: Optional[Block] = None
+
+    def __enter__(self) -> "BlockWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """關閉後更新修改時間：BlockWriter 包在 MarkDownWriter 外層時，區塊檔不會比同時寫出的 Markdown 舊（見 find_blocks）"""
+        if self._file.closed:
+            return
+        self._flush()
+        self._file.close()
+        os.utime(self.path)
+
+    def write(self, block, page: Optional[int] = None) -> None:
+        kind = EXTRACTED_KINDS.get(type(block).__name__)
+        if kind is None:
+            text_kind = _kind_name(getattr(block, "kind", ""))
+            if text_kind == "title":
+                self._flush()
+                self._emit(Block(TITLE, _texts_content(block.texts), page, _bbox(getattr(block, "rect", None))))
+            elif text_kind == "plain_text":
+                self._write_plain_text(block, page)
+            return
+
+        self._flush()
+        content = getattr(block, "content", None) if kind != FIGURE else _texts_content(block.texts)
+        text_format = _kind_name(block.format) if kind == TABLE else None
+        self._emit(Block(kind, content or "", page, _bbox(getattr(block, "rect", None)), text_format))
+
+    def _write_plain_text(self, block, page: Optional[int]) -> None:
+        if getattr(block, "has_paragraph_indentation", False):
+            self._flush()
+        bbox = _bbox(getattr(block, "rect", None))
+        content = _texts_content(block.texts)
+        if self._paragraph is None:
+            self._paragraph = Block(TEXT, content, page, bbox)
+        else:
+            self._paragraph.content += content
+            if self._paragraph.page == page:
+                self._paragraph.bbox = _union(self._paragraph.bbox, bbox)
+        if not getattr(block, "last_line_touch_end", False):
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._paragraph is not None:
+            self._emit(self._paragraph)
+            self._paragraph = None
+
+    def _emit(self, block: Block) -> None:
+        self._file.write(json.dumps(block.to_dict(), ensure_ascii=False, separators=(",", ":")))
+        self._file.write("\n")
+        self.count += 1
+
@@ -1,32 +1,39 @@
 # chinese_parser_longpassage.py
 import re
-from typing import List
+from typing import Any, Dict, Iterable, Iterator, List
 import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 from utils.image_naming import generate_image_path_for_parser
+from .base_parser import QuestionRecord, question_dicts, question_record
+from .exam_lexer import TokenStream, option_items
+from .normalize import FoldedText
+from .profiling import profiled
 
-ANS_MAP = str.maketrans("ＡＢＣＤ", "ABCD")
+PARSER_VERSION = "1"
+ANSWER_PREFIX_RE = re.compile(r"^\(\s*[A-D]\s*\)\s*\d+[.、]\s*")  # ( Ｄ )1. ，在半形版本上比對
 LONG_LIMIT = 60               # 幾個字以上視為「長段落」
 IMAGE_KEYWORDS = ("圖", "附圖", "如圖")
 
-def _answer(text):
+LETTERS = "ＡＢＣＤABCD"
+
+def _answer(token):
     # 匹配格式：( Ｂ )1. 或 (Ｂ)1. 
-    m = re.match(r"^[（(]\s*([Ａ-ＤABCD])\s*[）)]\s*\d+", text)
-    return m.group(1).translate(ANS_MAP) if m else None
+    if token.letter and token.letter in LETTERS and token.number is not None:
+        return token.answer
+    return None
 
-def _options(lines):
+def _options(tokens):
     d = {}
-    for ln in lines:
+    for token in tokens:
         # 匹配全形和半形括號及字母：(Ａ)內容 或 (A)內容
-        for m in re.finditer(r"[（(]([Ａ-ＤABCD])[）)]([^（()）]+)", ln):
-            letter = m.group(1).translate(ANS_MAP)  # 轉換為半形
-            d[letter] = m.group(2).strip()
+        for item in option_items(token.text, token.markers, LETTERS, stops="（()）"):
+            d[item.letter] = item.content
     return d if len(d) == 4 else None
 
 def _clean(txt):
     # 移除答案標記：( Ｄ )1. 
-    txt = re.sub(r"^[（(]\s*[Ａ-ＤABCD]\s*[）)]\s*\d+[.、]\s*", "", txt)
+    txt = FoldedText.of(txt).sub(ANSWER_PREFIX_RE, "")
     # 移除可能的題號：1. 
     txt = re.sub(r"^(\d+[.、])\s*", "", txt)
     # 移除答案部分
@@ -43,54 +50,49 @@ def _clean(txt):
     
     return txt.strip()
 
-def _is_q(text):
+def _is_answer_q(token):
     # 匹配單選題格式：( Ｂ )1. 或 (Ｂ)1. 
-    # 以及其他題型格式：1. 
-    return bool(re.match(r"^[（(]\s*[Ａ-ＤABCD]\s*[）)]\s*\d+[.、]", text)) or \
-           bool(re.match(r"^\d+[.、]", text))
+    return bool(token.letter) and token.letter in LETTERS and token.separator in (".", "、")
+
+def _is_q(token):
+    # 單選題格式，以及其他題型格式：1. 
+    return _is_answer_q(token) or (token.letter is None and token.separator in (".", "、"))
 
 def _needs_image(text: str) -> bool:
     """Return True if question references an image."""
     return any(kw in text for kw in IMAGE_KEYWORDS)
 
-def parse_chinese(paragraphs, file_path: str = "") -> List[dict]:
-    """解析中文考卷主函數"""
-    from .base_parser import standard_question_dict
-    
-    res = []
-    i, n, gid = 0, len(paragraphs), 0
-    current_intro = []
-    img_idx = 0
+@profiled("chinese", lambda paragraphs, file_path="": file_path)
+def parse_chinese(paragraphs, file_path: str = "") -> List[Dict[str, Any]]:
+    """解析中文考卷主函數；回傳一般 dict，串流與整批輸出請用 iter_chinese"""
+    return question_dicts(iter_chinese(paragraphs, file_path))
 
-    def flush_intro():
-        nonlocal current_intro, gid
-        if current_intro:
-            gid += 1
-            intro_text = "\n".join(current_intro).rstrip()
-            current_intro = []
-            return intro_text
-        return None
+def iter_chinese(paragraphs: Iterable, file_path: str = "") -> Iterator[QuestionRecord]:
+    """串流解析中文考卷：paragraphs 可為任何行的 iterator，每解析完一題就 yield"""
+    tokens = TokenStream(paragraphs)
+    i = 0
+    img_idx = 0
 
-    while i < n:
-        raw = paragraphs[i].text.rstrip() if hasattr(paragraphs[i], 'text') else str(paragraphs[i]).rstrip()
-        txt = raw.strip()
+    while tokens.has(i):
+        tokens.release(i)
+        token = tokens[i]
+        txt = token.text
 
-        if _is_q(txt):                # 遇到題號
-            intro_text = flush_intro()  # 若有文章先出清
+        if _is_q(token):              # 遇到題號
             # 收集選項
             look, j = [], i
             # 首先檢查當前行是否包含選項
-            if re.search(r"[（(][Ａ-ＤABCD][）)]", txt):
-                look.append(txt)
+            if token.has_marker(LETTERS):
+                look.append(token)
             # 然後檢查後續行
             j = i + 1
-            while j < n and j < i + 5:  # 最多檢查後續5行
-                line_text = paragraphs[j].text.strip() if hasattr(paragraphs[j], 'text') else str(paragraphs[j]).strip()
-                if re.search(r"[（(][Ａ-ＤABCD][）)]", line_text):
-                    look.append(line_text)
-                elif line_text and not re.match(r"^[（(]\s*[Ａ-ＤABCD]\s*[）)]\s*\d+[.、]", line_text):
+            while j < i + 5 and tokens.has(j):  # 最多檢查後續5行
+                line_token = tokens[j]
+                if line_token.has_marker(LETTERS):
+                    look.append(line_token)
+                elif line_token.text and not _is_answer_q(line_token):
                     # 如果不是空行且不是新題目，也加入（可能是選項的延續）
-                    look.append(line_text)
+                    look.append(line_token)
                 else:
                     break
                 j += 1
@@ -110,19 +112,15 @@ def parse_chinese(paragraphs, file_path: str = "") -> List[dict]:
                     img_name = None
                     
                 # 使用新的標準格式
-                formatted_q = standard_question_dict(
+                formatted_q = question_record(
                     question_text=question_text,
                     options=opts,
-                    answer=_answer(txt),
+                    answer=_answer(token),
                     file_path=file_path,
                     image_path=img_name
                 )
-                res.append(formatted_q)
+                yield formatted_q
             i = j
         else:
-            # 非題號 ⇒ 累積成文章段
-            if txt or raw == "":
-                current_intro.append(raw)
+            # 非題號（文章段）：題目不引用文章內容，直接略過，記憶體不隨文章長度增加
             i += 1
-
-    return res
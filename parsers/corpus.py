@@ -0,0 +1,231 @@
+"""corpus.py
+整批解析題庫：走訪 input_md / docx 資料夾，依 extract_file_info 對應出的科目把每個檔案交給對應的 parser，
+以行程池平行解析，合併寫成一個 JSONL 檔。命令列入口為 tools/build_question_bank.py。
+
+路徑結構與 extract_file_info 相同：input_md/111A/7/Hanlin/Math/檔案名.md
+
+指定 index_path 時，worker 只算出每題的 question_key，由主行程依檔案順序登記到 QuestionIndex，
+只輸出第一次出現的題目；重複題的出現位置仍記錄在索引內。平行與否、worker 誰先完成，
+輸出的都是檔案順序（路徑排序）中最早的那一份。
+指定 cache_dir 時，內容與 parser 版本都沒變的檔案直接讀回 ResultCache 內的 JSONL，不重新解析。
+.md 旁有 PDF 轉換時一併輸出的區塊檔（blocks.py）時，數學 parser 直接讀區塊檔，不再逐行分類 Markdown；
+其他 parser 仍讀 .md（BLOCK_PARSERS）。
+profile 為 True（或設定環境變數 PDF2MD_PROFILE=1）時，worker 剖析每個實際解析的檔案，報告寫在輸入檔旁邊，
+剖析紀錄隨結果傳回主行程，彙整在 active_profiler() 內，可再以 print_summary() 列出偏慢或偏耗記憶體的檔案。
+"""
+
+import json
+import multiprocessing as mp
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from importlib import import_module
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+
+from .base_parser import file_info
+from .blocks import find_blocks, iter_block_paragraphs
+from .docx_reader import iter_docx_paragraphs
+from .jsonl_io import open_jsonl, question_line
+from .profiling import BatchProfiler, ProfileRecord, active_profiler, enable_profiling
+from .question_index import QuestionIndex, question_key
+from .result_cache import BLOCK_PARSERS, ResultCache, content_key
+
+CORPUS_SUFFIXES = (".md", ".docx")
+
+# extract_file_info 對應出的科目 -> parser 名稱
+SUBJECT_PARSERS = {
+    "數學": "math",
+    "國文": "chinese",
+    "英語": "english",
+    "理化": "science",
+    "生物": "science",
+    "自然": "science",
+    "歷史": "social",
+    "地理": "social",
+    "公民": "social",
+}
+
+
+# parser 名稱 -> (模組, 串流解析函數)，在 worker 內第一次用到時才載入
+PARSERS: Dict[str, Tuple[str, str]] = {
+    "math": ("math_parser", "iter_math_markdown"),
+    "chinese": ("chinese_parser", "iter_chinese"),
+    "english": ("english_parser", "iter_english"),
+    "science": ("science_parser", "iter_science"),
+    "social": ("social_parser", "iter_social"),
+}
+
+
+def parser_function(name: str) -> Callable[[Iterable, str], Iterator[Mapping]]:
+    module_name, function_name = PARSERS[name]
+    return getattr(import_module(f".{module_name}", __package__), function_name)
+
+
+def parser_for(path: str) -> Optional[str]:
+    """依檔案路徑的科目資料夾決定使用哪個 parser，無法對應時回傳 None"""
+    return SUBJECT_PARSERS.get(file_info(path).subject)
+
+
+def find_corpus_files(root_dir: Path) -> List[Path]:
+    return sorted(p for p in Path(root_dir).rglob("*") if p.suffix.lower() in CORPUS_SUFFIXES and not p.name.startswith("~$"))
+
+
+# 每個 worker 行程各自的設定與快取，由 _init_worker 設定
+_with_keys = False
+_cache: Optional[ResultCache] = None
+
+
+def _init_worker(with_keys: bool, cache_dir: Optional[str] = None, profile: bool = False) -> None:
+    global _with_keys, _cache
+    _with_keys = with_keys
+    _cache = ResultCache(cache_dir) if cache_dir else None
+    # fork 出來的 worker 與單行程執行時沿用主行程的剖析器
+    if profile and active_profiler() is None:
+        enable_profiling()
+
+
+class FileResult(NamedTuple):
+    """單一檔案的解析結果；lines 在 worker 內就轉成 JSON 字串，回傳給主行程時只需傳送字串"""
+    path: str
+    parser: Optional[str]
+    lines: List[str]
+    keys: List[Tuple[str, str]] = []   # 需要去重時每題的 (question_key, 題目文字)
+    cached: bool = False
+    seconds: float = 0.0
+    error: Optional[str] = None
+    profile: Optional[ProfileRecord] = None   # 剖析開啟且實際解析時的剖析紀錄
+
+
+def _parse_questions(name: str, path: str, blocks_path: Optional[Path] = None) -> List[Mapping]:
+    parse = parser_function(name)
+    if path.lower().endswith(".docx"):
+        return list(parse(iter_docx_paragraphs(path), path))
+    if blocks_path is not None:
+        return list(parse(iter_block_paragraphs(blocks_path), path))
+    with open(path, "r", encoding="utf-8") as f:
+        return list(parse(f, path))
+
+
+def _profiled_parse(name: str, path: str, blocks_path: Optional[Path] = None) -> Tuple[List[Mapping], Optional[ProfileRecord]]:
+    """解析檔案；剖析開啟時取出這次解析的剖析紀錄，交由主行程彙整"""
+    profiler = active_profiler()
+    count = len(profiler.records) if profiler is not None else 0
+    record = None
+    try:
+        with profiler.profile(name, path, path) if profiler is not None else nullcontext():
+            questions = _parse_questions(name, path, blocks_path)
+    finally:
+        if profiler is not None and len(profiler.records) > count:
+            record = profiler.records.pop()
+    return questions, record
+
+
+def parse_file(path: str) -> FileResult:
+    """解析單一檔案（或讀回快取），再視需要以重複題索引過濾"""
+    name = parser_for(path)
+    if name is None:
+        return FileResult(path, None, [])
+    start_time = time.perf_counter()
+    try:
+        key = lines = record = None
+        blocks_path = find_blocks(path) if name in BLOCK_PARSERS and not path.lower().endswith(".docx") else None
+        if _cache is not None:
+            # key 以實際解析的檔案計算：有區塊檔時 parser 讀的是區塊檔，.md 沒變、區塊檔重新產生時也要重新解析
+            key = content_key(path, Path(blocks_path or path).read_bytes())
+            lines = _cache.load_lines(name, key)
+        cached = lines is not None
+        if cached:
+            questions = [json.loads(line) for line in lines] if _with_keys else None
+        else:
+            questions, record = _profiled_parse(name, path, blocks_path)
+            lines = [question_line(q) for q in questions]
+            if _cache is not None:
+                _cache.store_lines(name, key, lines)
+
+        keys = [(question_key(q), str(q["question"])) for q in questions] if _with_keys else []
+        return FileResult(path, name, lines, keys, cached, time.perf_counter() - start_time, profile=record)
+    except Exception as e:
+        return FileResult(path, name, [], seconds=time.perf_counter() - start_time, error=f"{type(e).__name__}: {e}")
+
+
+@dataclass
+class ParserStats:
+    files: int = 0
+    questions: int = 0
+    duplicates: int = 0
+    cached: int = 0
+    seconds: float = 0.0
+    errors: int = 0
+
+
+@dataclass
+class CorpusReport:
+    parsers: Dict[str, ParserStats] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)
+    errors: List[Tuple[str, str]] = field(default_factory=list)
+    wall_seconds: float = 0.0
+
+    @property
+    def questions(self) -> int:
+        return sum(stats.questions for stats in self.parsers.values())
+
+
+def build_corpus(files: List[Path], out_path: Path, workers: int = 1, chunksize: Optional[int] = None,
+                 compress: Optional[bool] = None, index_path: Optional[Path] = None,
+                 cache_dir: Optional[Path] = None, profile: bool = False) -> CorpusReport:
+    """平行解析所有檔案並依檔案順序合併寫入 out_path，指定 index_path 時略過已登記過的重複題"""
+    report = CorpusReport()
+    profiler = enable_profiling() if profile else active_profiler()
+    paths = [str(p) for p in files]
+    if chunksize is None:
+        # 每個 worker 大約分到 4 批，兼顧負載平衡與行程間傳輸的次數
+        chunksize = max(1, len(paths) // (max(workers, 1) * 4))
+
+    worker_args = (index_path is not None, str(cache_dir) if cache_dir else None, profiler is not None)
+
+    start_time = time.perf_counter()
+    index = QuestionIndex(index_path) if index_path else None
+    try:
+        with open_jsonl(out_path, "w", compress) as out:
+            if workers > 1:
+                with mp.get_context().Pool(processes=workers, initializer=_init_worker, initargs=worker_args) as pool:
+                    _collect(pool.imap(parse_file, paths, chunksize=chunksize), out, report, index, profiler)
+            else:
+                _init_worker(*worker_args)
+                try:
+                    _collect(map(parse_file, paths), out, report, index, profiler)
+                finally:
+                    _init_worker(False)
+    finally:
+        if index is not None:
+            index.close()
+    report.wall_seconds = time.perf_counter() - start_time
+    return report
+
+
+def _collect(results: Iterable[FileResult], out, report: CorpusReport, index: Optional[QuestionIndex] = None,
+             profiler: Optional[BatchProfiler] = None) -> None:
+    """依檔案順序寫出結果；有索引時在這裡登記，第一次出現的判定只取決於檔案順序"""
+    for result in results:
+        if result.parser is None:
+            report.skipped.append(result.path)
+            continue
+        if profiler is not None and result.profile is not None:
+            profiler.records.append(result.profile)
+        stats = report.parsers.setdefault(result.parser, ParserStats())
+        stats.files += 1
+        stats.seconds += result.seconds
+        if result.error:
+            stats.errors += 1
+            report.errors.append((result.path, result.error))
+            continue
+        lines = result.lines
+        if index is not None:
+            lines = [line for line, is_new in zip(lines, index.add_keys(result.keys, result.path)) if is_new]
+            stats.duplicates += len(result.lines) - len(lines)
+        stats.questions += len(lines)
+        stats.cached += result.cached
+        for line in lines:
+            out.write(line)
+            out.write("\n")
@@ -0,0 +1,104 @@
+"""docx_reader.py
+串流讀取 .docx 的段落文字：直接從 zip 取出主文件（通常是 word/document.xml），
+以 iterparse 逐段解析，每讀完一個段落就 yield 它的文字並把該段落從樹上移除，
+不建立 python-docx 的 Document / Paragraph / Run 物件，也不保留整棵 XML 樹。
+
+輸出與 python-docx 的 [p.text for p in Document(path).paragraphs] 相同：
+* 只包含 w:body 底下直接的 w:p（表格、文字方塊內的段落不算）
+* 段落文字為直接子元素 w:r 與 w:hyperlink 內 w:r 的文字
+* w:tab / w:ptab -> "\\t"，w:br（換行）/ w:cr -> "\\n"，w:noBreakHyphen -> "-"，分頁 / 分欄的 w:br 為空字串
+* 全形空白等字元原樣保留
+
+各 parser 接受字串段落，可直接把 iter_docx_paragraphs(path) 當成 doc.paragraphs 使用。
+"""
+
+import posixpath
+import zipfile
+from pathlib import Path
+from typing import Iterator, List, Union
+from xml.etree.ElementTree import iterparse, parse
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+W_BODY = W_NS + "body"
+W_P = W_NS + "p"
+W_R = W_NS + "r"
+W_HYPERLINK = W_NS + "hyperlink"
+W_T = W_NS + "t"
+W_BR = W_NS + "br"
+W_TYPE = W_NS + "type"
+
+# run 內非 w:t / w:br 元素對應的文字
+RUN_CHARS = {
+    W_NS + "tab": "\t",
+    W_NS + "ptab": "\t",
+    W_NS + "cr": "\n",
+    W_NS + "noBreakHyphen": "-",
+}
+
+OFFICE_DOCUMENT_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+PACKAGE_RELS = "_rels/.rels"
+DEFAULT_DOCUMENT_PART = "word/document.xml"
+
+
+def document_part_name(docx: zipfile.ZipFile) -> str:
+    """依 _rels/.rels 找出主文件在 zip 內的路徑"""
+    try:
+        with docx.open(PACKAGE_RELS) as f:
+            for rel in parse(f).getroot():
+                if rel.get("Type") == OFFICE_DOCUMENT_REL:
+                    return posixpath.normpath(rel.get("Target", DEFAULT_DOCUMENT_PART).lstrip("/"))
+    except KeyError:
+        pass
+    return DEFAULT_DOCUMENT_PART
+
+
+def _run_text(run, parts: List[str]) -> None:
+    for child in run:
+        tag = child.tag
+        if tag == W_T:
+            if child.text:
+                parts.append(child.text)
+        elif tag == W_BR:
+            if child.get(W_TYPE, "textWrapping") == "textWrapping":
+                parts.append("\n")
+        else:
+            char = RUN_CHARS.get(tag)
+            if char:
+                parts.append(char)
+
+
+def paragraph_element_text(p) -> str:
+    """w:p 元素的文字，規則與 python-docx 的 Paragraph.text 相同"""
+    parts: List[str] = []
+    for child in p:
+        if child.tag == W_R:
+            _run_text(child, parts)
+        elif child.tag == W_HYPERLINK:
+            for run in child:
+                if run.tag == W_R:
+                    _run_text(run, parts)
+    return "".join(parts)
+
+
+def iter_docx_paragraphs(docx_path: Union[str, Path]) -> Iterator[str]:
+    """逐段 yield 文件本文的段落文字"""
+    with zipfile.ZipFile(docx_path) as docx:
+        with docx.open(document_part_name(docx)) as f:
+            depth = 0
+            body = None
+            for event, elem in iterparse(f, events=("start", "end")):
+                if event == "start":
+                    depth += 1
+                    if depth == 2 and elem.tag == W_BODY:
+                        body = elem
+                    continue
+                depth -= 1
+                # depth 2 = w:body 的直接子元素結束：處理完就從樹上移除
+                if depth == 2 and body is not None:
+                    if elem.tag == W_P:
+                        yield paragraph_element_text(elem)
+                    body.remove(elem)
+
+
+def read_docx_paragraphs(docx_path: Union[str, Path]) -> List[str]:
+    return list(iter_docx_paragraphs(docx_path))
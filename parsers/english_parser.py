@@ -25,28 +25,28 @@ from __future__ import annotations
 import re
 import json
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
-from docx import Document
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
 from utils.image_naming import generate_image_path_for_parser
+from .base_parser import QuestionRecord, question_dicts, question_record
+from .docx_reader import iter_docx_paragraphs
+from .jsonl_io import jsonl_path_for, write_jsonl
+from .exam_lexer import SECTION_HEADER, OPTION_LETTERS, Token, TokenStream, option_items
+from .normalize import FoldedText, fold_width
+from .profiling import profiled
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Regex 池
 # ────────────────────────────────────────────────────────────────────────────────
-QUESTION_RE = re.compile(r"^[（(]\s*([Ａ-ＤABCD])\s*[）)]\s*(\d+)\.\s*(.*)")  # ( Ｂ )1. …
-READING_Q_RE = re.compile(r"^[（(]\s*[）)]\s*[（(](\d+)[）)]\s*(.*)")      # ( ) (1) …
-OPTION_INLINE_RE = re.compile(r"[（(]([Ａ-ＤABCD])[）)]\s*([^（()]+)")     # (A) xxx inline  
-OPTION_SINGLE_RE = re.compile(r"^[（(]([Ａ-ＤABCD])[）)]\s*(.+)")        # (A) xxx on own line
+# 題目、選項的判斷改由 exam_lexer 的 Token 欄位處理，這裡只保留區塊標題
 SECTION_VOCAB = re.compile(r"^\*\*一、.*字彙選擇")                    # **一、字彙選擇：每題2分，共40分**
 SECTION_GRAMMAR = re.compile(r"^\*\*二、.*文法")                        # **二、文法：每題2分，共40分**
 SECTION_READING = re.compile(r"^\*\*三、.*閱讀測驗")                    # **三、閱讀測驗：每題2分，共20分**
-QUESTION_START_MARK = re.compile(r"^[（(]\s*[Ａ-ＤABCD]?\s*[）)]\s*[\(\d]")  # ( Ｃ )12. 或 ( ) (1)
 
-FW_MAP = str.maketrans("ＡＢＣＤ", "ABCD")
-IDEOSP = "　"
-BLANK_RE = re.compile(rf"[{IDEOSP} \t]{{2,}}")  # 連續半形/全形空白≥2 → ____
+PARSER_VERSION = "1"
+BLANK_RE = re.compile(r"[ \t]{2,}")  # 連續半形/全形空白≥2 → ____（在半形版本上比對）
 IMAGE_KEYWORDS = ("figure", "picture", "圖", "附圖", "如圖")
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -54,7 +54,7 @@ IMAGE_KEYWORDS = ("figure", "picture", "圖", "附圖", "如圖")
 # ────────────────────────────────────────────────────────────────────────────────
 
 def _normalize_blank(text: str) -> str:
-    return BLANK_RE.sub("____", text)
+    return FoldedText.of(text).sub(BLANK_RE, "____")
 
 def _clean_question_text(text: str) -> str:
     """清理題目文本，移除分數信息和其他不必要的內容"""
@@ -69,39 +69,63 @@ def _clean_question_text(text: str) -> str:
     
     return text.strip()
 
-def _extract_inline_options(text: str, opt: Dict[str, str]):
-    for m in OPTION_INLINE_RE.finditer(text):
-        letter = m.group(1).translate(FW_MAP)  # 轉換為半形
-        opt[letter] = m.group(2).strip()
+def _question_match(token: Token) -> Optional[str]:
+    """( Ｂ )1. … 格式的題目，回傳題號之後的文字"""
+    if token.letter and token.letter in OPTION_LETTERS and token.separator == ".":
+        return token.rest
+    return None
 
+def _reading_match(token: Token) -> Optional[str]:
+    """( ) (1) … 格式的閱讀測驗題目，回傳小題號之後的文字"""
+    if token.letter == "" and token.sub_number is not None:
+        return token.rest
+    return None
 
-def _collect_options(paragraphs, start_idx: int) -> tuple[Dict[str, str], int]:
+def _is_question_start(token: Token) -> bool:
+    """( Ｃ )12. 或 ( ) (1)"""
+    if token.letter is None or (token.letter and token.letter not in OPTION_LETTERS):
+        return False
+    next_char = token.text[token.lead_end:token.lead_end + 1]
+    return next_char == "(" or next_char.isdecimal()
+
+def _question_text(token: Token, rest: str) -> str:
+    """去掉行內選項，只保留題目部分"""
+    offset = len(token.text) - len(rest)
+    for item in option_items(token.text, token.markers):
+        if item.start >= offset:
+            return token.text[offset:item.start]
+    return rest
+
+def _extract_inline_options(token: Token, opt: Dict[str, str]):
+    for item in option_items(token.text, token.markers):
+        opt[item.letter] = item.content.replace("\t", " ")
+
+
+def _collect_options(tokens: TokenStream, start_idx: int) -> tuple[Dict[str, str], int]:
     """從 start_idx 開始累積直到取得 4 個選項或遇下一題。"""
     opts: Dict[str, str] = {}
-    i, n = start_idx, len(paragraphs)
+    i = start_idx
     
     # 檢查當前行是否包含選項
-    current_line = paragraphs[i].text.replace("\t", " ").rstrip()
-    _extract_inline_options(current_line, opts)
+    _extract_inline_options(tokens[i], opts)
     
     # 檢查後續行
     i += 1
-    while i < n and len(opts) < 4:
-        line = paragraphs[i].text.replace("\t", " ").rstrip()
+    while len(opts) < 4 and tokens.has(i):
+        token = tokens[i]
         
         # 如果遇到新題目，停止
-        if QUESTION_START_MARK.match(line.strip()):
+        if _is_question_start(token):
             break
             
         # 提取行內選項
-        _extract_inline_options(line, opts)
+        _extract_inline_options(token, opts)
         
         # 檢查獨立行選項
-        m_single = OPTION_SINGLE_RE.match(line.strip())
-        if m_single:
-            letter = m_single.group(1).translate(FW_MAP)
-            if letter not in opts:
-                opts[letter] = m_single.group(2).strip()
+        if token.markers and token.markers[0][:2] == (0, 3) and len(token.text) > 3:
+            letter = fold_width(token.markers[0][2])
+            if letter in "ABCD" and letter not in opts:
+                opts[letter] = token.text[3:].strip().replace("\t", " ")
         
         i += 1
     
@@ -114,54 +138,54 @@ def _needs_image(text: str) -> bool:
 # 主解析
 # ────────────────────────────────────────────────────────────────────────────────
 
-def parse_english(paragraphs, file_path: str = "") -> List[dict]:
-    """解析英文考卷：字彙選擇、文法、閱讀測驗。"""
-    from .base_parser import standard_question_dict
-    
-    res: List[dict] = []
+@profiled("english", lambda paragraphs, file_path="": file_path)
+def parse_english(paragraphs, file_path: str = "") -> List[Dict[str, Any]]:
+    """解析英文考卷：字彙選擇、文法、閱讀測驗。回傳一般 dict，串流與整批輸出請用 iter_english"""
+    return question_dicts(iter_english(paragraphs, file_path))
+
+def iter_english(paragraphs: Iterable, file_path: str = "") -> Iterator[QuestionRecord]:
+    """串流解析英文考卷：paragraphs 可為任何行的 iterator，每解析完一題就 yield"""
     current_section = None
-    i, n = 0, len(paragraphs)
+    i = 0
     img_idx = 0
-    current_passage = None
 
-    while i < n:
-        line_raw = paragraphs[i].text.rstrip() if hasattr(paragraphs[i], 'text') else str(paragraphs[i]).rstrip()
-        line = line_raw.strip()
+    tokens = TokenStream(paragraphs)
+
+    while tokens.has(i):
+        tokens.release(i)
+        token = tokens[i]
+        line = token.text
 
         # 檢查章節標題
-        if SECTION_VOCAB.match(line):
-            current_section = "vocab"
-            i += 1
-            continue
-        elif SECTION_GRAMMAR.match(line):
-            current_section = "grammar"  
-            i += 1
-            continue
-        elif SECTION_READING.match(line):
-            current_section = "reading"
-            current_passage = []
-            i += 1
-            continue
+        if token.kind == SECTION_HEADER:
+            if SECTION_VOCAB.match(line):
+                current_section = "vocab"
+                i += 1
+                continue
+            elif SECTION_GRAMMAR.match(line):
+                current_section = "grammar"  
+                i += 1
+                continue
+            elif SECTION_READING.match(line):
+                current_section = "reading"
+                i += 1
+                continue
 
         if not current_section:
             i += 1
             continue
 
         # 處理一般題目：( B )1. 
-        q_match = QUESTION_RE.match(line)
-        if q_match:
-            ans_fw, _num, rest = q_match.groups()
-            answer = ans_fw.translate(FW_MAP)
+        q_rest = _question_match(token)
+        if q_rest is not None:
+            answer = token.answer
             
             # 清理題目文字，移除選項部分
-            question_text = rest
-            first_opt = OPTION_INLINE_RE.search(rest)
-            if first_opt:
-                question_text = rest[:first_opt.start()]
+            question_text = _question_text(token, q_rest)
             question_str = _clean_question_text(_normalize_blank(question_text.rstrip()))
 
             if question_str:  # 確保題目不為空
-                opts, new_i = _collect_options(paragraphs, i)
+                opts, new_i = _collect_options(tokens, i)
                 if len(opts) == 4:
                     # 處理圖片
                     if _needs_image(question_str):
@@ -171,31 +195,26 @@ def parse_english(paragraphs, file_path: str = "") -> List[dict]:
                         img_name = None
                         
                     # 使用新的標準格式
-                    formatted_q = standard_question_dict(
+                    formatted_q = question_record(
                         question_text=question_str,
                         options={k: opts[k] for k in sorted(opts)},
                         answer=answer,
                         file_path=file_path,
                         image_path=img_name
                     )
-                    res.append(formatted_q)
+                    yield formatted_q
                 i = new_i
                 continue
 
         # 處理閱讀測驗題目：( ) (1)
-        reading_match = READING_Q_RE.match(line)
-        if reading_match and current_section == "reading":
-            _num, rest = reading_match.groups()
-            
+        reading_rest = _reading_match(token)
+        if reading_rest is not None and current_section == "reading":
             # 清理題目文字
-            question_text = rest
-            first_opt = OPTION_INLINE_RE.search(rest)
-            if first_opt:
-                question_text = rest[:first_opt.start()]
+            question_text = _question_text(token, reading_rest)
             question_str = _clean_question_text(_normalize_blank(question_text.rstrip()))
 
             if question_str:  # 確保題目不為空
-                opts, new_i = _collect_options(paragraphs, i)
+                opts, new_i = _collect_options(tokens, i)
                 if len(opts) == 4:
                     # 處理圖片
                     if _needs_image(question_str):
@@ -205,44 +224,49 @@ def parse_english(paragraphs, file_path: str = "") -> List[dict]:
                         img_name = None
                         
                     # 使用新的標準格式
-                    formatted_q = standard_question_dict(
+                    formatted_q = question_record(
                         question_text=question_str,
                         options={k: opts[k] for k in sorted(opts)},
                         answer="",  # 閱讀測驗題目可能沒有明確答案
                         file_path=file_path,
                         image_path=img_name
                     )
-                    res.append(formatted_q)
+                    yield formatted_q
                 i = new_i
                 continue
 
-        # 收集閱讀文章內容
-        if current_section == "reading" and not (q_match or reading_match):
-            if current_passage is not None:
-                current_passage.append(line)
-
+        # 閱讀文章內容不輸出，直接略過，記憶體不隨文章長度增加
         i += 1
 
-    return res
-
 # ────────────────────────────────────────────────────────────────────────────────
 # CLI & 呼叫端
 # ────────────────────────────────────────────────────────────────────────────────
 
 def convert_to_json(docx_path: str, out_path: Optional[str] = None):
-    doc = Document(docx_path)
-    data = parse_english(doc.paragraphs, docx_path)
+    data = parse_english(iter_docx_paragraphs(docx_path), docx_path)
     if out_path is None:
         out_path = str(Path(docx_path).with_suffix(".json"))
     with open(out_path, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
     return out_path
 
+def convert_to_jsonl(docx_path: str, out_path: Optional[str] = None, compress: bool = False):
+    """串流輸出 JSONL：parser 每解析完一題就寫入一行"""
+    out_path = out_path or jsonl_path_for(docx_path, compress)
+    count = write_jsonl(iter_english(iter_docx_paragraphs(docx_path), docx_path), out_path, compress or None)
+    return out_path, count
+
 if __name__ == "__main__":
     import argparse
     ap = argparse.ArgumentParser(description="Convert English exam .docx (teacher ver.) to JSON (單選題 only)")
     ap.add_argument("docx", help="input .docx")
-    ap.add_argument("json", nargs="?", help="output .json (optional)")
+    ap.add_argument("json", nargs="?", help="output .json / .jsonl (optional)")
+    ap.add_argument("--jsonl", action="store_true", help="每行一題輸出 JSONL（串流寫入）")
+    ap.add_argument("--gzip", action="store_true", help="JSONL 以 gzip 壓縮")
     args = ap.parse_args()
-    outp = convert_to_json(args.docx, args.json)
-    print(f"✅ {args.docx} → {outp}")
+    if args.jsonl or args.gzip:
+        outp, count = convert_to_jsonl(args.docx, args.json, args.gzip)
+        print(f"✅ {args.docx} → {outp}（{count} 題）")
+    else:
+        outp = convert_to_json(args.docx, args.json)
+        print(f"✅ {args.docx} → {outp}")
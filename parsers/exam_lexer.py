@@ -0,0 +1,310 @@
+"""exam_lexer.py
+考卷逐行分類器：每一行只比對一次，轉成帶型別的 Token，供各科 parser 共用。
+
+原本各科 parser 對同一行會反覆執行多組 regex（判斷題號、找選項、往後看幾行時再判斷一次），
+這裡在讀入時就把每一行拆好：題號前的答案、題號與其後的符號、行內所有選項標記的位置，
+之後 parser 只讀取 Token 欄位，往後看的迴圈不再重新比對。
+
+Token 種類：
+    section_header     區塊標題           一、單選題 / **二、文法：每題2分** / A部分實力養成題
+    answer_question    括號答案開頭的題目  ( Ｂ )1. 題目 / (　B　)(１) 題組小題 / ( ) (1) 閱讀題
+    numbered_question  題號開頭的題目      1. 題目
+    options            一行內有多個選項    (A) 甲 (B) 乙
+    option             單獨一個選項        (A) 甲
+    group_intro        題組說明           ◎ / ⊙ 開頭
+    answer_line        答案行             答案：… / 答：…
+    image_ref          圖片               ![](media/image1.png) / <img …>
+    table / formula    表格 / 公式         只來自結構化區塊檔（blocks.Block），不由行首符號判斷
+    text / blank       其他文字 / 空行
+
+串流解析時改用 TokenStream：依需要才讀取並 lex 下一行，parser 處理完一題後 release 已讀過的行，
+記憶體只與往後看的行數有關，不隨文件大小增加。
+TokenStream 也接受 PDF 轉換輸出的區塊（blocks.Block）：表格、公式、圖片區塊帶有 token_kind，
+直接成為對應種類的 Token，不再逐行分類；標題與內文區塊仍以 lex_line 分類。
+
+各科判斷規則不完全相同（答案字母範圍、題號後的符號），因此 Token 同時保留拆好的欄位，
+parser 依自己的規則檢查欄位即可，不需要再對整行做 regex。
+
+每行在 lex 時先以 normalize.fold_width 轉成半形一次，下列 regex 都只寫 ASCII、在半形版本上比對，
+拆出的欄位再依相同位置從原文切出，所以欄位內容仍保留原本的全形字元。
+"""
+
+import re
+from bisect import bisect_left
+from collections import deque
+from functools import lru_cache
+from dataclasses import dataclass
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from .normalize import FOLD_TABLE, fold_width
+
+SECTION_HEADER = "section_header"
+ANSWER_QUESTION = "answer_question"
+NUMBERED_QUESTION = "numbered_question"
+OPTIONS = "options"
+OPTION = "option"
+GROUP_INTRO = "group_intro"
+ANSWER_LINE = "answer_line"
+IMAGE_REF = "image_ref"
+TABLE = "table"
+FORMULA = "formula"
+TEXT = "text"
+BLANK = "blank"
+
+OPTION_LETTERS = "ＡＢＣＤABCD"
+GROUP_MARKS = "◎⊙○●"
+ANSWER_PREFIXES = ("答案：", "答：")
+IMAGE_PREFIXES = ("![", "<img")
+
+# 題號前的括號答案：( Ｂ ) / (　) ，字母可省略
+# 字母與其後空白包成同一個可省略群組，括號內只有空白時不會在兩段 \s* 之間來回回溯
+LEAD_RE = re.compile(r"\(\s*(?:([A-F])\s*)?\)\s*")
+# 題號：1 或 (1) / （１）；1 之後的符號 \. . ． 、 一併取出（可省略）
+NUMBER_RE = re.compile(r"(\d+)(\\\.|[.．、]?)|\((\d+)\)")
+# 選項標記：(A) / （Ｂ） / ( C )，括號內有空白的只用來判斷是否像選擇題
+MARKER_RE = re.compile(r"\(\s*([A-F])\s*\)")
+# 區塊標題：允許 Markdown 標題與粗體前綴（同樣避免相鄰的 \s*）
+HEADER_RE = re.compile(r"#*\s*(?:(\*\*)\s*)?(?:([一二三四五六七八九十]+)、|[AB]部分)")
+
+Marker = Tuple[int, int, str]
+
+
+class OptionItem(NamedTuple):
+    letter: str    # 已轉為半形
+    content: str   # 已去除前後空白
+    start: int     # 選項標記在該行的位置
+
+
+@dataclass
+class Token:
+    kind: str
+    index: int
+    raw: str                          # 去除行尾空白的原始行
+    text: str                         # 去除前後空白的行
+    folded: str = ""                  # text 的半形版本，位置與 text 相同
+    letter: Optional[str] = None      # 題號前括號內的答案字母（原樣），空括號為 ""，沒有括號為 None
+    lead_end: int = 0                 # 括號答案（含其後空白）結束的位置
+    number: Optional[str] = None      # 題號
+    sub_number: Optional[str] = None  # (1) 形式的小題號
+    after_number: str = ""            # 題號之後的文字（含符號）
+    separator: str = ""               # 題號後的符號：. ． 、 \.
+    tail: str = ""                    # 符號之後的文字（未去空白）
+    markers: Tuple[Marker, ...] = ()  # 行內選項標記 (開始, 結束, 字母)
+    numeral: Optional[str] = None     # 區塊標題的中文數字
+    bold: bool = False                # 區塊標題是否為粗體
+
+    @property
+    def answer(self) -> Optional[str]:
+        """題號前的答案（半形），沒有答案時為 None"""
+        return self.letter.translate(FOLD_TABLE) if self.letter else None
+
+    @property
+    def rest(self) -> str:
+        """題號與符號之後的題目文字"""
+        return self.tail.lstrip()
+
+    @property
+    def indented(self) -> bool:
+        return self.raw != self.text
+
+    def has_marker(self, letters: str = OPTION_LETTERS) -> bool:
+        """是否含有 (A) 形式（括號內無空白）的選項標記"""
+        return any(end - start == 3 and letter in letters for start, end, letter in self.markers)
+
+    def has_spaced_marker(self, letters: str = OPTION_LETTERS) -> bool:
+        """是否含有 (A) 或 ( A ) 形式的標記"""
+        return any(letter in letters for _, _, letter in self.markers)
+
+
+def scan_markers(text: str, folded: Optional[str] = None) -> Tuple[Marker, ...]:
+    """找出一行中所有選項標記的位置，字母取自原文；已轉好半形版本時可由 folded 傳入"""
+    if folded is None:
+        folded = fold_width(text)
+    if "(" not in folded:
+        return ()
+    if folded is text:  # 沒有要轉換的字元時 fold_width 回傳原字串
+        return tuple([(m.start(), m.end(), m.group(1)) for m in MARKER_RE.finditer(text)])
+    return tuple([(m.start(), m.end(), text[m.start(1)]) for m in MARKER_RE.finditer(folded)])
+
+
+@lru_cache(maxsize=None)
+def _stops_re(stops: str) -> "re.Pattern":
+    return re.compile(f"[{re.escape(stops)}]")
+
+
+def option_items(text: str, markers: Iterable[Marker], letters: str = OPTION_LETTERS,
+                 stops: str = "（()", terminated: bool = False, nonempty: Optional[bool] = None) -> List[OptionItem]:
+    """依標記位置切出選項內容
+
+    選項內容到下一個 stops 字元為止。terminated 為 False 時內容至少要有一個字元，
+    相當於 `[（(]X[）)]\\s*([^stops]+)`；為 True 時內容必須接著下一個選項標記或行尾，
+    相當於 `[（(]X[）)]\\s*([^stops]*?)(?=[（(]X[）)]|$)`。nonempty 可另外指定內容是否至少要有一個字元
+    （預設為 not terminated），terminated 且 nonempty 即 `[^stops]+?`。
+
+    stops 的位置整行只掃描一次，每個標記以二分搜尋找下一個 stop，
+    不論行多長、標記多少都是線性時間，不會像 lazy 量詞加 lookahead 的 regex 一樣回溯。
+    """
+    compact = [(start, end, letter) for start, end, letter in markers if end - start == 3 and letter in letters]
+    if not compact:
+        return []
+    if nonempty is None:
+        nonempty = not terminated
+    stop_positions = [m.start() for m in _stops_re(stops).finditer(text)]
+    starts = {start for start, _, _ in compact}
+    items = []
+    for start, end, letter in compact:
+        i = bisect_left(stop_positions, end)
+        stop = stop_positions[i] if i < len(stop_positions) else len(text)
+        if terminated and stop < len(text) and stop not in starts:
+            continue
+        if nonempty and stop == end:
+            continue
+        items.append(OptionItem(letter.translate(FOLD_TABLE), text[end:stop].strip(), start))
+    return items
+
+
+def join_tokens(tokens: Iterable["Token"], sep: str = " ") -> Tuple[str, Tuple[Marker, ...]]:
+    """把多行接成一行，回傳 (文字, 位移後的選項標記)"""
+    parts, markers, offset = [], [], 0
+    for token in tokens:
+        if parts:
+            offset += len(sep)
+        parts.append(token.text)
+        markers.extend((start + offset, end + offset, letter) for start, end, letter in token.markers)
+        offset += len(token.text)
+    return sep.join(parts), tuple(markers)
+
+
+def _split_number(token: Token, pos: int) -> None:
+    text = token.text
+    m = NUMBER_RE.match(token.folded, pos)
+    if not m:
+        return
+    if m.group(1) is not None:
+        token.number = text[m.start(1):m.end(1)]
+        token.after_number = text[m.end(1):]
+        token.separator = m.group(2)
+        token.tail = text[m.end():]
+    else:
+        token.sub_number = text[m.start(3):m.end(3)]
+        token.after_number = token.tail = text[m.end():]
+
+
+def lex_line(line: str, index: int = 0) -> Token:
+    """把一行分類成 Token"""
+    raw = line.rstrip()
+    text = raw.strip()
+    folded = fold_width(text)
+    token = Token(BLANK, index, raw, text, folded)
+    if not text:
+        return token
+
+    if "(" in folded:
+        token.markers = scan_markers(text, folded)
+    first = folded[0]
+    if first == "(":
+        lead = LEAD_RE.match(folded)
+        if lead:
+            token.letter = text[lead.start(1):lead.end(1)] if lead.group(1) else ""
+            token.lead_end = lead.end()
+            _split_number(token, lead.end())
+    elif first.isdecimal():
+        _split_number(token, 0)
+    elif first in "#*一二三四五六七八九十AB":
+        header = HEADER_RE.match(folded)
+        if header:
+            token.kind = SECTION_HEADER
+            token.bold = header.group(1) is not None
+            token.numeral = header.group(2)
+            return token
+
+    if token.letter is not None and (token.sub_number is not None or token.separator):
+        token.kind = ANSWER_QUESTION
+    elif token.letter is None and token.number is not None and token.separator:
+        token.kind = NUMBERED_QUESTION
+    elif first in GROUP_MARKS:
+        token.kind = GROUP_INTRO
+    elif text.startswith(ANSWER_PREFIXES):
+        token.kind = ANSWER_LINE
+    elif text.startswith(IMAGE_PREFIXES):
+        token.kind = IMAGE_REF
+    elif sum(end - start == 3 for start, end, _ in token.markers) >= 2:
+        token.kind = OPTIONS
+    elif token.markers and token.markers[0][0] == 0 and token.markers[0][1] == 3:
+        token.kind = OPTION
+    else:
+        token.kind = TEXT
+    return token
+
+
+def paragraph_text(paragraph) -> str:
+    """docx 段落或字串的文字"""
+    return paragraph.text if hasattr(paragraph, "text") else str(paragraph)
+
+
+def lex_paragraph(paragraph, index: int = 0) -> Token:
+    """段落轉成 Token；已知型別的區塊（有 token_kind）只取文字，表格另外找出儲存格內的選項標記"""
+    if isinstance(paragraph, str):
+        return lex_line(paragraph, index)
+    kind = getattr(paragraph, "token_kind", None)
+    if kind is None:
+        return lex_line(paragraph_text(paragraph), index)
+    raw = paragraph.text.rstrip()
+    text = raw.strip()
+    token = Token(kind if text else BLANK, index, raw, text, fold_width(text))
+    if kind == TABLE:
+        token.markers = scan_markers(text, token.folded)
+    return token
+
+
+def tokenize(paragraphs: Iterable) -> List[Token]:
+    """把整份文件的段落（docx 段落、字串或區塊）轉成 Token 列表"""
+    return [lex_line(p, i) if type(p) is str else lex_paragraph(p, i) for i, p in enumerate(paragraphs)]
+
+
+class TokenStream:
+    """依需要逐行 lex 的 Token 序列，可傳入檔案物件等任何行的 iterator
+
+    以絕對行號存取，只保留 release 之後的 Token。
+    """
+
+    def __init__(self, paragraphs: Iterable):
+        self._source = iter(paragraphs)
+        self._tokens: deque = deque()
+        self._base = 0          # _tokens[0] 的行號
+        self._exhausted = False
+
+    def _fill(self, index: int) -> bool:
+        while self._base + len(self._tokens) <= index:
+            if self._exhausted:
+                return False
+            try:
+                paragraph = next(self._source)
+            except StopIteration:
+                self._exhausted = True
+                return False
+            line = self._base + len(self._tokens)
+            self._tokens.append(lex_line(paragraph, line) if type(paragraph) is str else lex_paragraph(paragraph, line))
+        return True
+
+    def has(self, index: int) -> bool:
+        """是否有第 index 行（必要時往後讀取）"""
+        return self._fill(index)
+
+    def __getitem__(self, index: int) -> Token:
+        if index < self._base:
+            raise IndexError(f"第 {index} 行已釋放")
+        if not self._fill(index):
+            raise IndexError(index)
+        return self._tokens[index - self._base]
+
+    def release(self, index: int) -> None:
+        """釋放第 index 行之前的 Token"""
+        while self._tokens and self._base < index:
+            self._tokens.popleft()
+            self._base += 1
+
+    @property
+    def buffered(self) -> int:
+        """目前保留的 Token 數"""
+        return len(self._tokens)
@@ -0,0 +1,117 @@
+"""golden.py
+parser 的黃金測試資料：每份考卷（.md / .docx）旁放一個同名的 .expected.json，
+記錄人工確認過的正確題目（題目、選項、答案、是否有圖）。
+
+考卷放在 tests/fixtures/parsers/<學期>/<年級>/<出版社>/<科目>/ 之下，與 input_md 相同的目錄結構，
+parser 依科目資料夾決定（corpus.parser_for），輸出的年級、科目等欄位也由路徑決定。
+內容皆為自行編寫的匿名題目。
+
+比對時以題目文字對應正確題目：
+* found：正確題目的題目文字出現在 parser 輸出中（沒找到即為漏題）
+* exact：題目、選項、答案、是否有圖都與正確題目相同
+圖片路徑的命名由 utils.image_naming 決定，這裡只比對有沒有圖。
+
+    for path in find_fixtures():
+        score = score_questions(load_expected(path), parse_fixture(path))
+        print(path, score.recall, score.accuracy)
+"""
+
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from .corpus import find_corpus_files, parser_for, parser_function
+
+FIXTURE_ROOT = Path(__file__).parent.parent / "tests" / "fixtures" / "parsers"
+EXPECTED_SUFFIX = ".expected.json"
+
+
+def find_fixtures(root: Union[str, Path] = FIXTURE_ROOT) -> List[Path]:
+    """有 .expected.json 的考卷"""
+    return [path for path in find_corpus_files(Path(root)) if expected_path(path).exists()]
+
+
+def expected_path(path: Union[str, Path]) -> Path:
+    return Path(path).with_suffix(EXPECTED_SUFFIX)
+
+
+def load_expected(path: Union[str, Path]) -> List[Dict[str, Any]]:
+    with open(expected_path(path), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_fixture(path: Union[str, Path]) -> List[str]:
+    """考卷的所有行（docx 為段落文字）"""
+    path = Path(path)
+    if path.suffix.lower() == ".docx":
+        from .docx_reader import read_docx_paragraphs
+
+        return read_docx_paragraphs(path)
+    with open(path, "r", encoding="utf-8") as f:
+        return f.readlines()
+
+
+def parse_fixture(path: Union[str, Path], lines: Optional[Iterable[str]] = None) -> List[Mapping]:
+    """以該科目的 parser 解析考卷；lines 可傳入已讀取（或重複多次）的行"""
+    if lines is None:
+        lines = read_fixture(path)
+    return list(parser_function(parser_for(str(path)))(lines, str(path)))
+
+
+def golden_item(question: Mapping) -> Dict[str, Any]:
+    """parser 輸出中與正確題目比對的欄位"""
+    return {
+        "question": question["question"],
+        "options": dict(question["options"] or {}),
+        "answer": question["answer"] or "",
+        "image": bool(question.get("image_path")),
+    }
+
+
+@dataclass
+class GoldenScore:
+    expected: int
+    parsed: int
+    lost: List[int] = field(default_factory=list)    # 沒找到的正確題目（索引）
+    wrong: List[int] = field(default_factory=list)   # 找到但欄位不同的正確題目（索引）
+
+    @property
+    def found(self) -> int:
+        return self.expected - len(self.lost)
+
+    @property
+    def exact(self) -> int:
+        return self.found - len(self.wrong)
+
+    @property
+    def recall(self) -> float:
+        return self.found / self.expected if self.expected else 1.0
+
+    @property
+    def accuracy(self) -> float:
+        return self.exact / self.expected if self.expected else 1.0
+
+    @property
+    def precision(self) -> float:
+        return self.exact / self.parsed if self.parsed else 1.0
+
+
+def score_questions(expected: List[Dict[str, Any]], parsed: Iterable[Mapping]) -> GoldenScore:
+    """依題目文字逐題對應正確題目，同樣文字的題目依出現順序對應"""
+    remaining: Dict[str, List[Dict[str, Any]]] = {}
+    parsed_count = 0
+    for question in parsed:
+        item = golden_item(question)
+        remaining.setdefault(item["question"], []).append(item)
+        parsed_count += 1
+
+    score = GoldenScore(len(expected), parsed_count)
+    for index, item in enumerate(expected):
+        candidates = remaining.get(item["question"])
+        if not candidates:
+            score.lost.append(index)
+        elif candidates.pop(0) != item:
+            score.wrong.append(index)
+    return score
@@ -0,0 +1,64 @@
+"""jsonl_io.py
+題目的 JSONL 輸出入：每行一題、不縮排的 JSON，可選擇 gzip 壓縮。
+
+寫入端直接接 parser 的串流（iter_english / iter_social ...），每 yield 一題就寫一行，
+不需要先把整份考卷的題目收集成 list；讀取端逐行 yield，題庫載入時不必一次讀入整個檔案。
+副檔名為 .gz 時自動以 gzip 讀寫。
+"""
+
+import gzip
+import json
+from collections.abc import Mapping
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, Optional, Union
+
+PathLike = Union[str, Path]
+
+
+def is_gzip_path(path: PathLike) -> bool:
+    return Path(path).suffix.lower() == ".gz"
+
+
+def jsonl_path_for(source_path: PathLike, compress: bool = False) -> str:
+    """依來源檔名決定預設的輸出路徑：exam.docx -> exam.jsonl / exam.jsonl.gz"""
+    path = Path(source_path).with_suffix(".jsonl")
+    return str(path.with_name(path.name + ".gz")) if compress else str(path)
+
+
+def open_jsonl(path: PathLike, mode: str = "r", compress: Optional[bool] = None) -> IO[str]:
+    """以文字模式開啟 JSONL 檔案，compress 為 None 時依副檔名判斷是否 gzip"""
+    if compress is None:
+        compress = is_gzip_path(path)
+    if compress:
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def question_line(question: Mapping) -> str:
+    """一題轉成一行緊湊的 JSON"""
+    data = question.to_dict() if hasattr(question, "to_dict") else dict(question)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def write_jsonl(questions: Iterable[Mapping], out_path: PathLike, compress: Optional[bool] = None) -> int:
+    """逐題寫入 JSONL，回傳寫入的題數"""
+    count = 0
+    with open_jsonl(out_path, "w", compress) as f:
+        for question in questions:
+            f.write(question_line(question))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def iter_jsonl(path: PathLike, compress: Optional[bool] = None) -> Iterator[Dict[str, Any]]:
+    """逐行讀取 JSONL，略過空行"""
+    with open_jsonl(path, "r", compress) as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path} 第 {line_no} 行不是有效的 JSON: {e}") from e
@@ -0,0 +1,258 @@
+"""math_conversion.py
+把考卷文字中的數學符號轉成 LaTeX，供 math_parser.format_math_for_web 使用。
+
+MATH_CONVERSIONS 是依序套用的轉換規則（與原本 convert_math_expressions 內的字典相同）。
+載入模組時把規則整理成幾個階段：
+    - 連續的單一字元規則合併成一張 str.translate 對照表，一次掃過整段文字
+    - 結構性規則（絕對值、分數、指數、根號）預先編譯，文字中沒有觸發字元時直接略過
+階段的先後與原本逐條 re.sub 的順序相同，因此輸出完全一致；convert_sequential 保留原本的做法供對照。
+
+MathText 是 format_math_for_web 的結果，LaTeX 文字、數學式清單等欄位在第一次讀取時才計算，
+只需要顯示文字的呼叫端不會執行數學式擷取。
+"""
+
+import re
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Pattern, Tuple, Union
+
+# 依序套用的轉換規則 (pattern, replacement)
+MATH_CONVERSIONS: List[Tuple[str, str]] = [
+    # 絕對值符號
+    (r'∣([^∣]+)∣', r'|\1|'),
+    (r'｜([^｜]+)｜', r'|\1|'),
+    (r'\\\|\s*([^|]+)\s*\\\|', r'|\1|'),
+
+    # 數學運算符號
+    (r'＋', '+'),
+    (r'－', '-'),
+    (r'＜', '<'),
+    (r'＞', '>'),
+    (r'＝', '='),
+    (r'×', r'\\times'),
+    (r'÷', r'\\div'),
+    (r'±', r'\\pm'),
+    (r'∓', r'\\mp'),
+
+    # 分數符號
+    (r'(\d+)/(\d+)', r'\\frac{\1}{\2}'),
+
+    # 指數符號
+    (r'(\w+)\^(\w+)', r'\1^{\2}'),
+    (r'(\w+)²', r'\1^2'),
+    (r'(\w+)³', r'\1^3'),
+
+    # 根號
+    (r'√(\w+)', r'\\sqrt{\1}'),
+    (r'∛(\w+)', r'\\sqrt[3]{\1}'),
+
+    # 希臘字母
+    (r'α', r'\\alpha'),
+    (r'β', r'\\beta'),
+    (r'γ', r'\\gamma'),
+    (r'δ', r'\\delta'),
+    (r'θ', r'\\theta'),
+    (r'λ', r'\\lambda'),
+    (r'μ', r'\\mu'),
+    (r'π', r'\\pi'),
+    (r'σ', r'\\sigma'),
+    (r'φ', r'\\phi'),
+    (r'ω', r'\\omega'),
+
+    # 特殊符號
+    (r'∞', r'\\infty'),
+    (r'∑', r'\\sum'),
+    (r'∏', r'\\prod'),
+    (r'∫', r'\\int'),
+    (r'∂', r'\\partial'),
+    (r'∇', r'\\nabla'),
+    (r'∆', r'\\Delta'),
+
+    # 集合符號
+    (r'∈', r'\\in'),
+    (r'∉', r'\\notin'),
+    (r'⊂', r'\\subset'),
+    (r'⊃', r'\\supset'),
+    (r'∩', r'\\cap'),
+    (r'∪', r'\\cup'),
+    (r'∅', r'\\emptyset'),
+
+    # 邏輯符號
+    (r'∧', r'\\land'),
+    (r'∨', r'\\lor'),
+    (r'¬', r'\\lnot'),
+    (r'→', r'\\rightarrow'),
+    (r'↔', r'\\leftrightarrow'),
+    (r'∀', r'\\forall'),
+    (r'∃', r'\\exists'),
+
+    # 幾何符號
+    (r'∠', r'\\angle'),
+    (r'△', r'\\triangle'),
+    (r'□', r'\\square'),
+    (r'○', r'\\circ'),
+    (r'⊥', r'\\perp'),
+    (r'∥', r'\\parallel'),
+    (r'≅', r'\\cong'),
+    (r'∼', r'\\sim'),
+
+    # 不等式符號
+    (r'≤', r'\\leq'),
+    (r'≥', r'\\geq'),
+    (r'≠', r'\\neq'),
+    (r'≈', r'\\approx'),
+    (r'≡', r'\\equiv'),
+
+    # 省略號
+    (r'…', r'\\ldots'),
+    (r'⋯', r'\\cdots'),
+
+    # 溫度符號
+    (r'℃', r'^{\\circ}\\text{C}'),
+    (r'℉', r'^{\\circ}\\text{F}'),
+]
+
+# 結構性規則要能比對成功，文字中必須出現的字元
+STRUCTURAL_TRIGGERS: Dict[str, str] = {
+    r'∣([^∣]+)∣': '∣',
+    r'｜([^｜]+)｜': '｜',
+    r'\\\|\s*([^|]+)\s*\\\|': '\\|',
+    r'(\d+)/(\d+)': '/',
+    r'(\w+)\^(\w+)': '^',
+    r'(\w+)²': '²',
+    r'(\w+)³': '³',
+    r'√(\w+)': '√',
+    r'∛(\w+)': '∛',
+}
+
+ITALIC_VAR_RE = re.compile(r'\*([a-zA-Z])\*')
+# 先抓 $$...$$ 區塊，再抓 $...$ 行內數學式
+LATEX_EXPRESSION_RES = (re.compile(r'\$\$(.+?)\$\$', re.DOTALL), re.compile(r'\$(.+?)\$', re.DOTALL))
+RELATION_SPACING_RE = re.compile(r'\s*([<>=])\s*')
+
+Stage = Union[Dict[int, str], Tuple[Pattern, str, str]]
+
+
+def build_stages(rules: List[Tuple[str, str]]) -> List[Stage]:
+    """把規則整理成依序執行的階段：translate 對照表或 (已編譯 pattern, replacement, 觸發字元)"""
+    stages: List[Stage] = []
+    table: Dict[str, str] = {}
+    for pattern, replacement in rules:
+        if len(pattern) == 1:
+            # 以 re.sub 展開 replacement 中的跳脫（\\times -> \times）
+            table[pattern] = re.sub(pattern, replacement, pattern)
+            continue
+        if table:
+            stages.append(str.maketrans(table))
+            table = {}
+        stages.append((re.compile(pattern), replacement, STRUCTURAL_TRIGGERS[pattern]))
+    if table:
+        stages.append(str.maketrans(table))
+    return stages
+
+
+STAGES = build_stages(MATH_CONVERSIONS)
+
+
+def _finish(text: str) -> str:
+    # 處理斜體變數 (*a* -> $a$)
+    if '*' in text:
+        text = ITALIC_VAR_RE.sub(r'$\1$', text)
+
+    # 處理數學表達式中的空格
+    if '<' in text or '>' in text or '=' in text:
+        text = RELATION_SPACING_RE.sub(r' \1 ', text)
+    return text
+
+
+def convert_math_expressions(text: str) -> str:
+    """將數學表達式轉換為 LaTeX 格式"""
+    if not text:
+        return text
+
+    for stage in STAGES:
+        if isinstance(stage, dict):
+            text = text.translate(stage)
+        else:
+            regex, replacement, trigger = stage
+            if trigger in text:
+                text = regex.sub(replacement, text)
+    return _finish(text)
+
+
+def convert_sequential(text: str) -> str:
+    """逐條以 re.sub 套用規則（原本的做法），供測試與 benchmark 對照"""
+    if not text:
+        return text
+
+    for pattern, replacement in MATH_CONVERSIONS:
+        text = re.sub(pattern, replacement, text)
+    text = re.sub(r'\*([a-zA-Z])\*', r'$\1$', text)
+    text = re.sub(r'\s*([<>=])\s*', r' \1 ', text)
+    return text
+
+
+def extract_latex_expressions(text: str) -> List[str]:
+    """依序擷取 $$...$$ 與 $...$ 中的數學式"""
+    expressions = []
+    if '$' not in text:
+        return expressions
+    for regex in LATEX_EXPRESSION_RES:
+        expressions.extend(match.group(1).strip() for match in regex.finditer(text))
+    return expressions
+
+
+class MathText(Mapping):
+    """格式化後的數學文字，欄位與原本 format_math_for_web 回傳的 dict 相同，第一次讀取時才計算並快取
+
+    不是 dict，無法直接 json.dumps；math_parser.iter_math_md / parse_math_md 對外輸出前會以 dict() 轉換。
+    """
+
+    KEYS = ('original_text', 'latex_text', 'math_expressions', 'needs_mathjax', 'display_text')
+    __slots__ = ('original_text', '_latex_text', '_math_expressions')
+
+    def __init__(self, text: str):
+        self.original_text = text
+        self._latex_text: Optional[str] = None
+        self._math_expressions: Optional[List[str]] = None
+
+    @property
+    def latex_text(self) -> str:
+        if self._latex_text is None:
+            self._latex_text = convert_math_expressions(self.original_text)
+        return self._latex_text
+
+    @property
+    def display_text(self) -> str:
+        """前端顯示用的文本"""
+        return self.latex_text
+
+    @property
+    def math_expressions(self) -> List[str]:
+        if self._math_expressions is None:
+            self._math_expressions = extract_latex_expressions(self.original_text)
+        return self._math_expressions
+
+    @property
+    def needs_mathjax(self) -> bool:
+        # 轉換不會移除 $，原文有數學式時 LaTeX 文字一定含有 $，先檢查便宜的條件
+        latex_text = self.latex_text
+        return '\\' in latex_text or '$' in latex_text or bool(self.math_expressions)
+
+    def __getitem__(self, key: str):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.KEYS)
+
+    def __len__(self) -> int:
+        return len(self.KEYS)
+
+    def __repr__(self) -> str:
+        return f"MathText({self.original_text!r})"
+
+
+def format_math_for_web(text: str) -> MathText:
+    """格式化數學表達式以供網頁顯示"""
+    return MathText(text)
@@ -7,12 +7,19 @@ from __future__ import annotations
 """
 
 import re
-from typing import List, Dict, Any, Optional, Tuple
-import hashlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from collections.abc import Mapping
 import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 from utils.image_naming import generate_image_path_for_parser
+from .base_parser import question_dicts
+from .blocks import find_blocks, iter_block_paragraphs
+from .exam_lexer import ANSWER_LINE, FORMULA, SECTION_HEADER, TABLE, OptionItem, Token, TokenStream, lex_line, option_items, scan_markers
+from .normalize import FoldedText, fold_width
+from .profiling import profiled
+from .math_conversion import MathText, convert_math_expressions, extract_latex_expressions, format_math_for_web
+from .question_index import question_hash
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Regex patterns
@@ -21,10 +28,9 @@ from utils.image_naming import generate_image_path_for_parser
 INLINE_MATH_RE = re.compile(r"\\$(.+?)\\$")
 BLOCK_MATH_RE = re.compile(r"\\$\\$(.+?)\\$\\$", re.DOTALL)
 
-# 改進的答案識別模式
-ANSWER_PREFIX_RE = re.compile(r"^[（(]\s*([Ａ-ＤABCD])\s*[）)]\s*(\d+\.?)?")
-OPTION_RE = re.compile(r"[（(]([Ａ-ＤABCD])[）)]\s*([^（()]+?)(?=[（(][Ａ-ＤABCD][）)]|$)")
-FW_MAP = str.maketrans("ＡＢＣＤ", "ABCD")
+# 改進的答案識別模式（在 fold_width 轉成半形的文字上比對）
+ANSWER_PREFIX_RE = re.compile(r"^\(\s*([A-D])\s*\)\s*(\d+\.?)?")
+PARSER_VERSION = "1"
 IMAGE_KEYWORDS = ("圖", "附圖", "如圖")
 IMAGE_PATH_RE = re.compile(r"!\[(.*?)\]\((.*?)\)")
 
@@ -36,6 +42,7 @@ SECTION_HEADER_RE = re.compile(r"^[一二三四五六七八九十]+、")
 __all__ = [
     "extract_math_expressions",
     "parse_math_markdown",
+    "iter_math_markdown",
 ]
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -69,28 +76,36 @@ def _clean_image_paths(text: str, img_idx: int) -> tuple[str, Optional[str]]:
     text = IMAGE_PATH_RE.sub("", text)
     return text.strip(), img_name
 
-def _is_multiple_choice_question(text: str) -> bool:
+def _text_options(text: str, folded: Optional[str] = None) -> List[OptionItem]:
+    """(A) 之後到下一個括號前至少一個字元，且必須接著下一個選項標記或結尾：
+    `[（(]([Ａ-ＤABCD])[）)]\\s*([^（()]+?)(?=[（(][Ａ-ＤABCD][）)]|$)`，以線性掃描取代 regex 回溯
+
+    以下幾個函式的 folded 為 text 的半形版本（例如 Token.folded），有傳入時不再重新轉換。"""
+    return option_items(text, scan_markers(text, folded), "ＡＢＣＤABCD", stops="（()", terminated=True, nonempty=True)
+
+def _is_multiple_choice_question(text: str, folded: Optional[str] = None) -> bool:
     """判斷是否為選擇題"""
+    if folded is None:
+        folded = fold_width(text)
     # 檢查是否有答案前綴 (A) (B) 等
-    if ANSWER_PREFIX_RE.match(text):
+    if ANSWER_PREFIX_RE.match(folded):
         return True
     # 檢查是否包含選項
-    options = OPTION_RE.findall(text)
-    return len(options) >= 2
+    return len(_text_options(text, folded)) >= 2
 
-def _extract_answer_from_prefix(text: str) -> Optional[str]:
+def _extract_answer_from_prefix(text: str, folded: Optional[str] = None) -> Optional[str]:
     """從題目前綴提取答案"""
-    match = ANSWER_PREFIX_RE.match(text)
+    match = ANSWER_PREFIX_RE.match(fold_width(text) if folded is None else folded)
     if match:
-        return match.group(1).translate(FW_MAP)
+        return match.group(1)
     return None
 
-def _extract_options_from_text(text: str) -> Dict[str, str]:
+def _extract_options_from_text(text: str, folded: Optional[str] = None) -> Dict[str, str]:
     """從文本中提取選項"""
     options = {}
-    for match in OPTION_RE.finditer(text):
-        letter = match.group(1).translate(FW_MAP)
-        content = match.group(2).strip()
+    for item in _text_options(text, folded):
+        letter = item.letter
+        content = item.content
         # 過濾掉空選項、只有符號的選項或過短的選項
         if content and content != "![]" and len(content) > 1 and not content.isspace():
             # 移除多餘的符號和空白
@@ -101,10 +116,10 @@ def _extract_options_from_text(text: str) -> Dict[str, str]:
                 options[letter] = content
     return options
 
-def _clean_question_text(text: str, options: Dict[str, str]) -> str:
+def _clean_question_text(text: str, options: Dict[str, str], folded: Optional[str] = None) -> str:
     """清理題目文本，移除答案前綴和選項"""
     # 移除答案前綴
-    text = ANSWER_PREFIX_RE.sub("", text)
+    text = FoldedText.of(text, folded).sub(ANSWER_PREFIX_RE, "")
     
     # 移除題號前綴（包括各種格式）
     text = re.sub(r"^\d+\.\s*", "", text)
@@ -158,14 +173,8 @@ def _is_valid_question(text: str, options: Dict[str, str]) -> bool:
     return True
 
 def _get_question_hash(text: str) -> str:
-    """生成題目的唯一哈希值"""
-    # 標準化文本
-    normalized = re.sub(r"[\s\u3000，。；：！？()（）\[\]【】「」『』""'']+", "", text)
-    normalized = re.sub(r"^\d+", "", normalized)
-    normalized = normalized.lower()
-    
-    # 生成 MD5 哈希
-    return hashlib.md5(normalized.encode('utf-8')).hexdigest()
+    """生成題目的唯一哈希值（規則見 question_index.question_hash）"""
+    return question_hash(text)
 
 def load_md_content(md_path: str) -> str:
     """載入 MD 檔案內容"""
@@ -194,16 +203,29 @@ def extract_question_number(text: str) -> Optional[str]:
     
     return None
 
-def extract_options_from_lines(lines: List[str]) -> Optional[Dict[str, str]]:
-    """從多行文字中提取選項"""
+def _is_choice(token: Token) -> bool:
+    """單選題開頭：( A )1."""
+    return bool(token.letter) and token.letter in "ABCD" and token.separator == "."
+
+def _is_numbered(token: Token, separators: Tuple[str, ...] = (".",)) -> bool:
+    """題號開頭且後面接空白：1. 題目"""
+    return token.letter is None and token.separator in separators and token.tail[:1].isspace()
+
+def _is_number_start(token: Token) -> bool:
+    """題號開頭：1. 或 1\\"""
+    return token.letter is None and token.number is not None and token.after_number[:1] in ("\\", ".")
+
+def _section_header(token: Token) -> Optional[str]:
+    return is_section_header(token.text) if token.kind == SECTION_HEADER else None
+
+def _options_from_tokens(tokens: List[Token]) -> Optional[Dict[str, str]]:
     options = {}
     
-    for line in lines:
+    for token in tokens:
         # 匹配選項格式 (A)、(B)、(C)、(D)
-        matches = re.finditer(r'[（(]([A-D])[）)]\s*([^（(]*?)(?=[（(][A-D][）)]|$)', line)
-        for match in matches:
-            option_key = match.group(1)
-            option_text = match.group(2).strip()
+        for item in option_items(token.text, token.markers, "ABCD", stops="（(", terminated=True):
+            option_key = item.letter
+            option_text = item.content
             if option_text:
                 # 清理選項文字
                 option_text = re.sub(r'[\u3000\s]+$', '', option_text)  # 移除末尾空白
@@ -213,6 +235,10 @@ def extract_options_from_lines(lines: List[str]) -> Optional[Dict[str, str]]:
     
     return options if len(options) >= 2 else None
 
+def extract_options_from_lines(lines: List[str]) -> Optional[Dict[str, str]]:
+    """從多行文字中提取選項"""
+    return _options_from_tokens([lex_line(line) for line in lines])
+
 def clean_question_text(text: str) -> str:
     """清理題目文字"""
     # 移除答案前綴 ( A )1.
@@ -277,46 +303,44 @@ def is_section_header(text: str) -> Optional[str]:
             return clean_text
     return None
 
-def parse_multiple_choice_question(lines: List[str], start_idx: int) -> Tuple[Optional[Dict], int]:
+def parse_multiple_choice_question(tokens: TokenStream, start_idx: int) -> Tuple[Optional[Dict], int]:
     """解析單選題"""
-    if start_idx >= len(lines):
+    if not tokens.has(start_idx):
         return None, start_idx
     
-    current_line = lines[start_idx].strip()
+    current = tokens[start_idx]
     
     # 檢查是否為單選題格式
-    if not re.search(r'[（(]\s*[A-D]\s*[）)]\s*\d+\.', current_line):
+    if not _is_choice(current):
         return None, start_idx
     
     # 提取答案和題號
-    answer = extract_answer_from_choice_header(current_line)
-    question_num = extract_question_number(current_line)
+    answer = current.letter
+    question_num = current.number
     
     # 收集題目和選項內容
-    question_lines = [current_line]
+    question_tokens = [current]
     i = start_idx + 1
     
     # 繼續讀取直到下一題或區塊結束
-    while i < len(lines):
-        line = lines[i].strip()
-        if not line:
+    while tokens.has(i):
+        token = tokens[i]
+        if not token.text:
             i += 1
             continue
         
         # 如果遇到下一題的開頭，停止
-        if (re.search(r'[（(]\s*[A-D]\s*[）)]\s*\d+\.', line) or 
-            re.search(r'^\d+\.\s', line) or
-            is_section_header(line)):
+        if _is_choice(token) or _is_numbered(token) or _section_header(token):
             break
         
-        question_lines.append(line)
+        question_tokens.append(token)
         i += 1
     
     # 合併所有行
-    full_text = ' '.join(question_lines)
+    full_text = ' '.join(token.text for token in question_tokens)
     
     # 提取選項
-    options = extract_options_from_lines(question_lines)
+    options = _options_from_tokens(question_tokens)
     
     # 清理題目文字
     question_text = clean_question_text(full_text)
@@ -342,40 +366,38 @@ def parse_multiple_choice_question(lines: List[str], start_idx: int) -> Tuple[Op
     
     return question_dict, i
 
-def parse_fill_blank_question(lines: List[str], start_idx: int) -> Tuple[Optional[Dict], int]:
+def parse_fill_blank_question(tokens: TokenStream, start_idx: int) -> Tuple[Optional[Dict], int]:
     """解析填充題"""
-    if start_idx >= len(lines):
+    if not tokens.has(start_idx):
         return None, start_idx
     
-    current_line = lines[start_idx].strip()
+    current = tokens[start_idx]
     
     # 檢查是否為填充題格式 (數字\. 開頭，非選擇題)
-    if not re.match(r'^\d+\\\.\s', current_line) and not re.match(r'^\d+\.\s', current_line):
+    if not _is_numbered(current, ("\\.", ".")):
         return None, start_idx
     
     # 確保不是選擇題格式
-    if re.search(r'[（(]\s*[A-D]\s*[）)]', current_line):
+    if current.has_spaced_marker("ABCD"):
         return None, start_idx
     
     # 提取題號
-    question_num_match = re.search(r'^(\d+)[\\\.]', current_line)
-    question_num = question_num_match.group(1) if question_num_match else None
+    question_num = current.number
     
     # 收集題目內容
-    question_lines = [current_line]
+    question_lines = [current.text]
     i = start_idx + 1
     
     # 繼續讀取直到下一題
-    while i < len(lines):
-        line = lines[i].strip()
+    while tokens.has(i):
+        token = tokens[i]
+        line = token.text
         if not line:
             i += 1
             continue
         
         # 如果遇到下一題的開頭，停止
-        if (re.match(r'^\d+[\\\.]', line) or 
-            re.search(r'[（(]\s*[A-D]\s*[）)]\s*\d+\.', line) or
-            is_section_header(line)):
+        if _is_number_start(token) or _is_choice(token) or _section_header(token):
             break
         
         question_lines.append(line)
@@ -416,50 +438,48 @@ def parse_fill_blank_question(lines: List[str], start_idx: int) -> Tuple[Optiona
     
     return question_dict, i
 
-def parse_essay_question(lines: List[str], start_idx: int) -> Tuple[Optional[Dict], int]:
+def parse_essay_question(tokens: TokenStream, start_idx: int) -> Tuple[Optional[Dict], int]:
     """解析非選題"""
-    if start_idx >= len(lines):
+    if not tokens.has(start_idx):
         return None, start_idx
     
-    current_line = lines[start_idx].strip()
+    current = tokens[start_idx]
     
     # 檢查是否為非選題格式 (數字\. 開頭，非選擇題)
-    if not re.match(r'^\d+\\\.\s', current_line) and not re.match(r'^\d+\.\s', current_line):
+    if not _is_numbered(current, ("\\.", ".")):
         return None, start_idx
     
     # 確保不是選擇題格式
-    if re.search(r'[（(]\s*[A-D]\s*[）)]', current_line):
+    if current.has_spaced_marker("ABCD"):
         return None, start_idx
     
     # 提取題號
-    question_num_match = re.search(r'^(\d+)[\\\.]', current_line)
-    question_num = question_num_match.group(1) if question_num_match else None
+    question_num = current.number
     
     # 收集題目內容
-    question_lines = [current_line]
+    question_lines = [current.text]
     answer_lines = []
     in_answer_section = False
     
     i = start_idx + 1
     
     # 繼續讀取直到下一題
-    while i < len(lines):
-        line = lines[i].strip()
+    while tokens.has(i):
+        token = tokens[i]
+        line = token.text
         if not line:
             i += 1
             continue
         
         # 檢查是否進入答案區域
-        if line.startswith('答案：') or line.startswith('答：'):
+        if token.kind == ANSWER_LINE:
             in_answer_section = True
             answer_lines.append(line)
             i += 1
             continue
         
         # 如果遇到下一題的開頭，停止
-        if (re.match(r'^\d+[\\\.]', line) or 
-            re.search(r'[（(]\s*[A-D]\s*[）)]\s*\d+\.', line) or
-            is_section_header(line)):
+        if _is_number_start(token) or _is_choice(token) or _section_header(token):
             break
         
         if in_answer_section:
@@ -507,15 +527,31 @@ def parse_essay_question(lines: List[str], start_idx: int) -> Tuple[Optional[Dic
 
 def parse_math_md(md_path: str) -> List[Dict[str, Any]]:
     """解析數學 MD 檔案中的題目"""
-    content = load_md_content(md_path)
-    lines = content.split('\n')
-    
-    questions = []
+    with open(md_path, 'r', encoding='utf-8') as f:
+        return list(iter_math_md(f))
+
+def _plain_question(question: Dict[str, Any]) -> Dict[str, Any]:
+    """延遲計算的 MathText 轉成一般 dict，輸出可直接 json.dumps"""
+    return {key: dict(value) if isinstance(value, MathText) else value for key, value in question.items()}
+
+def iter_math_md(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """串流解析數學題目：lines 可為檔案物件等任何行的 iterator（或 blocks.iter_block_paragraphs 的區塊），每解析完一題就 yield
+
+    題目文字與答案為一般 dict（original_text、latex_text ...），與 format_math_for_web 原本的格式相同。
+    """
+    for question in _iter_math_md(lines):
+        yield _plain_question(question)
+
+def _iter_math_md(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """iter_math_md 的本體：填充題、非選題的文字保留 MathText，只讀顯示文字的呼叫端不必計算其他欄位"""
+    tokens = TokenStream(lines)
     current_section = None
     i = 0
     
-    while i < len(lines):
-        line = lines[i].strip()
+    while tokens.has(i):
+        tokens.release(i)
+        token = tokens[i]
+        line = token.text
         
         # 跳過空行
         if not line:
@@ -523,14 +559,14 @@ def parse_math_md(md_path: str) -> List[Dict[str, Any]]:
             continue
         
         # 檢查區塊標題
-        section_header = is_section_header(line)
+        section_header = _section_header(token)
         if section_header:
             current_section = section_header
             i += 1
             continue
         
-        # 跳過表格和其他格式內容
-        if line.startswith('<') or line.startswith('|') or line.startswith('**'):
+        # 跳過表格和其他格式內容：區塊檔的表格、公式已有型別，Markdown 只能看行首符號
+        if token.kind in (TABLE, FORMULA) or line.startswith('<') or line.startswith('|') or line.startswith('**'):
             i += 1
             continue
         
@@ -539,43 +575,41 @@ def parse_math_md(md_path: str) -> List[Dict[str, Any]]:
         next_i = i
         
         if current_section and '單選題' in current_section:
-            question_dict, next_i = parse_multiple_choice_question(lines, i)
+            question_dict, next_i = parse_multiple_choice_question(tokens, i)
         elif current_section and '填充題' in current_section:
-            question_dict, next_i = parse_fill_blank_question(lines, i)
+            question_dict, next_i = parse_fill_blank_question(tokens, i)
         elif current_section and '非選題' in current_section:
-            question_dict, next_i = parse_essay_question(lines, i)
+            question_dict, next_i = parse_essay_question(tokens, i)
         else:
             # 嘗試自動判斷題型
-            if re.search(r'[（(]\s*[A-D]\s*[）)]\s*\d+\.', line):
-                question_dict, next_i = parse_multiple_choice_question(lines, i)
+            if _is_choice(token):
+                question_dict, next_i = parse_multiple_choice_question(tokens, i)
                 if not current_section:
                     current_section = "單選題"
-            elif re.match(r'^\d+\.\s', line):
+            elif _is_numbered(token):
                 # 先嘗試填充題，再嘗試非選題
-                question_dict, next_i = parse_fill_blank_question(lines, i)
+                question_dict, next_i = parse_fill_blank_question(tokens, i)
                 if not question_dict:
-                    question_dict, next_i = parse_essay_question(lines, i)
+                    question_dict, next_i = parse_essay_question(tokens, i)
         
         if question_dict:
             question_dict["section"] = current_section
-            questions.append(question_dict)
+            yield question_dict
         
         i = max(next_i, i + 1)  # 防止無限循環
-    
-    return questions
 
-def parse_math_markdown(md_path: str) -> List[Dict[str, Any]]:
-    """主要的數學解析函數 - 兼容舊版本調用"""
+def iter_math_markdown(lines: Iterable[str], md_path: str = "") -> Iterator[Mapping]:
+    """串流版的 parse_math_markdown：lines 可為檔案物件等任何行的 iterator，每解析完一題就 yield"""
     try:
         # 嘗試相對導入
-        from .base_parser import standard_question_dict
+        from .base_parser import question_record
     except ImportError:
         # 如果相對導入失敗，嘗試直接導入
         try:
-            from base_parser import standard_question_dict
+            from base_parser import question_record
         except ImportError:
             # 如果都失敗，使用內建的簡單函數
-            def standard_question_dict(question_text, options, answer, file_path="", image_path=None, **kwargs):
+            def question_record(question_text, options, answer, file_path="", image_path=None, **kwargs):
                 return {
                     "question": question_text,
                     "options": options,
@@ -589,59 +623,62 @@ def parse_math_markdown(md_path: str) -> List[Dict[str, Any]]:
                     "answer": answer
                 }
     
+    img_counter = 0  # 全局圖片計數器，按照圖片在文件中出現的順序編號
+    
+    for q in _iter_math_md(lines):
+        # 處理複雜的題目文字格式
+        question_text = q["question_text"]
+        if isinstance(question_text, Mapping):
+            # 如果是複雜的數學格式，優先取 display_text，然後 latex_text，最後 original_text
+            question_text = (question_text.get("display_text") or 
+                           question_text.get("latex_text") or 
+                           question_text.get("original_text", ""))
+
+        # 確保題目文字是字符串
+        question_text = str(question_text)
+
+        # 處理選項
+        options = q.get("options", {})
+        if not options:
+            options = {}
+
+        # 處理答案
+        answer = q.get("answer", "")
+        if isinstance(answer, Mapping):
+            # 如果是複雜的答案格式，優先取 display_text，然後 latex_text，最後 original_text
+            answer = (answer.get("display_text") or 
+                     answer.get("latex_text") or 
+                     answer.get("original_text", ""))
+
+        # 確保答案是字符串
+        answer = str(answer)
+
+        # 處理圖片路徑 - 使用圖片計數器而非題目編號
+        new_image_path = None
+        original_image_path = q.get("image_path")
+        if original_image_path or has_image_reference(question_text):
+            img_counter += 1  # 按照圖片在文件中出現的順序編號
+            new_image_path = generate_image_path_for_parser(md_path, str(img_counter), ".png")
+
+        formatted_q = question_record(
+            question_text=question_text,
+            options=options,
+            answer=answer,
+            file_path=md_path,
+            image_path=new_image_path
+        )
+        yield formatted_q
+
+@profiled("math", lambda md_path: md_path)
+def parse_math_markdown(md_path: str) -> List[Dict[str, Any]]:
+    """主要的數學解析函數 - 兼容舊版本調用，回傳一般 dict；轉換時一併輸出的區塊檔存在時直接讀區塊檔"""
     try:
-        questions = parse_math_md(md_path)
-        
-        # 使用新的 standard_question_dict 格式化輸出
-        formatted_questions = []
-        img_counter = 0  # 全局圖片計數器，按照圖片在文件中出現的順序編號
-        
-        for q in questions:
-            # 處理複雜的題目文字格式
-            question_text = q["question_text"]
-            if isinstance(question_text, dict):
-                # 如果是複雜的數學格式，優先取 display_text，然後 latex_text，最後 original_text
-                question_text = (question_text.get("display_text") or 
-                               question_text.get("latex_text") or 
-                               question_text.get("original_text", ""))
-            
-            # 確保題目文字是字符串
-            question_text = str(question_text)
-            
-            # 處理選項
-            options = q.get("options", {})
-            if not options:
-                options = {}
-            
-            # 處理答案
-            answer = q.get("answer", "")
-            if isinstance(answer, dict):
-                # 如果是複雜的答案格式，優先取 display_text，然後 latex_text，最後 original_text
-                answer = (answer.get("display_text") or 
-                         answer.get("latex_text") or 
-                         answer.get("original_text", ""))
-            
-            # 確保答案是字符串
-            answer = str(answer)
-            
-            # 處理圖片路徑 - 使用圖片計數器而非題目編號
-            new_image_path = None
-            original_image_path = q.get("image_path")
-            if original_image_path or has_image_reference(question_text):
-                img_counter += 1  # 按照圖片在文件中出現的順序編號
-                new_image_path = generate_image_path_for_parser(md_path, str(img_counter), ".png")
-            
-            formatted_q = standard_question_dict(
-                question_text=question_text,
-                options=options,
-                answer=answer,
-                file_path=md_path,
-                image_path=new_image_path
-            )
-            
-            formatted_questions.append(formatted_q)
-        
-        return formatted_questions
+        blocks_path = find_blocks(md_path)
+        if blocks_path is not None:
+            return question_dicts(iter_math_markdown(iter_block_paragraphs(blocks_path), md_path))
+        # 與舊版相同回傳 dict；串流與整批輸出使用 iter_math_markdown 的 QuestionRecord
+        with open(md_path, 'r', encoding='utf-8') as f:
+            return question_dicts(iter_math_markdown(f, md_path))
         
     except Exception as e:
         print(f"解析數學檔案時發生錯誤: {e}")
@@ -652,154 +689,4 @@ def parse_math_markdown(md_path: str) -> List[Dict[str, Any]]:
 # 向後兼容
 def extract_math_expressions(text: str) -> List[str]:
     """提取數學表達式（向後兼容）"""
-    # 簡單的 LaTeX 數學表達式提取
-    latex_patterns = [
-        r'\$\$(.+?)\$\$',  # 塊級數學
-        r'\$(.+?)\$',      # 行內數學
-    ]
-    
-    expressions = []
-    for pattern in latex_patterns:
-        matches = re.finditer(pattern, text, re.DOTALL)
-        for match in matches:
-            expressions.append(match.group(1).strip())
-    
-    return expressions 
-
-def convert_math_expressions(text: str) -> str:
-    """將數學表達式轉換為 LaTeX 格式"""
-    if not text:
-        return text
-    
-    # 保存原始文本
-    original_text = text
-    
-    # 轉換規則字典
-    math_conversions = {
-        # 絕對值符號 - 修正正則表達式
-        r'∣([^∣]+)∣': r'|\1|',
-        r'｜([^｜]+)｜': r'|\1|',
-        r'\\\|\s*([^|]+)\s*\\\|': r'|\1|',
-        
-        # 數學運算符號
-        r'＋': '+',
-        r'－': '-',
-        r'＜': '<',
-        r'＞': '>',
-        r'＝': '=',
-        r'×': r'\\times',
-        r'÷': r'\\div',
-        r'±': r'\\pm',
-        r'∓': r'\\mp',
-        
-        # 分數符號 - 修正正則表達式
-        r'(\d+)/(\d+)': r'\\frac{\1}{\2}',
-        
-        # 指數符號 - 修正正則表達式
-        r'(\w+)\^(\w+)': r'\1^{\2}',
-        r'(\w+)²': r'\1^2',
-        r'(\w+)³': r'\1^3',
-        
-        # 根號 - 修正正則表達式
-        r'√(\w+)': r'\\sqrt{\1}',
-        r'∛(\w+)': r'\\sqrt[3]{\1}',
-        
-        # 希臘字母
-        r'α': r'\\alpha',
-        r'β': r'\\beta',
-        r'γ': r'\\gamma',
-        r'δ': r'\\delta',
-        r'θ': r'\\theta',
-        r'λ': r'\\lambda',
-        r'μ': r'\\mu',
-        r'π': r'\\pi',
-        r'σ': r'\\sigma',
-        r'φ': r'\\phi',
-        r'ω': r'\\omega',
-        
-        # 特殊符號
-        r'∞': r'\\infty',
-        r'∑': r'\\sum',
-        r'∏': r'\\prod',
-        r'∫': r'\\int',
-        r'∂': r'\\partial',
-        r'∇': r'\\nabla',
-        r'∆': r'\\Delta',
-        
-        # 集合符號
-        r'∈': r'\\in',
-        r'∉': r'\\notin',
-        r'⊂': r'\\subset',
-        r'⊃': r'\\supset',
-        r'∩': r'\\cap',
-        r'∪': r'\\cup',
-        r'∅': r'\\emptyset',
-        
-        # 邏輯符號
-        r'∧': r'\\land',
-        r'∨': r'\\lor',
-        r'¬': r'\\lnot',
-        r'→': r'\\rightarrow',
-        r'↔': r'\\leftrightarrow',
-        r'∀': r'\\forall',
-        r'∃': r'\\exists',
-        
-        # 幾何符號
-        r'∠': r'\\angle',
-        r'△': r'\\triangle',
-        r'□': r'\\square',
-        r'○': r'\\circ',
-        r'⊥': r'\\perp',
-        r'∥': r'\\parallel',
-        r'≅': r'\\cong',
-        r'∼': r'\\sim',
-        
-        # 不等式符號
-        r'≤': r'\\leq',
-        r'≥': r'\\geq',
-        r'≠': r'\\neq',
-        r'≈': r'\\approx',
-        r'≡': r'\\equiv',
-        
-        # 省略號
-        r'…': r'\\ldots',
-        r'⋯': r'\\cdots',
-        
-        # 溫度符號
-        r'℃': r'^{\\circ}\\text{C}',
-        r'℉': r'^{\\circ}\\text{F}',
-    }
-    
-    # 應用轉換規則
-    for pattern, replacement in math_conversions.items():
-        text = re.sub(pattern, replacement, text)
-    
-    # 處理斜體變數 (*a* -> $a$)
-    text = re.sub(r'\*([a-zA-Z])\*', r'$\1$', text)
-    
-    # 處理數學表達式中的空格
-    text = re.sub(r'\s*([<>=])\s*', r' \1 ', text)
-    
-    # 簡化數學符號處理 - 不要過度包裝
-    # 只在確實需要時才包裝為 LaTeX
-    
-    return text
-
-def format_math_for_web(text: str) -> Dict[str, Any]:
-    """格式化數學表達式以供網頁顯示"""
-    # 提取數學表達式
-    math_expressions = extract_math_expressions(text)
-    
-    # 轉換為 LaTeX 格式
-    latex_text = convert_math_expressions(text)
-    
-    # 檢查是否需要 MathJax 渲染
-    needs_mathjax = bool(math_expressions) or '\\' in latex_text or '$' in latex_text
-    
-    return {
-        'original_text': text,
-        'latex_text': latex_text,
-        'math_expressions': math_expressions,
-        'needs_mathjax': needs_mathjax,
-        'display_text': latex_text  # 前端顯示用的文本
-    } 
\ No newline at end of file
+    return extract_latex_expressions(text)
@@ -0,0 +1,229 @@
+"""near_duplicates.py
+近似重複題目偵測：MinHash 簽章 + LSH 分帶，找出只差在 OCR 雜訊、選項順序或標點的題目。
+
+* 正規化以 question_index.question_hash 的規則為起點（轉小寫、去掉開頭題號、忽略空白與標點），
+  另外做 NFKC 把全形英數轉成半形；但保留英文單字的邊界
+* 切詞：連續的英數字算一個單位，其他文字（中文等）每個字一個單位，再取 SHINGLE_SIZE 個單位的 shingle；
+  題幹與每個選項分別切，選項順序不影響 shingle 集合
+* MinHash：shingle 取 CRC32 後，以 multiply-shift 雜湊 ((a * x + b) mod 2^64) >> 32 產生 num_perm 個排列，
+  題目依 shingle 數排序後成批補齊成 (題數, shingle 數, num_perm) 的矩陣，一次取每題最小值
+* LSH：簽章切成 bands 段，每段壓成一個 64-bit 值當 bucket key；只比較同 bucket 的候選，
+  再以簽章估計的 Jaccard 相似度 >= threshold 確認，整體不需兩兩比較
+* 可持續 add_many 新題目，也可 save / load 簽章供下次增量使用
+"""
+
+import re
+import unicodedata
+import zlib
+from collections import defaultdict
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .question_index import LEADING_NUMBER_RE
+
+SHINGLE_SIZE = 3
+NUM_PERM = 128
+BANDS = 32
+THRESHOLD = 0.8
+
+# 每批 (題數, shingle 數, num_perm) 的 uint64 中間矩陣大約的元素上限
+BATCH_ELEMENTS = 1 << 20
+SHIFT = np.uint64(32)
+UNIT_RE = re.compile(r"[a-z0-9]+|[^\W_]")
+
+
+def text_units(text: str) -> List[str]:
+    """正規化後切成單位：英數字串一個單位、其他文字一字一個單位，標點與空白丟棄"""
+    text = unicodedata.normalize("NFKC", text).lower().lstrip()
+    return UNIT_RE.findall(LEADING_NUMBER_RE.sub("", text, count=1))
+
+
+def _add_shingles(units: Sequence[str], shingles: set, size: int) -> None:
+    if not units:
+        return
+    if len(units) <= size:
+        shingles.add(" ".join(units))
+        return
+    for i in range(len(units) - size + 1):
+        shingles.add(" ".join(units[i:i + size]))
+
+
+def question_shingles(question: Union[Mapping, str], size: int = SHINGLE_SIZE) -> set:
+    """題幹與各選項分別切 shingle 後的聯集"""
+    shingles: set = set()
+    if isinstance(question, str):
+        _add_shingles(text_units(question), shingles, size)
+        return shingles
+    _add_shingles(text_units(str(question["question"])), shingles, size)
+    for option in (question.get("options") or {}).values():
+        _add_shingles(text_units(str(option)), shingles, size)
+    return shingles
+
+
+class MinHasher:
+    """以固定亂數種子產生 num_perm 組 (a, b)，同樣參數的簽章可跨行程、跨執行比較"""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1, shingle_size: int = SHINGLE_SIZE):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self.seed = seed
+        self.shingle_size = shingle_size
+        # a 為奇數，multiply-shift 取乘積的高 32 位元
+        self._a = rng.randint(0, 1 << 64, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.randint(0, 1 << 64, size=num_perm, dtype=np.uint64)
+
+    def signatures(self, questions: Iterable[Union[Mapping, str]]) -> np.ndarray:
+        """一批題目的 MinHash 簽章，shape (題數, num_perm)、dtype uint32
+
+        沒有任何 shingle 的題目（空白題幹）簽章全為 0xFFFFFFFF。
+        """
+        hashed: List[np.ndarray] = []
+        for question in questions:
+            shingles = question_shingles(question, self.shingle_size)
+            hashed.append(np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles)))
+
+        result = np.full((len(hashed), self.num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+        lengths = np.fromiter((len(h) for h in hashed), dtype=np.int64, count=len(hashed))
+        # 依 shingle 數排序，同一批的長度相近，補齊的浪費最少
+        order = np.argsort(lengths, kind="stable")
+        order = order[lengths[order] > 0]
+        sorted_lengths = lengths[order]
+        # 每批最多幾個 (題, shingle) 位置；排序後同一批最長的是最後一題，矩陣寬度以它為準
+        cells = max(1, BATCH_ELEMENTS // self.num_perm)
+        start = 0
+        while start < len(order):
+            # 第 k 題收進來時矩陣為 k * lengths[k-1]，隨 k 遞增，取不超過上限的最大 k（至少一題）
+            widths = sorted_lengths[start:start + cells]
+            padded = np.arange(1, len(widths) + 1) * widths
+            rows = max(1, int(np.searchsorted(padded, cells, side="right")))
+            batch = order[start:start + rows]
+            width = int(lengths[batch[-1]])
+            # 不足的位置重複第一個 shingle，不影響最小值
+            matrix = np.empty((len(batch), width), dtype=np.uint64)
+            for row, i in enumerate(batch.tolist()):
+                h = hashed[i]
+                matrix[row, :len(h)] = h
+                matrix[row, len(h):] = h[0]
+            result[batch] = self._min_hash(matrix)
+            start += len(batch)
+        return result
+
+    def _min_hash(self, matrix: np.ndarray) -> np.ndarray:
+        permuted = matrix[:, :, None] * self._a
+        permuted += self._b
+        permuted >>= SHIFT
+        return permuted.min(axis=1).astype(np.uint32)
+
+
+class NearDuplicateIndex:
+    """MinHash LSH 索引：add_many 時回傳每題與既有題目（含同批較早的題目）的近似重複"""
+
+    def __init__(self, threshold: float = THRESHOLD, num_perm: int = NUM_PERM, bands: int = BANDS, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) 必須是 bands ({bands}) 的倍數")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm, seed)
+        self.keys: List[str] = []
+        self._signatures = np.empty((0, num_perm), dtype=np.uint32)
+        self._size = 0
+        self._buckets: List[Dict[int, List[int]]] = [defaultdict(list) for _ in range(bands)]
+        self._band_coeffs = np.random.RandomState(seed + 1).randint(1, 1 << 62, size=self.rows, dtype=np.uint64) | np.uint64(1)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def signatures(self) -> np.ndarray:
+        return self._signatures[:self._size]
+
+    def _band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """(題數, bands) 的 64-bit bucket key，uint64 乘法溢位即為 mod 2^64"""
+        bands = signatures.astype(np.uint64).reshape(len(signatures), self.bands, self.rows)
+        with np.errstate(over="ignore"):
+            return (bands * self._band_coeffs).sum(axis=2, dtype=np.uint64)
+
+    def _append(self, signatures: np.ndarray) -> None:
+        needed = self._size + len(signatures)
+        if needed > len(self._signatures):
+            grown = np.empty((max(needed, 2 * len(self._signatures), 1024), self._signatures.shape[1]), dtype=np.uint32)
+            grown[:self._size] = self._signatures[:self._size]
+            self._signatures = grown
+        self._signatures[self._size:needed] = signatures
+        self._size = needed
+
+    def _candidates(self, band_keys: np.ndarray) -> set:
+        candidates = set()
+        for band, key in enumerate(band_keys.tolist()):
+            bucket = self._buckets[band].get(key)
+            if bucket:
+                candidates.update(bucket)
+        return candidates
+
+    def _matches(self, signature: np.ndarray, candidates: set) -> List[Tuple[str, float]]:
+        if not candidates:
+            return []
+        ids = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        similarity = (self._signatures[ids] == signature).mean(axis=1)
+        keep = similarity >= self.threshold
+        order = np.argsort(-similarity[keep], kind="stable")
+        return [(self.keys[i], float(s)) for i, s in zip(ids[keep][order].tolist(), similarity[keep][order].tolist())]
+
+    def add_many(self, questions: Sequence[Union[Mapping, str]], keys: Optional[Sequence[str]] = None) -> List[List[Tuple[str, float]]]:
+        """加入一批題目，回傳每題的 [(既有題目 key, 估計相似度)]，依相似度由高到低"""
+        keys = [str(self._size + n) for n in range(len(questions))] if keys is None else [str(k) for k in keys]
+        if len(keys) != len(questions):
+            raise ValueError("keys 與 questions 數量不同")
+        return self.add_signatures(self.hasher.signatures(questions), keys)
+
+    def add(self, question: Union[Mapping, str], key: Optional[str] = None) -> List[Tuple[str, float]]:
+        return self.add_many([question], None if key is None else [key])[0]
+
+    def add_signatures(self, signatures: np.ndarray, keys: Sequence[str], match: bool = True) -> List[List[Tuple[str, float]]]:
+        """加入已計算好的簽章（例如多個行程分別計算後合併）；match=False 時只建索引不比對"""
+        band_keys = self._band_keys(signatures)
+        base = self._size
+        self._append(signatures)
+        self.keys.extend(keys)
+        results = []
+        for n, row_keys in enumerate(band_keys):
+            if match:
+                results.append(self._matches(signatures[n], self._candidates(row_keys)))
+            for band, key in enumerate(row_keys.tolist()):
+                self._buckets[band][key].append(base + n)
+        return results
+
+    def query(self, question: Union[Mapping, str]) -> List[Tuple[str, float]]:
+        """查詢但不加入索引"""
+        signature = self.hasher.signatures([question])
+        return self._matches(signature[0], self._candidates(self._band_keys(signature)[0]))
+
+    def save(self, path: Union[str, Path]) -> None:
+        """保存簽章與 key（.npz，key 存成定長字串陣列，不需 pickle），bucket 於 load 時重建"""
+        np.savez_compressed(
+            path,
+            signatures=self.signatures,
+            keys=np.array(self.keys, dtype=str),
+            params=np.array([self.threshold, self.hasher.num_perm, self.bands, self.hasher.seed]),
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "NearDuplicateIndex":
+        with np.load(path, allow_pickle=False) as data:
+            threshold, num_perm, bands, seed = data["params"].tolist()
+            index = cls(threshold, int(num_perm), int(bands), int(seed))
+            index.add_signatures(data["signatures"], data["keys"].tolist(), match=False)
+        return index
+
+
+def find_near_duplicates(questions: Sequence[Union[Mapping, str]], threshold: float = THRESHOLD) -> List[Tuple[int, int, float]]:
+    """回傳所有近似重複的 (較早題目編號, 題目編號, 估計相似度)"""
+    index = NearDuplicateIndex(threshold)
+    pairs = []
+    for n, matches in enumerate(index.add_many(questions)):
+        pairs.extend((int(key), n, similarity) for key, similarity in matches)
+    return pairs
@@ -0,0 +1,73 @@
+"""normalize.py
+全形 / 半形正規化：以一張 str.translate 表把全形英文字母、數字、括號與全形空白轉成半形，
+讓後續比對只需寫 ASCII 的 regex（`\\(\\s*([A-F])\\s*\\)` 而不是 `[（(]\\s*([Ａ-ＦA-F])\\s*[）)]`）。
+
+只轉換這幾類字元，其他全形標點（．、：＊＃ 等）保持原樣：各科 parser 對這些符號的判斷本來就不同，
+一起轉換會讓原本不成立的比對成立。
+
+每個字元都是一對一替換，轉換後的字串與原文長度相同、位置一一對應，
+因此位移對照表就是恆等對應：在轉換後的字串上比對得到的位置，直接用來切原文即可。
+輸出（題目、選項內容）一律取自原文，全形字元不會被改寫。
+
+    folded = FoldedText.of("( Ｂ )１．題目")
+    match = ANSWER_RE.match(folded.folded)
+    number = folded.span(match, 2)           # "１"，取自原文
+    text = folded.sub(ANSWER_RE, "")         # 在轉換後的字串上比對，從原文刪除
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Optional
+
+FOLD_TABLE: Dict[int, int] = {
+    **{code: code - 0xFEE0 for code in range(ord("Ａ"), ord("Ｚ") + 1)},
+    **{code: code - 0xFEE0 for code in range(ord("ａ"), ord("ｚ") + 1)},
+    **{code: code - 0xFEE0 for code in range(ord("０"), ord("９") + 1)},
+    ord("（"): ord("("),
+    ord("）"): ord(")"),
+    ord("　"): ord(" "),
+}
+
+# 非 ASCII 字串的 translate 逐字查表，dict 查不到的字元要經過一次例外處理；
+# 改用涵蓋整個 BMP 的字串當表（每個位置都查得到）約快一倍，BMP 以外的字元查不到即維持原樣。
+# 純 ASCII 的行（isascii 為 C 層級的快速檢查）或整行沒有要轉換的字元時連查表都省略，直接回傳原字串。
+_FOLD_CHARS = "".join(chr(FOLD_TABLE.get(code, code)) for code in range(0x10000))
+_FOLDABLE_RE = re.compile("[Ａ-Ｚａ-ｚ０-９（）　]")
+
+
+def fold_width(text: str) -> str:
+    """把全形英數字、括號與全形空白轉成半形，長度不變"""
+    if text.isascii() or not _FOLDABLE_RE.search(text):
+        return text
+    return text.translate(_FOLD_CHARS)
+
+
+class FoldedText(NamedTuple):
+    """原文與其半形版本，兩者位置一一對應"""
+    original: str
+    folded: str
+
+    @classmethod
+    def of(cls, text: str, folded: Optional[str] = None) -> "FoldedText":
+        """已有半形版本（例如 Token.folded）時由 folded 傳入，不再重新轉換"""
+        return cls(text, fold_width(text) if folded is None else folded)
+
+    def span(self, match: "re.Match", group: int = 0) -> str:
+        """比對結果在原文中的文字"""
+        return self.original[match.start(group):match.end(group)]
+
+    def sub(self, pattern: "re.Pattern", repl: str, count: int = 0) -> str:
+        """在半形版本上比對 pattern，把原文中對應的片段換成 repl（repl 為純文字，不展開群組）"""
+        if self.folded is self.original:  # 沒有要轉換的字元，直接在原文上替換
+            return pattern.sub(lambda _: repl, self.original, count)
+        parts: List[str] = []
+        last = 0
+        for n, match in enumerate(pattern.finditer(self.folded)):
+            if count and n >= count:
+                break
+            parts.append(self.original[last:match.start()])
+            parts.append(repl)
+            last = match.end()
+        if not parts:
+            return self.original
+        parts.append(self.original[last:])
+        return "".join(parts)
@@ -0,0 +1,178 @@
+"""profiling.py
+可選的效能剖析：PDF 轉換（convert_pdf_to_markdown）與各科 parse_* 入口，每處理一個檔案就收集
+cProfile 統計與 tracemalloc 記憶體配置，寫在輸出旁邊，並標出耗時或記憶體明顯高於整批中位數的檔案。
+
+開啟方式：設定環境變數 PDF2MD_PROFILE=1，或在程式中呼叫 enable_profiling()。
+未開啟時 @profiled 包裝只多一次函式呼叫與一次 None 判斷，不啟動 cProfile / tracemalloc。
+
+每個檔案寫出兩個檔案（<輸出檔名>.<標籤>.profile.txt / .prof）：
+* .profile.txt：耗時、記憶體峰值、依累計時間排序的函式、仍佔用記憶體最多的程式行
+* .prof：原始 cProfile 統計，可用 `python -m pstats` 或 snakeviz 開啟
+
+    profiler = enable_profiling()
+    for path in files:
+        parse_science(path)          # 已以 @profiled("science", ...) 包裝
+    profiler.print_summary()         # 列出明顯偏慢或偏耗記憶體的檔案
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple, Union
+
+PROFILE_ENV = "PDF2MD_PROFILE"
+OUTLIER_FACTOR = 3.0   # 耗時或記憶體峰值超過整批中位數的倍數即標出
+
+
+@dataclass
+class ProfileRecord:
+    label: str
+    source: str
+    seconds: float
+    peak_bytes: int
+    report_path: Optional[str] = None
+
+
+def report_base(output_path: Union[str, Path], label: str) -> Path:
+    """剖析結果的路徑（不含副檔名）：exam.md -> exam.<label>"""
+    path = Path(output_path)
+    return path.with_name(f"{path.stem}.{label}")
+
+
+class BatchProfiler:
+    """整批處理的剖析器：逐檔收集統計並寫出報告，最後與整批中位數比較"""
+
+    def __init__(self, top: int = 30, allocations: int = 15, factor: float = OUTLIER_FACTOR):
+        self.top = top
+        self.allocations = allocations
+        self.factor = factor
+        self.records: List[ProfileRecord] = []
+        self._running = False
+
+    @contextmanager
+    def profile(self, label: str, source: Union[str, Path], output_path: Optional[Union[str, Path]] = None) -> Iterator[None]:
+        """剖析 with 區塊；output_path 為 None 時只記錄耗時與記憶體，不寫報告
+
+        cProfile 無法巢狀執行，已在剖析中（例如 parse_science 內呼叫其他入口）時直接執行區塊。
+        """
+        if self._running:
+            yield
+            return
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        profiler = cProfile.Profile()
+        self._running = True
+        start_time = time.perf_counter()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            seconds = time.perf_counter() - start_time
+            self._running = False
+            _, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+            record = ProfileRecord(label, str(source), seconds, peak)
+            if output_path is not None:
+                record.report_path = self._write_report(record, profiler, snapshot, report_base(output_path, label))
+            self.records.append(record)
+
+    def _write_report(self, record: ProfileRecord, profiler: cProfile.Profile,
+                      snapshot: tracemalloc.Snapshot, base: Path) -> str:
+        stream = io.StringIO()
+        stream.write(f"{record.label}: {record.source}\n")
+        stream.write(f"耗時 {record.seconds:.3f} 秒，記憶體峰值 {record.peak_bytes / 1024 ** 2:.2f} MB\n\n")
+        pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(self.top)
+        stream.write(f"\n仍佔用記憶體最多的 {self.allocations} 行：\n")
+        for stat in snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)]).statistics("lineno")[:self.allocations]:
+            stream.write(f"{stat}\n")
+
+        base.parent.mkdir(parents=True, exist_ok=True)
+        report_path = base.with_name(base.name + ".profile.txt")
+        report_path.write_text(stream.getvalue(), encoding="utf-8")
+        profiler.dump_stats(str(base.with_name(base.name + ".prof")))
+        return str(report_path)
+
+    def outliers(self) -> List[Tuple[ProfileRecord, List[str]]]:
+        """耗時或記憶體峰值超過同一標籤中位數 factor 倍的檔案，回傳 (紀錄, 原因)"""
+        flagged = []
+        for label in dict.fromkeys(record.label for record in self.records):
+            records = [record for record in self.records if record.label == label]
+            if len(records) < 2:
+                continue
+            median_seconds = statistics.median(record.seconds for record in records)
+            median_peak = statistics.median(record.peak_bytes for record in records)
+            for record in records:
+                reasons = []
+                if median_seconds > 0 and record.seconds > median_seconds * self.factor:
+                    reasons.append(f"耗時 {record.seconds:.2f} 秒（中位數 {median_seconds:.2f} 秒）")
+                if median_peak > 0 and record.peak_bytes > median_peak * self.factor:
+                    reasons.append(f"記憶體峰值 {record.peak_bytes / 1024 ** 2:.1f} MB（中位數 {median_peak / 1024 ** 2:.1f} MB）")
+                if reasons:
+                    flagged.append((record, reasons))
+        return flagged
+
+    def print_summary(self) -> None:
+        if not self.records:
+            return
+        print(f"\n🔍 效能剖析：共 {len(self.records)} 個檔案")
+        flagged = self.outliers()
+        for record, reasons in flagged:
+            print(f"   ⚠️  {record.label} {record.source}：{'，'.join(reasons)}")
+            if record.report_path:
+                print(f"      報告：{record.report_path}")
+        if not flagged:
+            print(f"   ✅ 沒有明顯偏離中位數（{self.factor:g} 倍）的檔案")
+
+
+_active: Optional[BatchProfiler] = None
+
+
+def profiling_requested() -> bool:
+    return os.getenv(PROFILE_ENV, "").strip().lower() not in ("", "0", "false", "no")
+
+
+def enable_profiling(profiler: Optional[BatchProfiler] = None) -> BatchProfiler:
+    global _active
+    _active = profiler or BatchProfiler()
+    return _active
+
+
+def disable_profiling() -> None:
+    global _active
+    _active = None
+
+
+def active_profiler() -> Optional[BatchProfiler]:
+    return _active
+
+
+def profiled(label: str, output_path: Callable[..., Optional[Union[str, Path]]]) -> Callable:
+    """以剖析器包裝一個逐檔處理的入口；output_path 由呼叫參數取得報告要寫在哪個檔案旁邊"""
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _active
+            if profiler is None:
+                return func(*args, **kwargs)
+            path = output_path(*args, **kwargs)
+            with profiler.profile(label, path or "", path or None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+if profiling_requested():
+    enable_profiling()
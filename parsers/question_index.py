@@ -0,0 +1,134 @@
+"""question_index.py
+跨題庫的完全重複題目索引：以 SQLite 檔案保存題目雜湊，parser 輸出題目時即可查詢、登記，
+不必等全部解析完再用資料庫批次去重。
+
+* 雜湊沿用 math_parser 的正規化規則（去除空白、標點、開頭題號，轉小寫後取 MD5），
+  question_key 另外把選項內容一起算入，避免「下列何者正確？」這類常見題幹被誤判為重複
+* questions 表以雜湊為 PRIMARY KEY，查詢與 insert-or-skip 都只走主鍵索引
+* sources 表記錄每一個出現位置（檔案路徑 + 該檔第幾題），重複題也會登記來源
+* WAL 模式 + busy_timeout，多個 parser 行程可同時寫入同一個索引檔；
+  每個檔案的題目在一個 BEGIN IMMEDIATE 交易內寫入，誰先提交誰就是「第一次出現」
+  （corpus.build_corpus 在主行程依檔案順序登記，結果不受 worker 完成順序影響）
+* 同一個檔案重新登記時（例如以同一個索引再跑一次題庫），add_many 先清除該檔舊的出現位置，
+  原本就由這個檔案第一次登記的題目仍視為新題目，索引可跨多次執行共用
+"""
+
+import hashlib
+import re
+import sqlite3
+from collections.abc import Mapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple, Union
+
+NORMALIZE_RE = re.compile(r"[\s\u3000，。；：！？()（）\[\]【】「」『』']+")
+LEADING_NUMBER_RE = re.compile(r"^\d+")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    hash TEXT PRIMARY KEY,
+    question TEXT NOT NULL,
+    source TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sources (
+    hash TEXT NOT NULL,
+    source TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (hash, source, position)
+) WITHOUT ROWID;
+"""
+
+
+def question_hash(text: str) -> str:
+    """生成題目的唯一哈希值"""
+    normalized = NORMALIZE_RE.sub("", text)
+    normalized = LEADING_NUMBER_RE.sub("", normalized, count=1)
+    return hashlib.md5(normalized.lower().encode("utf-8")).hexdigest()
+
+
+def question_key(question: Mapping) -> str:
+    """題幹加上依選項字母排序的選項內容的雜湊"""
+    options = question.get("options") or {}
+    return question_hash(str(question["question"]) + "".join(str(options[k]) for k in sorted(options)))
+
+
+class QuestionIndex:
+    """存在磁碟上的題目雜湊索引，可跨行程共用"""
+
+    def __init__(self, path: Union[str, Path], timeout: float = 30.0):
+        self.path = str(path)
+        # isolation_level=None：交易由 transaction() 明確控制
+        self._conn = sqlite3.connect(self.path, timeout=timeout, isolation_level=None)
+        self._conn.execute(f"PRAGMA busy_timeout = {int(timeout * 1000)}")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> "QuestionIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """寫入交易：一開始就取得寫入鎖，其他行程等待 busy_timeout 而不是中途失敗"""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def _add(self, key: str, text: str, source: str, position: int) -> bool:
+        is_new = self._conn.execute(
+            "INSERT OR IGNORE INTO questions (hash, question, source) VALUES (?, ?, ?)",
+            (key, text, source),
+        ).rowcount == 1
+        if not is_new:
+            # 題目原本就由這個檔案登記，且這是該檔內第一個位置：同一檔案重新登記，不算重複
+            owner = self._conn.execute("SELECT source FROM questions WHERE hash = ?", (key,)).fetchone()[0]
+            is_new = owner == source and self._conn.execute(
+                "SELECT 1 FROM sources WHERE hash = ? AND source = ? AND position < ?", (key, source, position),
+            ).fetchone() is None
+        self._conn.execute(
+            "INSERT OR IGNORE INTO sources (hash, source, position) VALUES (?, ?, ?)",
+            (key, source, position),
+        )
+        return is_new
+
+    def add(self, question: Mapping, source: str, position: int = 0) -> bool:
+        """登記一題，第一次出現（或本來就由同一個來源、同一位置登記）回傳 True，重複題回傳 False（來源仍會記錄）"""
+        with self.transaction():
+            return self._add(question_key(question), str(question["question"]), source, position)
+
+    def add_many(self, questions: Iterable[Mapping], source: str) -> List[bool]:
+        """在同一個交易內登記一個檔案的所有題目，position 為該檔的題目順序"""
+        return self.add_keys(((question_key(q), str(q["question"])) for q in questions), source)
+
+    def add_keys(self, keys: Iterable[Tuple[str, str]], source: str) -> List[bool]:
+        """以預先算好的 (question_key, 題目文字) 登記一個檔案的所有題目；先清除該檔舊的出現位置"""
+        with self.transaction():
+            self._conn.execute("DELETE FROM sources WHERE source = ?", (source,))
+            return [self._add(key, text, source, n) for n, (key, text) in enumerate(keys)]
+
+    def __contains__(self, question: Union[Mapping, str]) -> bool:
+        key = question if isinstance(question, str) else question_key(question)
+        return self._conn.execute("SELECT 1 FROM questions WHERE hash = ?", (key,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+
+    def sources(self, question: Union[Mapping, str]) -> List[Tuple[str, int]]:
+        """題目出現過的所有 (檔案路徑, 題目順序)"""
+        key = question if isinstance(question, str) else question_key(question)
+        rows = self._conn.execute("SELECT source, position FROM sources WHERE hash = ? ORDER BY source, position", (key,))
+        return [tuple(row) for row in rows]
+
+    def duplicates(self) -> Iterator[Tuple[str, int]]:
+        """出現超過一次的題目：(雜湊, 出現次數)"""
+        yield from self._conn.execute("SELECT hash, COUNT(*) FROM sources GROUP BY hash HAVING COUNT(*) > 1")
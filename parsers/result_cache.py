@@ -0,0 +1,160 @@
+"""result_cache.py
+parser 解析結果的快取：以「輸入內容雜湊 + parser 版本」為 key，把解析出的題目存成 JSONL。
+重跑整批解析時，內容沒變、parser 版本也沒變的檔案直接讀回結果，不必重新解析。
+
+* key 為 sha256(檔案路徑 + 輸入內容)：輸出的年級、科目、出版社與圖片路徑都由檔案路徑決定，
+  所以同樣內容放在不同路徑會分開快取；.md 旁有區塊檔（blocks.py）而 parser 讀的是區塊檔時，輸入內容取區塊檔
+* 每個 parser 模組各有 PARSER_VERSION，修改解析邏輯時調高該模組的版本，
+  只有這個 parser 的快取失效，其他 parser 的快取不受影響
+* 快取檔案位置：<cache_dir>/<parser>/<版本>/<key 前兩碼>/<key>.jsonl
+  寫入時先寫暫存檔再 os.replace，多個行程同時寫入同一個快取也不會讀到寫一半的檔案
+
+    cache = ResultCache(".parser_cache")
+    questions = cache.parse("math", "input_md/111A/7/Hanlin/Math/L1.md")
+    questions = cache.parse("english", doc_paragraphs, "input_md/111A/7/Hanlin/English/L1.docx")
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from importlib import import_module
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .base_parser import question_dicts
+from .blocks import find_blocks
+from .exam_lexer import paragraph_text
+from .jsonl_io import question_line
+
+DEFAULT_CACHE_DIR = Path(".parser_cache")
+
+# parser 名稱 -> (模組, 解析入口)；math / science 的入口接受檔案路徑，其餘接受段落與檔案路徑
+ENTRY_POINTS: Dict[str, Tuple[str, str]] = {
+    "math": ("math_parser", "parse_math_markdown"),
+    "science": ("science_parser", "parse_science"),
+    "chinese": ("chinese_parser", "parse_chinese"),
+    "english": ("english_parser", "parse_english"),
+    "social": ("social_parser", "parse_social"),
+}
+PATH_ENTRY_POINTS = ("math", "science")
+# .md 旁有區塊檔時改讀區塊檔的 parser；其他 parser 只以 Markdown 驗證過，一律讀 .md
+BLOCK_PARSERS = ("math",)
+
+
+def parser_module(name: str):
+    return import_module(f".{ENTRY_POINTS[name][0]}", __package__)
+
+
+def parser_version(name: str) -> str:
+    return str(parser_module(name).PARSER_VERSION)
+
+
+def content_key(file_path: Union[str, Path], content: bytes) -> str:
+    digest = hashlib.sha256(str(file_path).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(content)
+    return digest.hexdigest()
+
+
+def paragraphs_content(paragraphs: Iterable) -> Tuple[List[str], bytes]:
+    """段落（docx 段落或字串）的文字與用來計算雜湊的內容"""
+    texts = [paragraph_text(p) for p in paragraphs]
+    return texts, "\n".join(texts).encode("utf-8")
+
+
+def file_paragraphs(path: Union[str, Path]) -> Iterable[str]:
+    """直接給檔案時交給 parser 的段落：.docx 逐段讀取，其他（.md）逐行讀取，與 build_corpus 相同"""
+    if str(path).lower().endswith(".docx"):
+        from .docx_reader import iter_docx_paragraphs
+
+        return iter_docx_paragraphs(path)
+    return Path(path).read_text(encoding="utf-8").splitlines()
+
+
+class ResultCache:
+    """磁碟上的解析結果快取"""
+
+    def __init__(self, cache_dir: Union[str, Path] = DEFAULT_CACHE_DIR, versions: Optional[Dict[str, str]] = None):
+        """versions 可指定各 parser 的版本，未指定的讀取 parser 模組的 PARSER_VERSION"""
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+        self._versions: Dict[str, str] = dict(versions or {})
+
+    def version(self, name: str) -> str:
+        if name not in self._versions:
+            self._versions[name] = parser_version(name)
+        return self._versions[name]
+
+    def entry_path(self, name: str, key: str) -> Path:
+        return self.cache_dir / name / self.version(name) / key[:2] / f"{key}.jsonl"
+
+    def load_lines(self, name: str, key: str) -> Optional[List[str]]:
+        """快取命中時回傳 JSONL 行（不含換行），否則回傳 None"""
+        try:
+            with open(self.entry_path(name, key), "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return lines
+
+    def store_lines(self, name: str, key: str, lines: Iterable[str]) -> None:
+        path = self.entry_path(name, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                for line in lines:
+                    f.write(line)
+                    f.write("\n")
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def parse(self, name: str, source, file_path: Union[str, Path] = "") -> List[Dict[str, Any]]:
+        """帶快取的解析入口
+
+        math / science：source 為檔案路徑。
+        chinese / english / social：source 為段落（docx 段落或字串）搭配 file_path，或直接給 .docx / .md 路徑。
+        不論是否命中快取都回傳 dict，內容與寫入快取的 JSONL 相同。
+        """
+        parse = getattr(parser_module(name), ENTRY_POINTS[name][1])
+        if name in PATH_ENTRY_POINTS:
+            blocks_path = find_blocks(source) if name in BLOCK_PARSERS else None
+            key = content_key(source, Path(blocks_path or source).read_bytes())
+            run = lambda: parse(source)
+        elif isinstance(source, (str, Path)):
+            # 直接給檔案時以檔案內容計算 key，與 build_corpus 共用同一份快取
+            file_path = str(file_path or source)
+            key = content_key(file_path, Path(source).read_bytes())
+            run = lambda: parse(file_paragraphs(source), file_path)
+        else:
+            texts, content = paragraphs_content(source)
+            key = content_key(file_path, content)
+            run = lambda: parse(texts, str(file_path))
+
+        lines = self.load_lines(name, key)
+        if lines is not None:
+            return [json.loads(line) for line in lines]
+        questions = question_dicts(run())
+        self.store_lines(name, key, (question_line(q) for q in questions))
+        return questions
+
+    def prune(self) -> int:
+        """刪除不是目前 parser 版本的快取資料夾，回傳刪除的資料夾數"""
+        removed = 0
+        for name in ENTRY_POINTS:
+            parser_dir = self.cache_dir / name
+            if not parser_dir.is_dir():
+                continue
+            current = self.version(name)
+            for version_dir in parser_dir.iterdir():
+                if version_dir.is_dir() and version_dir.name != current:
+                    shutil.rmtree(version_dir)
+                    removed += 1
+        return removed
@@ -1,20 +1,39 @@
 import re
 import hashlib
-from typing import List, Dict, Any, Optional, Tuple
-from .base_parser import standard_question_dict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from .base_parser import QuestionRecord, question_dicts, question_record
 import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 from utils.image_naming import generate_image_path_for_parser
+from .exam_lexer import SECTION_HEADER, Token, TokenStream, join_tokens, option_items, paragraph_text, scan_markers
+from .normalize import FoldedText, fold_width
+from .profiling import profiled
+
+CHOICE_LETTERS = "ＡＢＣＤＥＦABCDEF"
+PARSER_VERSION = "1"
+# 以下在 fold_width 轉成半形的文字上比對
+QUESTION_NUMBER_RES = (
+    re.compile(r"\(\s*[A-F]\s*\)\s*(\d+)[．.]"),  # 選擇題格式
+    re.compile(r"^(\d+)[．.]"),                      # 填充題格式
+)
+ANSWER_PREFIX_RE = re.compile(r"^\(\s*[A-F]\s*\)\s*\d+[．.]\s*")
+# 對外的 is_choice_question / is_fill_blank_question 沿用原本的比對：答案與題號可出現在行內任何位置
+CHOICE_QUESTION_RE = re.compile(r"\(\s*[A-F]\s*\)\s*\d+[．.]")
+FILL_BLANK_RE = re.compile(r"^\d+[．.]")
+# clean_question_text 與 _options_from 每題都會用到，預先編譯
+NUMBER_PREFIX_RE = re.compile(r'^\d+[．.]\s*')
+OPTIONS_TAIL_RE = re.compile(r'[（(][A-D][）)].*$', re.DOTALL)
+SCORE_RES = (re.compile(r'每題\s*\d+\s*分'), re.compile(r'共\s*\d+\s*分'))
+LEADING_PUNCT_RE = re.compile(r'^[\s，。、：；]+')
+TRAILING_PUNCT_RE = re.compile(r'[\s，。、：；]+$')
+TRAILING_SEMICOLON_RE = re.compile(r'[；;]+$')
 
 def load_docx_paragraphs(docx_path: str) -> List[str]:
     """從 DOCX 檔案載入段落列表"""
-    from docx import Document
-    from pathlib import Path
-    
-    docx_path = Path(docx_path)
-    doc = Document(docx_path)
-    return [p.text.strip() for p in doc.paragraphs if p.text.strip()]
+    from .docx_reader import iter_docx_paragraphs
+
+    return [text for text in (p.strip() for p in iter_docx_paragraphs(docx_path)) if text]
 
 def load_md_paragraphs(md_path: str) -> List[Any]:
     """從 MD 檔案載入段落列表，返回與 DOCX 段落相似的結構"""
@@ -32,68 +51,68 @@ def load_md_paragraphs(md_path: str) -> List[Any]:
     
     return paragraphs
 
-def extract_answer_from_question_header(text: str) -> Optional[str]:
-    """從題目標頭提取答案，如 '( Ｂ )1.' -> 'B'"""
+def _text_of(text) -> str:
     # 確保 text 是字串
     if hasattr(text, 'text'):
         text = text.text
-    text = str(text)
+    return str(text)
+
+def _is_choice(token: Token) -> bool:
+    """( Ｂ )1. 格式"""
+    return bool(token.letter) and token.letter in CHOICE_LETTERS and token.separator in (".", "．")
+
+def _is_fill_blank(token: Token) -> bool:
+    """1. 格式"""
+    return token.letter is None and token.separator in (".", "．")
+
+def _options_from(text: str, markers) -> Optional[Dict[str, str]]:
+    options = {}
     
-    # 匹配各種括號內答案格式
-    patterns = [
-        r'[（(]\s*([Ａ-ＦABCDEF])\s*[）)]',  # 全形或半形括號
-        r'[（(]\s*([A-F])\s*[）)]'           # 標準格式
-    ]
+    # 匹配選項格式 (A)、(B)、(C)、(D)
+    for item in option_items(text, markers, "ABCD", stops="（(", terminated=True):
+        option_text = item.content
+        if option_text:
+            # 清理選項文字
+            option_text = TRAILING_SEMICOLON_RE.sub('', option_text)  # 移除末尾分號
+            option_text = option_text.strip()
+            if option_text:
+                options[item.letter] = option_text
     
-    for pattern in patterns:
-        match = re.search(pattern, text)
-        if match:
-            answer = match.group(1)
-            # 轉換全形字母為半形
-            answer = answer.translate(str.maketrans("ＡＢＣＤＥＦ", "ABCDEF"))
-            return answer
-    return None
+    return options if len(options) >= 2 else None
 
-def extract_question_number(text: str) -> Optional[str]:
-    """提取題目編號，如 '( Ｂ )1.' -> '1'"""
+def extract_answer_from_question_header(text: str, folded: Optional[str] = None) -> Optional[str]:
+    """從題目標頭提取答案，如 '( Ｂ )1.' -> 'B'
+
+    以下幾個函式的 folded 為 text 的半形版本（例如 Token.folded），有傳入時不再重新轉換。"""
     # 確保 text 是字串
     if hasattr(text, 'text'):
         text = text.text
     text = str(text)
     
-    # 匹配題目編號格式
-    patterns = [
-        r'[（(]\s*[Ａ-ＦABCDEF]\s*[）)]\s*(\d+)[．.]',  # 選擇題格式
-        r'^(\d+)[．.]',                                   # 填充題格式
-    ]
+    # 第一個括號內答案，全形或半形括號與字母皆可
+    markers = scan_markers(text, folded)
+    return fold_width(markers[0][2]) if markers else None
+
+def extract_question_number(text: str, folded: Optional[str] = None) -> Optional[str]:
+    """提取題目編號，如 '( Ｂ )1.' -> '1'"""
+    # 確保 text 是字串
+    if hasattr(text, 'text'):
+        text = text.text
+    text = str(text)
     
-    for pattern in patterns:
-        match = re.search(pattern, text)
+    # 匹配題目編號格式，題號取自原文
+    folded_text = FoldedText.of(text, folded)
+    for pattern in QUESTION_NUMBER_RES:
+        match = pattern.search(folded_text.folded)
         if match:
-            return match.group(1)
+            return folded_text.span(match, 1)
     return None
 
-def extract_options_from_text(text: str) -> Optional[Dict[str, str]]:
+def extract_options_from_text(text: str, folded: Optional[str] = None) -> Optional[Dict[str, str]]:
     """從文字中提取選項"""
-    options = {}
-    
-    # 匹配選項格式 (A)、(B)、(C)、(D)
-    pattern = r'[（(]([A-D])[）)]\s*([^（(]*?)(?=[（(][A-D][）)]|$)'
-    matches = re.finditer(pattern, text)
-    
-    for match in matches:
-        option_key = match.group(1)
-        option_text = match.group(2).strip()
-        if option_text:
-            # 清理選項文字
-            option_text = re.sub(r'[；;]+$', '', option_text)  # 移除末尾分號
-            option_text = option_text.strip()
-            if option_text:
-                options[option_key] = option_text
-    
-    return options if len(options) >= 2 else None
+    return _options_from(text, scan_markers(text, folded))
 
-def clean_question_text(text: str) -> str:
+def clean_question_text(text: str, folded: Optional[str] = None) -> str:
     """清理題目文字"""
     # 確保 text 是字串
     if hasattr(text, 'text'):
@@ -101,74 +120,68 @@ def clean_question_text(text: str) -> str:
     text = str(text)
     
     # 移除答案前綴 ( Ｂ )1. 或 1.
-    text = re.sub(r'^[（(]\s*[Ａ-ＦABCDEF]\s*[）)]\s*\d+[．.]\s*', '', text)
-    text = re.sub(r'^\d+[．.]\s*', '', text)
+    text = FoldedText.of(text, folded).sub(ANSWER_PREFIX_RE, '')
+    text = NUMBER_PREFIX_RE.sub('', text)
     
     # 移除選項部分
-    text = re.sub(r'[（(][A-D][）)].*$', '', text, flags=re.DOTALL)
+    text = OPTIONS_TAIL_RE.sub('', text)
     
     # 移除分數資訊
-    text = re.sub(r'每題\s*\d+\s*分', '', text)
-    text = re.sub(r'共\s*\d+\s*分', '', text)
+    for pattern in SCORE_RES:
+        text = pattern.sub('', text)
     
     # 清理空白和標點
-    text = re.sub(r'^[\s，。、：；]+', '', text)
-    text = re.sub(r'[\s，。、：；]+$', '', text)
+    text = LEADING_PUNCT_RE.sub('', text)
+    text = TRAILING_PUNCT_RE.sub('', text)
     
     return text.strip()
 
+SECTION_HEADERS = [
+    r'A部分[/／]?實力養成題',
+    r'B部分[/／]?概念延伸題',
+    r'\*\*A部分[/／]?實力養成題',
+    r'\*\*B部分[/／]?概念延伸題',
+    r'一、基礎選擇題',
+    r'二、填充題',
+    r'三、題組題',
+    r'四、.*題',
+    r'五、.*題',
+    r'\*\*一、基礎選擇題',
+    r'\*\*二、填充題',
+    r'\*\*三、題組題',
+    r'\*\*四、.*題',
+    r'\*\*五、.*題'
+]
+
+def _section_header(token: Token) -> Optional[str]:
+    if token.kind != SECTION_HEADER:
+        return None
+    for header in SECTION_HEADERS:
+        if re.search(header, token.text):
+            return token.text
+    return None
+
+# 以下三個對外函式維持原本的 regex 判斷（標題、答案可在行內任何位置，行首空白不去除）；
+# 解析迴圈內改用 Token 欄位判斷（_section_header、_is_choice、_is_fill_blank），只看行首
+
 def is_section_header(text: str) -> Optional[str]:
     """識別區塊標題"""
-    # 確保 text 是字串
-    if hasattr(text, 'text'):
-        text = text.text
-    text = str(text)
-    
-    headers = [
-        r'A部分[/／]?實力養成題',
-        r'B部分[/／]?概念延伸題',
-        r'\*\*A部分[/／]?實力養成題',
-        r'\*\*B部分[/／]?概念延伸題',
-        r'一、基礎選擇題',
-        r'二、填充題',
-        r'三、題組題',
-        r'四、.*題',
-        r'五、.*題',
-        r'\*\*一、基礎選擇題',
-        r'\*\*二、填充題',
-        r'\*\*三、題組題',
-        r'\*\*四、.*題',
-        r'\*\*五、.*題'
-    ]
-    
-    for header in headers:
+    text = _text_of(text)
+    for header in SECTION_HEADERS:
         if re.search(header, text):
             return text
     return None
 
 def is_choice_question(text: str) -> bool:
     """判斷是否為選擇題"""
-    # 確保 text 是字串
-    if hasattr(text, 'text'):
-        text = text.text
-    text = str(text)
-    
     # 檢查是否有答案格式 ( Ｂ )1.
-    if re.search(r'[（(]\s*[Ａ-ＦABCDEF]\s*[）)]\s*\d+[．.]', text):
-        return True
-    return False
+    return CHOICE_QUESTION_RE.search(fold_width(_text_of(text))) is not None
 
 def is_fill_blank_question(text: str) -> bool:
     """判斷是否為填充題"""
-    # 確保 text 是字串
-    if hasattr(text, 'text'):
-        text = text.text
-    text = str(text)
-    
     # 檢查是否為純數字編號格式 1.
-    if re.match(r'^\d+[．.]', text) and not is_choice_question(text):
-        return True
-    return False
+    text = _text_of(text)
+    return FILL_BLANK_RE.match(text) is not None and not is_choice_question(text)
 
 def is_group_intro(text: str) -> bool:
     """判斷是否為題組說明"""
@@ -191,16 +204,18 @@ def has_image_reference(text: str) -> bool:
 
 def parse_science_questions(file_path: str) -> List[Dict[str, Any]]:
     """解析自然科檔案中的題目，支援 DOCX 和 MD 格式"""
-    from pathlib import Path
-    
     file_path = Path(file_path)
     
-    # 根據副檔名決定使用哪個載入函數
+    # 根據副檔名決定使用哪個載入函數；MD 直接逐行串流讀取
     if file_path.suffix.lower() == '.md':
-        paragraphs = load_md_paragraphs(str(file_path))
-    else:
-        paragraphs = load_docx_paragraphs(str(file_path))
-    questions = []
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return list(iter_science_questions(f, file_path))
+    return list(iter_science_questions(load_docx_paragraphs(str(file_path)), file_path))
+
+def iter_science_questions(paragraphs: Iterable, file_path: str = "") -> Iterator[Dict[str, Any]]:
+    """串流解析自然科題目：paragraphs 可為任何行的 iterator（空行會略過），每解析完一題就 yield"""
+    lines = (text for text in (paragraph_text(p).strip() for p in paragraphs) if text)
+    tokens = TokenStream(lines)
     
     current_section = None
     current_group = None
@@ -208,12 +223,13 @@ def parse_science_questions(file_path: str) -> List[Dict[str, Any]]:
     img_counter = 0
     
     i = 0
-    while i < len(paragraphs):
-        paragraph = paragraphs[i]
-        text = paragraph.text if hasattr(paragraph, 'text') else str(paragraph)
+    while tokens.has(i):
+        tokens.release(i)
+        token = tokens[i]
+        text = token.text
         
         # 檢查區塊標題
-        section_header = is_section_header(text)
+        section_header = _section_header(token)
         if section_header:
             current_section = section_header
             current_group = None
@@ -238,25 +254,24 @@ def parse_science_questions(file_path: str) -> List[Dict[str, Any]]:
             continue
         
         # 解析選擇題
-        if is_choice_question(text):
-            question_num = extract_question_number(text)
-            answer = extract_answer_from_question_header(text)
-            question_text = clean_question_text(text)
+        if _is_choice(token):
+            question_num = token.number
+            answer = token.answer
+            question_text = clean_question_text(text, token.folded)
             
             # 尋找選項（可能在當前行或後續幾行）
-            options = extract_options_from_text(text)
+            options = _options_from(text, token.markers)
             if not options:
                 # 在後續行中尋找選項
                 j = i + 1
-                option_text = text
-                while j < len(paragraphs) and j < i + 3:
-                    next_paragraph = paragraphs[j]
-                    next_text = next_paragraph.text if hasattr(next_paragraph, 'text') else str(next_paragraph)
-                    if is_choice_question(next_text) or is_fill_blank_question(next_text) or is_group_intro(next_text):
+                option_tokens = [token]
+                while j < i + 3 and tokens.has(j):
+                    next_token = tokens[j]
+                    if _is_choice(next_token) or _is_fill_blank(next_token) or is_group_intro(next_token.text):
                         break
-                    option_text += " " + next_text
+                    option_tokens.append(next_token)
                     j += 1
-                options = extract_options_from_text(option_text)
+                options = _options_from(*join_tokens(option_tokens))
             
             if options and len(options) >= 2:
                 # 檢查圖片引用
@@ -288,15 +303,15 @@ def parse_science_questions(file_path: str) -> List[Dict[str, Any]]:
                     question_dict["group_intro"] = current_group['intro']
                     question_dict["group_image_path"] = current_group['image_path']
                 
-                questions.append(question_dict)
+                yield question_dict
             
             i += 1
             continue
         
         # 解析填充題
-        if is_fill_blank_question(text):
-            question_num = extract_question_number(text)
-            question_text = clean_question_text(text)
+        if _is_fill_blank(token):
+            question_num = token.number
+            question_text = clean_question_text(text, token.folded)
             
             # 填充題的答案通常需要人工標記或從題目中推斷
             # 這裡暫時設為空，可以後續改進
@@ -318,33 +333,34 @@ def parse_science_questions(file_path: str) -> List[Dict[str, Any]]:
                 "question_number": question_num
             }
             
-            questions.append(question_dict)
+            yield question_dict
             i += 1
             continue
         
         i += 1
-    
-    return questions
 
+def _science_record(q: Dict[str, Any], file_path: str) -> QuestionRecord:
+    return question_record(
+        question_text=q["question_text"],
+        options=q["options"] if q["options"] else {},
+        answer=q["answer"] if q["answer"] else "",
+        file_path=file_path,
+        image_path=q.get("image_path")
+    )
+
+def iter_science(paragraphs: Iterable, file_path: str = "") -> Iterator[QuestionRecord]:
+    """串流版的 parse_science：每解析完一題就 yield 標準格式的題目"""
+    for q in iter_science_questions(paragraphs, file_path):
+        yield _science_record(q, file_path)
+
+@profiled("science", lambda docx_path: docx_path)
 def parse_science(docx_path: str) -> List[Dict[str, Any]]:
-    """主要的自然科解析函數 - 兼容舊版本調用"""
+    """主要的自然科解析函數 - 兼容舊版本調用，回傳一般 dict"""
     try:
         questions = parse_science_questions(docx_path)
         
-        # 使用新的 standard_question_dict 格式化輸出
-        formatted_questions = []
-        for q in questions:
-            formatted_q = standard_question_dict(
-                question_text=q["question_text"],
-                options=q["options"] if q["options"] else {},
-                answer=q["answer"] if q["answer"] else "",
-                file_path=docx_path,
-                image_path=q.get("image_path")
-            )
-            
-            formatted_questions.append(formatted_q)
-        
-        return formatted_questions
+        # 與舊版相同回傳 dict；串流與整批輸出使用 iter_science 的 QuestionRecord
+        return question_dicts(_science_record(q, docx_path) for q in questions)
         
     except Exception as e:
         print(f"解析自然科檔案時發生錯誤: {e}")
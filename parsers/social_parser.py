@@ -29,33 +29,28 @@ from __future__ import annotations
 import re
 import json
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
-from docx import Document
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
 from utils.image_naming import generate_image_path_for_parser
+from .base_parser import QuestionRecord, question_dicts, question_record
+from .docx_reader import iter_docx_paragraphs
+from .jsonl_io import jsonl_path_for, write_jsonl
+from .exam_lexer import GROUP_INTRO, OPTION_LETTERS, SECTION_HEADER, Token, TokenStream, option_items
+from .normalize import FoldedText, fold_width
+from .profiling import profiled
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Regex
 # ────────────────────────────────────────────────────────────────────────────────
-# 單選題格式：(　A　) 1.　題目內容
-QUESTION_RE = re.compile(r"^[（(][\s　]*([Ａ-ＤABCD])[\s　]*[）)]\s*(\d+)[\.\s　]*(.*)")
-# 題組格式：(　B　)(１) 題目內容 
-GROUP_QUESTION_RE = re.compile(r"^[（(][\s　]*([Ａ-ＤABCD])[\s　]*[）)]\s*[（(]([１２３４５６７８９０\d]+)[）)]\s*(.*)")
-# 題組引導：⊙ ...請問：
-GROUP_INTRO_RE = re.compile(r"^[⊙○●]\s*(.*?)\s*請問[:：]?\s*$")
-OPTION_INLINE_RE = re.compile(r"[（(]([Ａ-ＤABCD])[）)]\s*([^（()]+)")
-OPTION_SINGLE_RE = re.compile(r"^[（(]([Ａ-ＤABCD])[）)]\s*(.+)")
+# 題目、選項的判斷改由 exam_lexer 的 Token 欄位處理，這裡只保留區塊標題與題組引導
 SECTION_CHOICE = re.compile(r"^\*\*[一二三四五六七八九十]、.*[單选選擇]題")
 SECTION_GROUP = re.compile(r"^\*\*[一二三四五六七八九十]、.*題組")
 SECTION_END = re.compile(r"^[一二三四五六七八九十]、.*")
-# 修正：只匹配真正的題目行（有題號），不匹配選項行
-QUESTION_START = re.compile(r"^[（(][\s　]*[Ａ-ＤABCD][\s　]*[）)]\s*\d+[\.\s　]")
 
-FW_MAP = str.maketrans("ＡＢＣＤ", "ABCD")
-IDEOSP = "　"
-BLANK_RE = re.compile(rf"[{IDEOSP} \t]{{2,}}")
+PARSER_VERSION = "1"
+BLANK_RE = re.compile(r"[ \t]{2,}")  # 在半形版本上比對，全形空白已轉成半形
 SKIP_KEYWORDS = ("圖", "表", "附圖", "附表")
 IMAGE_KEYWORDS = ("圖", "附圖", "如圖")
 
@@ -64,7 +59,7 @@ IMAGE_KEYWORDS = ("圖", "附圖", "如圖")
 # ────────────────────────────────────────────────────────────────────────────────
 
 def _normalize(text: str) -> str:
-    return BLANK_RE.sub("____", text.rstrip())
+    return FoldedText.of(text.rstrip()).sub(BLANK_RE, "____")
 
 def _clean_question_text(text: str) -> str:
     """清理題目文本，移除分數信息和其他不必要的內容"""
@@ -79,29 +74,74 @@ def _clean_question_text(text: str) -> str:
     
     return text.strip()
 
+def _group_intro(line: str) -> Optional[str]:
+    """題組引導：⊙ ...請問：，回傳引導文字
+
+    與 `^[⊙○●]\\s*(.*?)\\s*請問[:：]?\\s*$` 相同，改用字串操作，過長的行不會讓 regex 回溯。
+    """
+    if not line or line[0] not in "⊙○●":
+        return None
+    body = line.rstrip()
+    if body.endswith((":", "：")):
+        body = body[:-1]
+    if not body.endswith("請問"):
+        return None
+    intro = body[1:-2].strip()
+    return None if "\n" in intro else intro
+
 def _needs_image(text: str) -> bool:
     return any(k in text for k in IMAGE_KEYWORDS)
 
-def _extract_inline_options(text: str, opts: Dict[str, str]):
-    for m in OPTION_INLINE_RE.finditer(text):
-        opts[m.group(1).translate(FW_MAP)] = m.group(2).strip()
-
-
-def _collect_options(paragraphs, idx: int) -> tuple[Dict[str, str], int]:
+def _question_rest(token: Token) -> Optional[str]:
+    """單選題格式：(　A　) 1.　題目內容，回傳題號之後的文字"""
+    if not (token.letter and token.letter in OPTION_LETTERS and token.number is not None):
+        return None
+    rest = token.after_number
+    start = 0
+    while start < len(rest) and (rest[start] == "." or rest[start].isspace()):
+        start += 1
+    return rest[start:]
+
+def _group_question_rest(token: Token) -> Optional[str]:
+    """題組格式：(　B　)(１) 題目內容，回傳小題號之後的文字"""
+    if token.letter and token.letter in OPTION_LETTERS and token.sub_number is not None:
+        return token.rest
+    return None
+
+def _is_question_start(token: Token) -> bool:
+    # 只匹配真正的題目行（有題號），不匹配選項行；縮排的行不算
+    if token.indented or not (token.letter and token.letter in OPTION_LETTERS) or token.number is None:
+        return False
+    next_char = token.after_number[:1]
+    return next_char == "." or next_char.isspace()
+
+def _question_text(token: Token, rest: str) -> str:
+    """去掉行內選項，只保留題目部分"""
+    offset = len(token.text) - len(rest)
+    for item in option_items(token.text, token.markers):
+        if item.start >= offset:
+            return token.text[offset:item.start]
+    return rest
+
+def _extract_inline_options(token: Token, opts: Dict[str, str]):
+    for item in option_items(token.text, token.markers):
+        opts[item.letter] = item.content.replace("\t", " ")
+
+
+def _collect_options(tokens: TokenStream, idx: int) -> tuple[Dict[str, str], int]:
     opts: Dict[str, str] = {}
-    i, n = idx, len(paragraphs)
+    i = idx
     first = True
-    while i < n and len(opts) < 4:
-        line = paragraphs[i].text.replace("\t", " ").rstrip()
-        if not first and QUESTION_START.match(line):
+    while len(opts) < 4 and tokens.has(i):
+        token = tokens[i]
+        if not first and _is_question_start(token):
             break
         first = False
-        _extract_inline_options(line, opts)
-        m_single = OPTION_SINGLE_RE.match(line.strip())
-        if m_single:
-            letter = m_single.group(1).translate(FW_MAP)
-            if letter not in opts:
-                opts[letter] = m_single.group(2).strip()
+        _extract_inline_options(token, opts)
+        if token.markers and token.markers[0][:2] == (0, 3) and len(token.text) > 3:
+            letter = fold_width(token.markers[0][2])
+            if letter in "ABCD" and letter not in opts:
+                opts[letter] = token.text[3:].strip().replace("\t", " ")
         i += 1
     return opts, i
 
@@ -109,58 +149,61 @@ def _collect_options(paragraphs, idx: int) -> tuple[Dict[str, str], int]:
 # Core parser
 # ────────────────────────────────────────────────────────────────────────────────
 
-def parse_social(paragraphs, file_path: str = "") -> List[dict]:
-    """解析社會科考卷：歷史、地理、公民"""
-    from .base_parser import standard_question_dict
-    
-    res: List[dict] = []
+@profiled("social", lambda paragraphs, file_path="": file_path)
+def parse_social(paragraphs, file_path: str = "") -> List[Dict[str, Any]]:
+    """解析社會科考卷：歷史、地理、公民；回傳一般 dict，串流與整批輸出請用 iter_social"""
+    return question_dicts(iter_social(paragraphs, file_path))
+
+def iter_social(paragraphs: Iterable, file_path: str = "") -> Iterator[QuestionRecord]:
+    """串流解析社會科考卷：paragraphs 可為任何行的 iterator，每解析完一題就 yield"""
     current_section = None
-    i, n = 0, len(paragraphs)
+    tokens = TokenStream(paragraphs)
+    i = 0
     img_idx = 0
     current_group_intro = None
     group_id = 0
 
-    while i < n:
-        line_raw = paragraphs[i].text.rstrip() if hasattr(paragraphs[i], 'text') else str(paragraphs[i]).rstrip()
-        line = line_raw.strip()
+    while tokens.has(i):
+        tokens.release(i)
+        token = tokens[i]
+        line = token.text
 
         # 檢查章節標題
-        if SECTION_CHOICE.match(line):
-            current_section = "choice"
-            current_group_intro = None
-            i += 1
-            continue
-        elif SECTION_GROUP.match(line):
-            current_section = "group"
-            current_group_intro = None
-            i += 1
-            continue
-        elif current_section and SECTION_END.match(line) and not (SECTION_CHOICE.match(line) or SECTION_GROUP.match(line)):
-            current_section = None
-            i += 1
-            continue
+        if token.kind == SECTION_HEADER:
+            if SECTION_CHOICE.match(line):
+                current_section = "choice"
+                current_group_intro = None
+                i += 1
+                continue
+            elif SECTION_GROUP.match(line):
+                current_section = "group"
+                current_group_intro = None
+                i += 1
+                continue
+            elif current_section and SECTION_END.match(line):
+                current_section = None
+                i += 1
+                continue
             
         if not current_section:
             i += 1
             continue
 
         # 檢查題組引導
-        group_intro_match = GROUP_INTRO_RE.match(line)
-        if group_intro_match and current_section == "group":
-            current_group_intro = group_intro_match.group(1).strip()
+        group_intro = _group_intro(line) if token.kind == GROUP_INTRO else None
+        if group_intro is not None and current_section == "group":
+            current_group_intro = group_intro
             group_id += 1
             i += 1
             continue
 
         # 處理單選題：(　A　) 1. 題目內容
-        question_match = QUESTION_RE.match(line)
-        if question_match:
-            ans_raw, _num, rest = question_match.groups()
-            answer = ans_raw.translate(FW_MAP).upper()
+        rest = _question_rest(token)
+        if rest is not None:
+            answer = token.answer
             
             # 清理題目文字，移除選項部分
-            first_opt = OPTION_INLINE_RE.search(rest)
-            q_text_part = rest[:first_opt.start()] if first_opt else rest
+            q_text_part = _question_text(token, rest)
             question_str = _clean_question_text(_normalize(q_text_part))
 
             # 跳過含圖表的題目
@@ -168,7 +211,7 @@ def parse_social(paragraphs, file_path: str = "") -> List[dict]:
                 i += 1
                 continue
 
-            opts, new_i = _collect_options(paragraphs, i)
+            opts, new_i = _collect_options(tokens, i)
             # 跳過選項不完整的題目
             if len(opts) != 4 or any(not v.strip() for v in opts.values()):
                 i = new_i
@@ -182,26 +225,24 @@ def parse_social(paragraphs, file_path: str = "") -> List[dict]:
                 img_name = None
 
             # 使用新的標準格式
-            formatted_q = standard_question_dict(
+            formatted_q = question_record(
                 question_text=question_str,
                 options={k: opts[k] for k in sorted(opts)},
                 answer=answer,
                 file_path=file_path,
                 image_path=img_name
             )
-            res.append(formatted_q)
+            yield formatted_q
             i = new_i
             continue
 
         # 處理題組題：(　B　)(１) 題目內容
-        group_question_match = GROUP_QUESTION_RE.match(line)
-        if group_question_match and current_section == "group":
-            ans_raw, sub_num, rest = group_question_match.groups()
-            answer = ans_raw.translate(FW_MAP).upper()
+        rest = _group_question_rest(token)
+        if rest is not None and current_section == "group":
+            answer = token.answer
             
             # 清理題目文字，移除選項部分
-            first_opt = OPTION_INLINE_RE.search(rest)
-            q_text_part = rest[:first_opt.start()] if first_opt else rest
+            q_text_part = _question_text(token, rest)
             question_str = _clean_question_text(_normalize(q_text_part))
 
             # 跳過含圖表的題目
@@ -209,7 +250,7 @@ def parse_social(paragraphs, file_path: str = "") -> List[dict]:
                 i += 1
                 continue
 
-            opts, new_i = _collect_options(paragraphs, i)
+            opts, new_i = _collect_options(tokens, i)
             # 跳過選項不完整的題目
             if len(opts) != 4 or any(not v.strip() for v in opts.values()):
                 i = new_i
@@ -223,38 +264,47 @@ def parse_social(paragraphs, file_path: str = "") -> List[dict]:
                 img_name = None
 
             # 使用新的標準格式
-            formatted_q = standard_question_dict(
+            formatted_q = question_record(
                 question_text=question_str,
                 options={k: opts[k] for k in sorted(opts)},
                 answer=answer,
                 file_path=file_path,
                 image_path=img_name
             )
-            res.append(formatted_q)
+            yield formatted_q
             i = new_i
             continue
 
         i += 1
 
-    return res
-
 # ────────────────────────────────────────────────────────────────────────────────
 # Interface
 # ────────────────────────────────────────────────────────────────────────────────
 
 def convert_to_json(docx_path: str, out_path: Optional[str] = None):
-    doc = Document(docx_path)
-    data = parse_social(doc.paragraphs, docx_path)
+    data = parse_social(iter_docx_paragraphs(docx_path), docx_path)
     out_path = out_path or str(Path(docx_path).with_suffix(".json"))
     with open(out_path, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
     return out_path
 
+def convert_to_jsonl(docx_path: str, out_path: Optional[str] = None, compress: bool = False):
+    """串流輸出 JSONL：parser 每解析完一題就寫入一行"""
+    out_path = out_path or jsonl_path_for(docx_path, compress)
+    count = write_jsonl(iter_social(iter_docx_paragraphs(docx_path), docx_path), out_path, compress or None)
+    return out_path, count
+
 if __name__ == "__main__":
     import argparse
     ap = argparse.ArgumentParser(description="Convert Social Studies exam .docx to JSON—文字單選題")
     ap.add_argument("docx", help="input .docx")
-    ap.add_argument("json", nargs="?", help="output .json (optional)")
+    ap.add_argument("json", nargs="?", help="output .json / .jsonl (optional)")
+    ap.add_argument("--jsonl", action="store_true", help="每行一題輸出 JSONL（串流寫入）")
+    ap.add_argument("--gzip", action="store_true", help="JSONL 以 gzip 壓縮")
     args = ap.parse_args()
-    path = convert_to_json(args.docx, args.json)
-    print(f"✅ {args.docx} → {path}")
\ No newline at end of file
+    if args.jsonl or args.gzip:
+        path, count = convert_to_jsonl(args.docx, args.json, args.gzip)
+        print(f"✅ {args.docx} → {path}（{count} 題）")
+    else:
+        path = convert_to_json(args.docx, args.json)
+        print(f"✅ {args.docx} → {path}")
\ No newline at end of file
@@ -0,0 +1,180 @@
+import json
+import tempfile
+import unittest
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import List, Optional
+
+from parsers.blocks import (FIGURE, FORMULA, TABLE, TEXT, TITLE, Block, BlockWriter, blocks_path_for, find_blocks,
+                            iter_block_paragraphs, iter_blocks)
+from parsers.exam_lexer import BLANK, IMAGE_REF, OPTIONS, SECTION_HEADER, TokenStream, tokenize
+from parsers.exam_lexer import FORMULA as FORMULA_TOKEN, TABLE as TABLE_TOKEN
+
+try:
+    from parsers.math_parser import iter_math_md
+except ImportError:  # utils.image_naming 等相依套件未安裝
+    iter_math_md = None
+
+
+# 與 pdf_craft 區塊同名、同屬性的替身，BlockWriter 只依類別名稱與屬性讀取
+class TextKind(Enum):
+    TITLE = 0
+    PLAIN_TEXT = 1
+    ABANDON = 2
+
+
+class TableFormat(Enum):
+    MARKDOWN = 2
+    UNRECOGNIZABLE = 4
+
+
+@dataclass
+class Rectangle:
+    lt: tuple
+    rt: tuple
+    lb: tuple
+    rb: tuple
+
+
+@dataclass
+class Text:
+    content: str
+
+
+def _rect(left, top, right, bottom):
+    return Rectangle((left, top), (right, top), (left, bottom), (right, bottom))
+
+
+@dataclass
+class TextBlock:
+    kind: TextKind
+    texts: List[Text]
+    rect: Optional[Rectangle] = None
+    has_paragraph_indentation: bool = False
+    last_line_touch_end: bool = False
+
+
+@dataclass
+class TableBlock:
+    content: str
+    format: TableFormat = TableFormat.MARKDOWN
+    texts: List[Text] = field(default_factory=list)
+    rect: Optional[Rectangle] = None
+
+
+@dataclass
+class FormulaBlock:
+    content: Optional[str]
+    texts: List[Text] = field(default_factory=list)
+    rect: Optional[Rectangle] = None
+
+
+@dataclass
+class FigureBlock:
+    texts: List[Text] = field(default_factory=list)
+    rect: Optional[Rectangle] = None
+
+
+def _text(*lines, **kwargs):
+    return TextBlock(TextKind.PLAIN_TEXT, [Text(line) for line in lines], **kwargs)
+
+
+class TestBlockWriter(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.path = Path(temp_dir.name) / "exam.blocks.jsonl"
+
+    def write(self, pages):
+        with BlockWriter(self.path) as writer:
+            for page, blocks in enumerate(pages):
+                for block in blocks:
+                    writer.write(block, page)
+        return list(iter_blocks(self.path))
+
+    def test_kinds_pages_and_bbox(self):
+        blocks = self.write([
+            [TextBlock(TextKind.TITLE, [Text("一、單選題")], _rect(10, 20, 200, 40)),
+             TextBlock(TextKind.ABANDON, [Text("第 1 頁")])],
+            [TableBlock("|(A) 1|(B) 2|", rect=_rect(0, 0, 50, 10)),
+             TableBlock("", TableFormat.UNRECOGNIZABLE),
+             FormulaBlock("x^2"), FormulaBlock(None),
+             FigureBlock([Text("附圖")])],
+        ])
+        self.assertEqual([(b.kind, b.page) for b in blocks],
+                         [(TITLE, 0), (TABLE, 1), (TABLE, 1), (FORMULA, 1), (FORMULA, 1), (FIGURE, 1)])
+        self.assertEqual(blocks[0].bbox, (10.0, 20.0, 200.0, 40.0))
+        self.assertEqual([b.text for b in blocks[1:]],
+                         ["|(A) 1|(B) 2|", "![]()", "$$ x^2 $$", "![]()", "![附圖]()"])
+
+    def test_paragraphs_merge_like_markdown_writer(self):
+        blocks = self.write([[
+            _text("( A )1. 下列何者", " 正確？\n", rect=_rect(0, 0, 100, 10), last_line_touch_end=True),
+            _text("(A) 1 (B) 2", rect=_rect(0, 10, 120, 20)),
+            _text("(C) 3 (D) 4", last_line_touch_end=True),
+            _text("2. 新段落", has_paragraph_indentation=True),
+        ]])
+        self.assertEqual([b.content for b in blocks],
+                         ["( A )1. 下列何者正確？(A) 1 (B) 2", "(C) 3 (D) 4", "2. 新段落"])
+        self.assertEqual(blocks[0].bbox, (0.0, 0.0, 120.0, 20.0))
+        self.assertEqual({b.kind for b in blocks}, {TEXT})
+
+    def test_find_blocks_ignores_stale_sidecar(self):
+        md_path = self.path.with_name("exam.md")
+        self.assertEqual(blocks_path_for(md_path), self.path)
+        md_path.write_text("# exam\n", encoding="utf-8")
+        self.assertIsNone(find_blocks(md_path))
+        self.write([[_text("1. 題目")]])
+        self.assertEqual(find_blocks(md_path), self.path)
+
+
+class TestBlockTokens(unittest.TestCase):
+    def test_typed_blocks_skip_line_classification(self):
+        tokens = tokenize([
+            Block(TITLE, "一、單選題"),
+            Block(TABLE, "|(A) 甲|(B) 乙|", format="markdown"),
+            Block(FORMULA, "\\frac{1}{2}"),
+            Block(FIGURE, ""),
+            Block(TABLE, "", format="markdown"),
+            "(A) 甲 (B) 乙",
+        ])
+        self.assertEqual([t.kind for t in tokens],
+                         [SECTION_HEADER, TABLE_TOKEN, FORMULA_TOKEN, IMAGE_REF, BLANK, OPTIONS])
+        self.assertEqual([letter for _, _, letter in tokens[1].markers], ["A", "B"])
+        self.assertEqual(tokens[2].markers, ())
+
+    def test_token_stream_accepts_blocks(self):
+        tokens = TokenStream(iter([Block(TEXT, "  1. 題目  ")]))
+        self.assertEqual((tokens[0].raw, tokens[0].text, tokens[0].number), ("  1. 題目", "1. 題目", "1"))
+
+
+@unittest.skipIf(iter_math_md is None, "parsers 相依套件未安裝")
+class TestMathBlocks(unittest.TestCase):
+    def test_blocks_parse_like_markdown(self):
+        blocks = [
+            Block(TITLE, "一、單選題"),
+            Block(TEXT, "( B )1. 下列哪一個數是負數？"),
+            Block(TEXT, "(A) 正三 (B) 負二 (C) 零點 (D) 正五"),
+            Block(FIGURE, ""),
+            Block(TABLE, "| x | y |", format="markdown"),
+            Block(TEXT, "( C )2. 計算 2+3 的值為何？"),
+            Block(FORMULA, "2+3"),
+            Block(TEXT, "(A) 一個 (B) 四個 (C) 五個 (D) 六個"),
+        ]
+        # MarkDownWriter 的版面：標題加 "# "、段落之間空一行
+        markdown = ["# 一、單選題", "", "( B )1. 下列哪一個數是負數？", "", "(A) 正三 (B) 負二 (C) 零點 (D) 正五", "",
+                    "![]()", "", "| x | y |", "", "( C )2. 計算 2+3 的值為何？", "", "$$ 2+3 $$", "",
+                    "(A) 一個 (B) 四個 (C) 五個 (D) 六個"]
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        path = Path(temp_dir.name) / "exam.blocks.jsonl"
+        path.write_text("".join(json.dumps(block.to_dict()) + "\n" for block in blocks), encoding="utf-8")
+        from_blocks = list(iter_math_md(iter_block_paragraphs(path)))
+        self.assertEqual([q["answer"] for q in from_blocks], ["B", "C"])
+        self.assertEqual(from_blocks[0]["image_path"], "img_001.png")
+        self.assertEqual(from_blocks, list(iter_math_md(markdown)))
+
+
+if __name__ == "__main__":
+    unittest.main()
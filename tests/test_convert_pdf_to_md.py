@@ -0,0 +1,82 @@
+import gc
+import multiprocessing as mp
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+try:
+    import convert_pdf_to_md
+    skip_convert_tests = False
+except ImportError:
+    skip_convert_tests = True
+skip_convert_message = "Skipping convert_pdf_to_md tests as pdf_craft or the OCR models are not installed."
+
+
+class _StubDocExtractor:
+    """取代 ExamDocExtractor：不載入模型，也不統計"""
+
+    reading_order_cache = None
+    ocr_routing_stats = None
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def load_models(self):
+        pass
+
+    def set_multilingual_ocr(self, enabled):
+        pass
+
+
+class _StubPageExtractor:
+    """取代 PDFPageExtractor：每個 PDF 都沒有區塊"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def extract_enumerated_blocks_and_image(self, pdf_path):
+        return iter(())
+
+
+def _failing_convert(task):
+    raise RuntimeError(f"轉換失敗: {task[0]}")
+
+
+@unittest.skipIf(skip_convert_tests, skip_convert_message)
+@unittest.skipIf("fork" not in mp.get_all_start_methods(), "Skipping multi-worker test as fork is not available.")
+class TestBatchConvertWorkers(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.temp_dir = Path(directory.name)
+        for name in ("a/one.pdf", "a/two.pdf", "b/three.pdf"):
+            path = self.temp_dir / "pdf" / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(b"%PDF-1.4\n")
+        for name, stub in (("ExamDocExtractor", _StubDocExtractor), ("PDFPageExtractor", _StubPageExtractor)):
+            patcher = mock.patch.object(convert_pdf_to_md, name, stub)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_two_workers_convert_every_pdf_and_unfreeze_gc(self):
+        convert_pdf_to_md.batch_convert_all_pdfs(
+            self.temp_dir / "pdf", self.temp_dir / "md", self.temp_dir / "images", None, "cpu", "utf-8",
+            False, None, workers=2,
+        )
+        outputs = sorted(path.relative_to(self.temp_dir / "md").as_posix() for path in (self.temp_dir / "md").rglob("*.md"))
+        self.assertEqual(outputs, ["a/one.md", "a/two.md", "b/three.md"])
+        self.assertEqual(gc.get_freeze_count(), 0)
+
+    def test_gc_unfrozen_when_pool_fails(self):
+        with mock.patch.object(convert_pdf_to_md, "_convert_in_worker", _failing_convert):
+            with self.assertRaises(RuntimeError):
+                convert_pdf_to_md.batch_convert_all_pdfs(
+                    self.temp_dir / "pdf", self.temp_dir / "md", self.temp_dir / "images", None, "cpu", "utf-8",
+                    False, None, workers=2,
+                )
+        self.assertEqual(gc.get_freeze_count(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
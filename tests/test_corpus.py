@@ -0,0 +1,159 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from parsers.blocks import blocks_path_for
+from parsers.corpus import build_corpus, find_corpus_files, parser_for
+from parsers.jsonl_io import iter_jsonl
+from parsers.profiling import active_profiler, disable_profiling, enable_profiling
+
+try:
+    import parsers.math_parser  # noqa: F401
+except ImportError:  # utils.image_naming 等相依套件未安裝
+    MATH_AVAILABLE = False
+else:
+    MATH_AVAILABLE = True
+
+MATH_EXAM = "一、單選題\n( B )1. 下列何者為質數？\n(A) 四十 (B) 五十三 (C) 六十\n( C )2. 何者最大？\n(A) 一一 (B) 二二 (C) 三三\n"
+
+# 各科資料夾 -> (標題, 段落)，用來比較讀 Markdown 與讀區塊檔的結果
+BLOCK_EXAMS = {
+    "Math": ("一、單選題", ["( B )1. 下列何者為質數？", "(A) 四十 (B) 五十三 (C) 六十", "( C )2. 何者最大？", "(A) 一一 (B) 二二 (C) 三三"]),
+    "Chinese": ("一、選擇題", ["( Ａ )1. 下列何者正確？", "(A)甲 (B)乙 (C)丙 (D)丁", "( Ｂ )2. 下列何者錯誤？", "(A)子 (B)丑 (C)寅 (D)卯"]),
+    "English": ("**一、字彙選擇：每題2分**", ["( A )1. He ___ home. (A) went (B) go (C) goes (D) going"]),
+    "History": ("一、選擇題", ["( Ａ )1. 下列何者正確？", "(A)甲甲 (B)乙乙 (C)丙丙 (D)丁丁"]),
+    "Physics_and_Chemistry": ("一、基礎選擇題", ["( Ｂ )1. 水的化學式為何？ (A)CO2 (B)H2O (C)O2 (D)N2"]),
+}
+
+
+class TestCorpus(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name) / "input_md"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, relative: str, content: str = "") -> Path:
+        path = self.root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+        return path
+
+    def test_parser_for_subject_folder(self):
+        self.assertEqual(parser_for("input_md/111A/7/Hanlin/Math/L1.md"), "math")
+        self.assertEqual(parser_for("input_md/111A/8/Knsh/History/L3.docx"), "social")
+        self.assertEqual(parser_for("input_md/111A/8/Knsh/Biology/L3.docx"), "science")
+        self.assertIsNone(parser_for("input_md/111A/8/Knsh/Art/L3.md"))
+
+    def test_find_corpus_files(self):
+        self._write("111A/7/Hanlin/Math/b.md")
+        self._write("111A/7/Hanlin/Math/a.md")
+        self._write("111A/7/Hanlin/Math/~$a.docx")
+        self._write("111A/7/Hanlin/Math/notes.txt")
+        self.assertEqual([p.name for p in find_corpus_files(self.root)], ["a.md", "b.md"])
+
+    def test_unknown_subject_is_skipped(self):
+        self._write("111A/7/Hanlin/Art/a.md", "一、單選題\n")
+        out_path = self.root.parent / "bank.jsonl"
+        report = build_corpus(find_corpus_files(self.root), out_path)
+        self.assertEqual(len(report.skipped), 1)
+        self.assertEqual(report.questions, 0)
+        self.assertEqual(out_path.read_text(encoding="utf-8"), "")
+
+    @unittest.skipIf(not MATH_AVAILABLE, "parsers 相依套件未安裝")
+    def test_parallel_output_keeps_file_order(self):
+        for name in ("L1", "L2", "L3"):
+            self._write(f"111A/7/Hanlin/Math/{name}.md", MATH_EXAM)
+        files = find_corpus_files(self.root)
+        serial = build_corpus(files, self.root.parent / "serial.jsonl")
+        parallel = build_corpus(files, self.root.parent / "parallel.jsonl.gz", workers=2, chunksize=1)
+        self.assertEqual(serial.parsers["math"].files, 3)
+        self.assertEqual(parallel.questions, 6)
+        self.assertEqual(list(iter_jsonl(self.root.parent / "serial.jsonl")),
+                         list(iter_jsonl(self.root.parent / "parallel.jsonl.gz")))
+
+    @unittest.skipIf(not MATH_AVAILABLE, "parsers 相依套件未安裝")
+    def test_index_skips_duplicates(self):
+        for name in ("L1", "L2"):
+            self._write(f"111A/7/Hanlin/Math/{name}.md", MATH_EXAM)
+        index_path = self.root.parent / "index.sqlite"
+        files = find_corpus_files(self.root)
+        report = build_corpus(files, self.root.parent / "bank.jsonl", workers=2,
+                              chunksize=1, index_path=index_path)
+        self.assertEqual(report.questions, 2)
+        self.assertEqual(report.parsers["math"].duplicates, 2)
+
+        # 同一個索引再跑一次：題目原本就由 L1 登記，題庫內容不變
+        rerun = build_corpus(files, self.root.parent / "rerun.jsonl", index_path=index_path)
+        self.assertEqual((rerun.questions, rerun.parsers["math"].duplicates), (2, 2))
+        self.assertEqual(list(iter_jsonl(self.root.parent / "rerun.jsonl")),
+                         list(iter_jsonl(self.root.parent / "bank.jsonl")))
+
+    @unittest.skipIf(not MATH_AVAILABLE, "parsers 相依套件未安裝")
+    def test_cache_reuses_unchanged_files(self):
+        for name in ("L1", "L2"):
+            self._write(f"111A/7/Hanlin/Math/{name}.md", MATH_EXAM)
+        files = find_corpus_files(self.root)
+        cache_dir = self.root.parent / "cache"
+        first = build_corpus(files, self.root.parent / "first.jsonl", cache_dir=cache_dir)
+        self._write("111A/7/Hanlin/Math/L2.md", MATH_EXAM.replace("( C )", "( A )"))
+        second = build_corpus(files, self.root.parent / "second.jsonl", cache_dir=cache_dir)
+        self.assertEqual(first.parsers["math"].cached, 0)
+        self.assertEqual(second.parsers["math"].cached, 1)
+        self.assertEqual([q["answer"] for q in iter_jsonl(self.root.parent / "second.jsonl")], ["B", "C", "B", "A"])
+
+    @unittest.skipIf(not MATH_AVAILABLE, "parsers 相依套件未安裝")
+    def test_cache_key_follows_blocks_sidecar(self):
+        path = self._write("111A/7/Hanlin/Math/L1.md", MATH_EXAM)
+
+        def write_blocks(exam):
+            records = [{"kind": "text", "content": line} for line in exam.splitlines()]
+            self._write(blocks_path_for(path).relative_to(self.root), "".join(json.dumps(r) + "\n" for r in records))
+
+        files = find_corpus_files(self.root)
+        cache_dir = self.root.parent / "cache"
+        write_blocks(MATH_EXAM)
+        build_corpus(files, self.root.parent / "first.jsonl", cache_dir=cache_dir)
+        # .md 不變、區塊檔重新產生：parser 讀的是區塊檔，不能讀回舊結果
+        write_blocks(MATH_EXAM.replace("( C )", "( A )"))
+        second = build_corpus(files, self.root.parent / "second.jsonl", cache_dir=cache_dir)
+        self.assertEqual(second.parsers["math"].cached, 0)
+        self.assertEqual([q["answer"] for q in iter_jsonl(self.root.parent / "second.jsonl")], ["B", "A"])
+
+
+    @unittest.skipIf(not MATH_AVAILABLE, "parsers 相依套件未安裝")
+    def test_profile_records_come_back_from_workers(self):
+        previous = active_profiler()
+        self.addCleanup(lambda: enable_profiling(previous) if previous else disable_profiling())
+        disable_profiling()
+        for name in ("L1", "L2"):
+            self._write(f"111A/7/Hanlin/Math/{name}.md", MATH_EXAM)
+        files = find_corpus_files(self.root)
+        build_corpus(files, self.root.parent / "bank.jsonl", workers=2, chunksize=1, profile=True)
+        records = active_profiler().records
+        self.assertEqual([(record.label, record.source) for record in records], [("math", str(path)) for path in files])
+        self.assertTrue(files[0].with_name("L1.math.profile.txt").exists())
+
+
+    @unittest.skipIf(not MATH_AVAILABLE, "parsers 相依套件未安裝")
+    def test_blocks_sidecar_matches_markdown_for_every_parser(self):
+        for subject, (title, paragraphs) in BLOCK_EXAMS.items():
+            with self.subTest(subject):
+                # MarkDownWriter 的版面：標題加 "# "、段落之間空一行
+                path = self._write(f"111A/7/Hanlin/{subject}/L1.md", "\n\n".join([f"# {title}"] + paragraphs) + "\n")
+                files = [path]
+                from_markdown = self.root.parent / f"{subject}.md.jsonl"
+                from_blocks = self.root.parent / f"{subject}.blocks.jsonl"
+                build_corpus(files, from_markdown)
+                records = [{"kind": "title", "content": title}] + [{"kind": "text", "content": p} for p in paragraphs]
+                self._write(blocks_path_for(path).relative_to(self.root), "".join(json.dumps(r) + "\n" for r in records))
+                build_corpus(files, from_blocks)
+                self.assertEqual(list(iter_jsonl(from_blocks)), list(iter_jsonl(from_markdown)))
+                if subject == "Math":
+                    self.assertEqual([q["answer"] for q in iter_jsonl(from_blocks)], ["B", "C"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+
+try:
+    import numpy as np
+    import cv2
+    from doc_page_extractor.onnxocr.db_postprocess import DBPostProcess
+    from extractor.db_postprocess import VectorizedDBPostProcess, order_mini_boxes, rect_corners
+except ImportError:  # numpy、doc_page_extractor 或 cv2 未安裝
+    DBPostProcess = None
+
+
+def _exam_map(seed: int = 0, rotated: bool = False) -> "np.ndarray":
+    rng = np.random.default_rng(seed)
+    pred = np.zeros((640, 480), dtype=np.float32)
+    for i in range(30):
+        y = 10 + i * 20
+        x = int(rng.integers(5, 200))
+        w = int(rng.integers(40, 470 - x))
+        h = int(rng.integers(6, 12))
+        value = float(rng.uniform(0.55, 0.95))
+        if rotated and i % 3 == 0:
+            rect = ((x + w / 2, y + h / 2), (float(w), float(h)), float(rng.uniform(-4, 4)))
+            cv2.fillPoly(pred, [cv2.boxPoints(rect).astype(np.int32)], value)
+        else:
+            pred[y:y + h, x:x + w] = value
+    pred += rng.uniform(0, 0.1, pred.shape).astype(np.float32) * (pred > 0)
+    return pred
+
+
+@unittest.skipIf(DBPostProcess is None, "numpy / doc_page_extractor 未安裝")
+class TestVectorizedDBPostProcess(unittest.TestCase):
+    def setUp(self):
+        params = dict(thresh=0.3, box_thresh=0.6, max_candidates=1000, unclip_ratio=1.5)
+        self.original = DBPostProcess(**params)
+        self.vectorized = VectorizedDBPostProcess(**params)
+
+    def test_corner_order_matches_get_mini_boxes(self):
+        rng = np.random.default_rng(1)
+        rects = [((float(rng.uniform(50, 400)), float(rng.uniform(50, 400))),
+                  (float(rng.uniform(5, 200)), float(rng.uniform(5, 30))),
+                  float(rng.choice([90.0, 45.5, 88.0, 2.0]))) for _ in range(50)]
+        expected = np.array([self.original.get_mini_boxes(cv2.boxPoints(rect))[0] for rect in rects])
+        array = np.array([(cx, cy, w, h, a) for (cx, cy), (w, h), a in rects], dtype=np.float32)
+        np.testing.assert_allclose(order_mini_boxes(rect_corners(array)), expected, atol=1e-3)
+
+    def test_scores_match_box_score_fast(self):
+        pred = _exam_map(rotated=True)
+        contours, _ = cv2.findContours((pred > 0.3).astype(np.uint8) * 255, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+        boxes = order_mini_boxes(np.array([cv2.boxPoints(cv2.minAreaRect(c)) for c in contours]))
+        expected = [self.original.box_score_fast(pred, box) for box in boxes]
+        np.testing.assert_allclose(self.vectorized.box_scores(pred, boxes), expected, atol=1e-9)
+
+    def test_boxes_match_original(self):
+        for rotated in (False, True):
+            pred = _exam_map(seed=2, rotated=rotated)
+            outs = {"maps": pred[np.newaxis, np.newaxis]}
+            shape_list = np.array([[1280, 960, 0.5, 0.5]])
+            expected = self.original(outs, shape_list)[0]["points"]
+            boxes = self.vectorized(outs, shape_list)[0]["points"]
+            self.assertEqual(boxes.shape, expected.shape)
+            self.assertEqual(boxes.dtype, np.int32)
+            # 外擴以解析解取代 pyclipper 的整數運算，放大兩倍後最多差幾個像素
+            self.assertLessEqual(np.abs(boxes - expected).max(), 4)
+
+    def test_empty_map(self):
+        outs = {"maps": np.zeros((1, 1, 64, 64), dtype=np.float32)}
+        boxes = self.vectorized(outs, np.array([[64, 64, 1.0, 1.0]]))[0]["points"]
+        self.assertEqual(len(boxes), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from parsers.docx_reader import iter_docx_paragraphs, read_docx_paragraphs
+
+try:
+    from docx import Document
+    from docx.enum.text import WD_BREAK
+    from docx.oxml import OxmlElement
+except ImportError:  # python-docx 未安裝
+    Document = None
+
+
+@unittest.skipIf(Document is None, "python-docx 未安裝")
+class TestDocxReader(unittest.TestCase):
+    def _build(self) -> str:
+        doc = Document()
+        doc.add_paragraph("一、單選題")
+        doc.add_paragraph("(　A　) 1.\t題目　內容  (A)甲 (B)乙")
+        doc.add_paragraph("")
+
+        p = doc.add_paragraph("換行")
+        p.add_run().add_break()
+        p.add_run("分頁").add_break(WD_BREAK.PAGE)
+        run = p.add_run("連")
+        for tag in ("w:noBreakHyphen", "w:ptab", "w:cr"):
+            run._r.append(OxmlElement(tag))
+        run._r.append(OxmlElement("w:t"))
+
+        p = doc.add_paragraph("見")
+        hyperlink = OxmlElement("w:hyperlink")
+        hyperlink.append(doc.add_paragraph("超連結").runs[0]._r)
+        p._p.append(hyperlink)
+
+        table = doc.add_table(rows=1, cols=1)
+        table.cell(0, 0).text = "表格內文字"
+        doc.add_paragraph("(B) 最後一段")
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = Path(directory.name) / "exam.docx"
+        doc.save(path)
+        return str(path)
+
+    def test_matches_python_docx(self):
+        path = self._build()
+        expected = [p.text for p in Document(path).paragraphs]
+        self.assertEqual(read_docx_paragraphs(path), expected)
+        self.assertIn("換行\n分頁連-\t\n", expected)
+        self.assertNotIn("表格內文字", expected)
+
+    def test_is_lazy(self):
+        paragraphs = iter_docx_paragraphs(self._build())
+        self.assertEqual(next(paragraphs), "一、單選題")
+        self.assertEqual(next(paragraphs), "(　A　) 1.\t題目　內容  (A)甲 (B)乙")
+
+
+if __name__ == "__main__":
+    unittest.main()
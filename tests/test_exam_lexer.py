@@ -0,0 +1,180 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from parsers.exam_lexer import (
+    ANSWER_LINE,
+    ANSWER_QUESTION,
+    BLANK,
+    GROUP_INTRO,
+    NUMBERED_QUESTION,
+    OPTION,
+    OPTIONS,
+    SECTION_HEADER,
+    TEXT,
+    TokenStream,
+    join_tokens,
+    lex_line,
+    option_items,
+    tokenize,
+)
+
+try:
+    from parsers.chinese_parser import iter_chinese
+    from parsers.math_parser import iter_math_md, parse_math_md
+    from parsers.science_parser import is_choice_question, is_fill_blank_question, is_section_header, parse_science_questions
+except ImportError:  # utils.image_naming 等相依套件未安裝
+    parse_math_md = None
+
+
+class TestLexLine(unittest.TestCase):
+    def test_answer_question(self):
+        token = lex_line("( Ｂ )12. 下列何者正確？")
+        self.assertEqual(token.kind, ANSWER_QUESTION)
+        self.assertEqual(token.letter, "Ｂ")
+        self.assertEqual(token.answer, "B")
+        self.assertEqual(token.number, "12")
+        self.assertEqual(token.separator, ".")
+        self.assertEqual(token.rest, "下列何者正確？")
+
+    def test_sub_question_with_empty_answer(self):
+        token = lex_line("( ) (3) What is the main idea?")
+        self.assertEqual(token.kind, ANSWER_QUESTION)
+        self.assertEqual(token.letter, "")
+        self.assertIsNone(token.answer)
+        self.assertEqual(token.sub_number, "3")
+
+    def test_numbered_question(self):
+        token = lex_line("3\\. 求 $x$ 的值")
+        self.assertEqual(token.kind, NUMBERED_QUESTION)
+        self.assertEqual(token.separator, "\\.")
+        self.assertEqual(token.rest, "求 $x$ 的值")
+
+    def test_section_header(self):
+        token = lex_line("**二、文法：每題2分**")
+        self.assertEqual(token.kind, SECTION_HEADER)
+        self.assertEqual(token.numeral, "二")
+        self.assertTrue(token.bold)
+        self.assertEqual(lex_line("## A部分實力養成題").kind, SECTION_HEADER)
+
+    def test_options_and_other_kinds(self):
+        self.assertEqual(lex_line("(A) 甲 (B) 乙").kind, OPTIONS)
+        self.assertEqual(lex_line("(A) 甲").kind, OPTION)
+        self.assertEqual(lex_line("◎ 閱讀下文，回答問題").kind, GROUP_INTRO)
+        self.assertEqual(lex_line("答：x = 2").kind, ANSWER_LINE)
+        self.assertEqual(lex_line("一般敘述文字").kind, TEXT)
+        self.assertEqual(lex_line("   ").kind, BLANK)
+
+    def test_indentation_is_kept(self):
+        token = lex_line("  (A) 甲")
+        self.assertTrue(token.indented)
+        self.assertEqual(token.text, "(A) 甲")
+
+    def test_spaced_marker_is_not_compact(self):
+        token = lex_line("題目中有 ( A ) 記號")
+        self.assertTrue(token.has_spaced_marker("ABCD"))
+        self.assertFalse(token.has_marker("ABCD"))
+
+
+class TestOptionItems(unittest.TestCase):
+    def test_inline_options(self):
+        token = lex_line("(A) 甲 (Ｂ) 乙 (C)丙")
+        items = option_items(token.text, token.markers)
+        self.assertEqual([(item.letter, item.content) for item in items], [("A", "甲"), ("B", "乙"), ("C", "丙")])
+
+    def test_terminated_requires_next_marker(self):
+        token = lex_line("(A) 甲（註） (B) 乙")
+        items = option_items(token.text, token.markers, "ABCD", stops="（(", terminated=True)
+        self.assertEqual([item.letter for item in items], ["B"])
+
+    def test_join_tokens_shifts_markers(self):
+        text, markers = join_tokens([lex_line("(A) 甲"), lex_line("(B) 乙")])
+        self.assertEqual(text, "(A) 甲 (B) 乙")
+        self.assertEqual([text[start:end] for start, end, _ in markers], ["(A)", "(B)"])
+
+    def test_tokenize_keeps_index(self):
+        tokens = tokenize(["一、單選題", "", "(A)1. 題目"])
+        self.assertEqual([token.index for token in tokens], [0, 1, 2])
+
+
+class TestTokenStream(unittest.TestCase):
+    def test_reads_lazily_and_releases(self):
+        consumed = []
+
+        def lines():
+            for i in range(100):
+                consumed.append(i)
+                yield f"{i}. 題目"
+
+        tokens = TokenStream(lines())
+        self.assertEqual(tokens[2].number, "2")
+        self.assertEqual(len(consumed), 3)
+        tokens.release(2)
+        self.assertEqual(tokens.buffered, 1)
+        with self.assertRaises(IndexError):
+            tokens[1]
+        self.assertTrue(tokens.has(99))
+        self.assertFalse(tokens.has(100))
+
+    def test_file_lines_keep_index(self):
+        tokens = TokenStream(["一、單選題\n", "\n", "(A)1. 題目\n"])
+        self.assertEqual(tokens[0].kind, SECTION_HEADER)
+        self.assertEqual(tokens[1].kind, BLANK)
+        self.assertEqual(tokens[2].index, 2)
+
+
+@unittest.skipIf(parse_math_md is None, "parsers 相依套件未安裝")
+class TestParsersUseLexer(unittest.TestCase):
+    def _write(self, content: str) -> str:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = Path(directory.name) / "exam.md"
+        path.write_text(content, encoding="utf-8")
+        return str(path)
+
+    def test_math_multiple_choice(self):
+        path = self._write("一、單選題\n( B )1. 下列何者為質數？\n(A) 四十 (B) 五十三 (C) 六十\n( C )2. 何者最大？\n(A) 一一 (B) 二二 (C) 三三\n")
+        questions = parse_math_md(path)
+        self.assertEqual([q["answer"] for q in questions], ["B", "C"])
+        self.assertEqual([q["question_number"] for q in questions], ["1", "2"])
+        self.assertEqual(questions[1]["options"], {"A": "一一", "B": "二二", "C": "三三"})
+
+    def test_science_choice_question(self):
+        path = self._write("一、單選題\n( A )1. 水的化學式為何？(A)H2O(B)CO2(C)O2(D)N2\n")
+        questions = parse_science_questions(path)
+        self.assertEqual(len(questions), 1)
+        self.assertEqual(questions[0]["answer"], "A")
+
+    def test_science_exported_helpers_keep_original_patterns(self):
+        # 對外的判斷函式不經過 lexer：標題與答案可在行內任何位置，行首空白不去除
+        self.assertEqual(is_section_header("C\\.四、計算題"), "C\\.四、計算題")
+        self.assertIsNone(is_section_header("一、單選題"))
+        self.assertTrue(is_choice_question("D甲ＣＣ)Ｃ（Ａ） 1．"))
+        self.assertTrue(is_choice_question("( Ｂ )1. 題目"))
+        self.assertFalse(is_fill_blank_question("\t12."))
+        self.assertTrue(is_fill_blank_question("12. 題目"))
+        self.assertFalse(is_fill_blank_question("1. ( A )2. 題目"))
+
+    def test_streaming_yields_before_reading_everything(self):
+        consumed = []
+
+        def lines():
+            yield "一、單選題"
+            for n in range(1, 1001):
+                consumed.append(n)
+                yield f"( A ){n}. 第{n}題"
+                yield "(A) 甲甲 (B) 乙乙 (C) 丙丙"
+
+        stream = iter_math_md(lines())
+        first = next(stream)
+        self.assertEqual(first["question_number"], "1")
+        self.assertLess(len(consumed), 5)
+        self.assertEqual(sum(1 for _ in stream), 999)
+
+    def test_chinese_stream_matches_list(self):
+        lines = ["( Ａ )1. 題目一 (A)甲 (B)乙 (C)丙 (D)丁", "( B )2. 題目二", "(A)甲 (B)乙 (C)丙 (D)丁"]
+        self.assertEqual([q["answer"] for q in iter_chinese(iter(lines))], ["A", "B"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import gzip
+import tempfile
+import unittest
+from pathlib import Path
+
+from parsers.base_parser import question_record
+from parsers.jsonl_io import iter_jsonl, jsonl_path_for, question_line, write_jsonl
+
+FILE_PATH = "input_md/111A/8/Knsh/History/L3.md"
+
+
+class TestJsonlIO(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.tmp = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _questions(self, count: int):
+        for n in range(count):
+            yield question_record(f"第{n}題", {"A": "甲", "B": "乙"}, "A", FILE_PATH)
+
+    def test_round_trip(self):
+        path = self.tmp / "exam.jsonl"
+        self.assertEqual(write_jsonl(self._questions(3), path), 3)
+        lines = path.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertNotIn(": ", lines[0])
+        records = list(iter_jsonl(path))
+        self.assertEqual(records[2]["question"], "第2題")
+        self.assertEqual(records[0]["publisher"], "康軒")
+
+    def test_gzip_by_suffix(self):
+        path = self.tmp / "exam.jsonl.gz"
+        write_jsonl(self._questions(2), path)
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 2)
+        self.assertEqual([r["question"] for r in iter_jsonl(path)], ["第0題", "第1題"])
+
+    def test_reader_is_lazy(self):
+        path = self.tmp / "exam.jsonl"
+        path.write_text(question_line({"question": "ok"}) + "\n\n{broken\n", encoding="utf-8")
+        records = iter_jsonl(path)
+        self.assertEqual(next(records), {"question": "ok"})
+        with self.assertRaises(ValueError):
+            next(records)
+
+    def test_default_output_path(self):
+        self.assertEqual(jsonl_path_for("exams/history.docx"), str(Path("exams/history.jsonl")))
+        self.assertEqual(jsonl_path_for("exams/history.docx", compress=True), str(Path("exams/history.jsonl.gz")))
+
+
+if __name__ == "__main__":
+    unittest.main()
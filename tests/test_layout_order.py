@@ -0,0 +1,69 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+try:
+    import torch
+    from transformers import LayoutLMv3Config, LayoutLMv3ForTokenClassification
+    from extractor.layout_order import (
+        FP32_SAFETENSORS_NAME,
+        load_layoutreader_mmap,
+        load_safetensors_mmap,
+    )
+    skip_layout_tests = False
+except ImportError:
+    skip_layout_tests = True
+skip_message = "Skipping LayoutReader loading tests as torch/transformers/doc_page_extractor is not installed."
+
+
+@unittest.skipIf(skip_layout_tests, skip_message)
+class TestLayoutReaderMmap(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.model_dir = Path(self.temp_dir.name)
+        torch.manual_seed(0)
+        config = LayoutLMv3Config(
+            hidden_size=32,
+            num_hidden_layers=2,
+            num_attention_heads=4,
+            intermediate_size=64,
+            coordinate_size=6,
+            shape_size=4,
+            num_labels=16,
+            visual_embed=False,
+        )
+        self.reference = LayoutLMv3ForTokenClassification(config).eval()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _logits(self, model):
+        bbox = torch.tensor([[[0, 0, 0, 0], [10, 20, 30, 40], [50, 60, 70, 80], [0, 0, 0, 0]]])
+        input_ids = torch.tensor([[0, 3, 3, 2]])
+        with torch.no_grad():
+            return model(input_ids=input_ids, bbox=bbox, attention_mask=torch.ones_like(input_ids)).logits
+
+    def test_matches_eager_weights(self):
+        self.reference.save_pretrained(self.model_dir, safe_serialization=True)
+        model = load_layoutreader_mmap(self.model_dir)
+        torch.testing.assert_close(self._logits(model), self._logits(self.reference))
+        self.assertFalse((self.model_dir / FP32_SAFETENSORS_NAME).exists())
+
+    def test_parameters_share_one_mapping(self):
+        self.reference.save_pretrained(self.model_dir, safe_serialization=True)
+        model = load_layoutreader_mmap(self.model_dir)
+        storages = {param.untyped_storage().data_ptr() for param in model.parameters()}
+        self.assertEqual(len(storages), 1)
+
+    def test_bfloat16_weights_are_converted_once(self):
+        self.reference.to(torch.bfloat16).save_pretrained(self.model_dir, safe_serialization=True)
+        model = load_layoutreader_mmap(self.model_dir)
+        fp32_path = self.model_dir / FP32_SAFETENSORS_NAME
+        self.assertTrue(fp32_path.exists())
+        self.assertTrue(all(param.dtype == torch.float32 for param in model.parameters()))
+        tensors = load_safetensors_mmap(fp32_path)
+        self.assertTrue(all(t.dtype == torch.float32 for t in tensors.values() if t.is_floating_point()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+try:
+    import numpy as np
+    from extractor.layoutreader_onnx import LayoutReaderONNX, build_batch_inputs, parse_logits
+    skip_onnx_tests = False
+except ImportError:
+    skip_onnx_tests = True
+skip_onnx_message = "Skipping LayoutReader ONNX tests as numpy/onnxruntime is not installed."
+
+try:
+    import torch
+    from transformers import LayoutLMv3Config, LayoutLMv3ForTokenClassification
+    from tools.export_layoutreader import export_onnx
+    skip_parity_tests = skip_onnx_tests
+except ImportError:
+    skip_parity_tests = True
+skip_parity_message = "Skipping LayoutReader parity tests as torch/transformers/doc_page_extractor is not installed."
+
+
+def _random_pages(seed, sizes):
+    rng = np.random.default_rng(seed)
+    pages = []
+    for size in sizes:
+        corners = rng.integers(0, 900, (size, 2))
+        pages.append(sorted([int(x), int(y), int(x) + 60, int(y) + 12] for x, y in corners))
+    return pages
+
+
+@unittest.skipIf(skip_onnx_tests, skip_onnx_message)
+class TestLayoutReaderInputs(unittest.TestCase):
+    def test_build_batch_inputs_pads_like_data_collator(self):
+        inputs = build_batch_inputs([[[1, 2, 3, 4]], [[5, 6, 7, 8], [9, 10, 11, 12]]])
+        np.testing.assert_array_equal(inputs["input_ids"], [[0, 3, 2, 2], [0, 3, 3, 2]])
+        np.testing.assert_array_equal(inputs["attention_mask"], [[1, 1, 1, 0], [1, 1, 1, 1]])
+        np.testing.assert_array_equal(inputs["bbox"][0], [[0, 0, 0, 0], [1, 2, 3, 4], [0, 0, 0, 0], [0, 0, 0, 0]])
+
+    def test_parse_logits_resolves_conflicts(self):
+        logits = np.zeros((5, 8), dtype=np.float32)
+        # 方塊 0 與 1 都想排第 0 位，方塊 1 分數較高
+        logits[1] = [5.0, 1.0, 0.0, 0, 0, 0, 0, 0]
+        logits[2] = [9.0, 0.0, 2.0, 0, 0, 0, 0, 0]
+        logits[3] = [0.0, 0.0, 3.0, 0, 0, 0, 0, 0]
+        self.assertEqual(parse_logits(logits, 3), [1, 0, 2])
+
+
+@unittest.skipIf(skip_parity_tests, skip_parity_message)
+class TestLayoutReaderParity(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        torch.manual_seed(0)
+        config = LayoutLMv3Config(
+            hidden_size=64,
+            num_hidden_layers=2,
+            num_attention_heads=4,
+            intermediate_size=128,
+            coordinate_size=11,
+            shape_size=10,
+            num_labels=510,
+            visual_embed=False,
+        )
+        cls.model = LayoutLMv3ForTokenClassification(config).eval()
+        cls.onnx_path = export_onnx(cls.model, Path(cls.temp_dir.name) / "layoutreader.onnx")
+        cls.reader = LayoutReaderONNX(cls.onnx_path, batch_size=3)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+
+    def _eager_logits(self, boxes):
+        input_ids = torch.tensor([[0] + [3] * len(boxes) + [2]])
+        bbox = torch.tensor([[[0, 0, 0, 0]] + boxes + [[0, 0, 0, 0]]])
+        with torch.no_grad():
+            return self.model(input_ids=input_ids, bbox=bbox, attention_mask=torch.ones_like(input_ids)).logits[0].numpy()
+
+    def test_single_page_logits_match_eager(self):
+        for boxes in _random_pages(0, [1, 7, 50]):
+            np.testing.assert_allclose(self.reader.logits([boxes])[0], self._eager_logits(boxes), atol=1e-4)
+
+    def test_batched_orders_match_eager(self):
+        pages = _random_pages(1, [30, 3, 120, 0, 12, 64, 5])
+        orders = self.reader.order_many(pages)
+        for boxes, order in zip(pages, orders):
+            expected = parse_logits(self._eager_logits(boxes), len(boxes)) if boxes else []
+            self.assertEqual(order, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
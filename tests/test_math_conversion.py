@@ -0,0 +1,93 @@
+import json
+import random
+import unittest
+
+from parsers.math_conversion import (
+    MATH_CONVERSIONS,
+    STAGES,
+    MathText,
+    convert_math_expressions,
+    convert_sequential,
+    extract_latex_expressions,
+)
+from parsers.golden import FIXTURE_ROOT
+
+try:
+    from parsers.math_parser import parse_math_md
+except ImportError:  # utils.image_naming 等相依套件未安裝
+    parse_math_md = None
+
+
+class TestMathConversion(unittest.TestCase):
+    def test_examples(self):
+        cases = {
+            "3/4＋x²＝y": "\\frac{3}{4}+x^2 = y",
+            "∣x－2∣ ≤ 5": "|x-2| \\leq 5",
+            "√2×π": "\\sqrt{2}\\times\\pi",
+            "2^αβ": "2^{\\alpha\\beta}",
+            "設 *a* 為實數": "設 $a$ 為實數",
+            "溫度 30℃": "溫度 30^{\\circ}\\text{C}",
+        }
+        for text, expected in cases.items():
+            self.assertEqual(convert_math_expressions(text), expected)
+
+    def test_empty_text(self):
+        self.assertEqual(convert_math_expressions(""), "")
+        self.assertIsNone(convert_math_expressions(None))
+
+    def test_single_char_rules_are_merged(self):
+        self.assertLess(len(STAGES), len(MATH_CONVERSIONS) // 4)
+
+    def test_matches_sequential_rules(self):
+        alphabet = [pattern for pattern, _ in MATH_CONVERSIONS if len(pattern) == 1]
+        alphabet += list("∣｜|\\/^²³√∛*<>= 　axyZ0129_(){}$中") + ["\\|", "*a*", "1/2", "x^2"]
+        rng = random.Random(0)
+        for _ in range(5000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 20)))
+            self.assertEqual(convert_math_expressions(text), convert_sequential(text), repr(text))
+
+
+class TestMathText(unittest.TestCase):
+    def test_fields_match_eager_dict(self):
+        text = "已知 $x^2=4$，且 3/4＋α ≥ $$y$$"
+        latex_text = convert_math_expressions(text)
+        expected = {
+            "original_text": text,
+            "latex_text": latex_text,
+            "math_expressions": extract_latex_expressions(text),
+            "needs_mathjax": True,
+            "display_text": latex_text,
+        }
+        self.assertEqual(dict(MathText(text)), expected)
+        self.assertEqual(MathText(text).get("display_text"), latex_text)
+
+    def test_display_text_skips_expression_extraction(self):
+        math_text = MathText("設 $a$ 為 3/4")
+        self.assertEqual(math_text.display_text, "設 $a$ 為 \\frac{3}{4}")
+        self.assertIsNone(math_text._math_expressions)
+        self.assertTrue(math_text.needs_mathjax)
+        self.assertIsNone(math_text._math_expressions)
+
+    def test_plain_text_does_not_need_mathjax(self):
+        math_text = MathText("甲乙丙三人")
+        self.assertFalse(math_text.needs_mathjax)
+        self.assertEqual(math_text.math_expressions, [])
+
+    def test_unknown_key(self):
+        with self.assertRaises(KeyError):
+            MathText("x")["question"]
+
+
+@unittest.skipIf(parse_math_md is None, "parsers 相依套件未安裝")
+class TestParseMathSerialization(unittest.TestCase):
+    def test_questions_are_plain_json(self):
+        questions = parse_math_md(str(FIXTURE_ROOT / "111A/7/Hanlin/Math/L1.md"))
+        formatted = [q for q in questions if q["question_type"] in ("填充題", "非選題")]
+        self.assertTrue(formatted)
+        for question in formatted:
+            self.assertIs(type(question["question_text"]), dict)
+        self.assertEqual(json.loads(json.dumps(questions, ensure_ascii=False)), questions)
+
+
+if __name__ == "__main__":
+    unittest.main()
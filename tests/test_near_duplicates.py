@@ -0,0 +1,113 @@
+import tempfile
+import tracemalloc
+import unittest
+from pathlib import Path
+
+try:
+    import numpy as np
+    from parsers.near_duplicates import (BATCH_ELEMENTS, MinHasher, NearDuplicateIndex, find_near_duplicates,
+                                         question_shingles, text_units)
+    skip_numpy_tests = False
+except ImportError:
+    skip_numpy_tests = True
+skip_numpy_message = "Skipping near-duplicate tests as numpy is not installed."
+
+QUESTION = {
+    "question": "12. 下列哪一個數是質數？請選出正確的答案",
+    "options": {"A": "四十九", "B": "五十三", "C": "六十三", "D": "七十七"},
+}
+# OCR 雜訊：全形數字、標點不同、選項順序不同
+NOISY = {
+    "question": "１２ 下列哪一個數是質數，請選出正確的答案。",
+    "options": {"A": "五十三", "B": "七十七", "C": "四十九", "D": "六十三"},
+}
+OTHER = {
+    "question": "下列哪一個數是偶數？請選出正確的答案",
+    "options": {"A": "十一", "B": "十三", "C": "十五", "D": "十八"},
+}
+
+
+@unittest.skipIf(skip_numpy_tests, skip_numpy_message)
+class TestShingles(unittest.TestCase):
+    def test_units_keep_english_words(self):
+        self.assertEqual(text_units("3. Which IS 正確？"), ["which", "is", "正", "確"])
+        self.assertEqual(text_units("ＡＢＣ"), ["abc"])
+
+    def test_option_order_does_not_matter(self):
+        self.assertEqual(question_shingles(QUESTION), question_shingles(NOISY))
+
+
+@unittest.skipIf(skip_numpy_tests, skip_numpy_message)
+class TestMinHash(unittest.TestCase):
+    def test_signatures_are_deterministic(self):
+        texts = ["下列何者正確", "", "which of the following", QUESTION]
+        first = MinHasher().signatures(texts)
+        self.assertEqual(first.shape, (4, 128))
+        self.assertTrue((first == MinHasher().signatures(texts)).all())
+        self.assertTrue((first[1] == 0xFFFFFFFF).all())
+
+    def test_estimate_tracks_jaccard(self):
+        a = "甲乙丙丁戊己庚辛壬癸子丑寅卯辰巳午未申酉戌亥"
+        b = a[:15] + "天地" + a[17:]
+        sa, sb = question_shingles(a), question_shingles(b)
+        jaccard = len(sa & sb) / len(sa | sb)
+        signatures = MinHasher(num_perm=512).signatures([a, b])
+        self.assertAlmostEqual((signatures[0] == signatures[1]).mean(), jaccard, delta=0.1)
+
+    def test_batches_stay_bounded_on_skewed_lengths(self):
+        long_text = " ".join(f"w{i}" for i in range(402))   # 400 個 shingle
+        texts = ["甲" if i % 2 else long_text for i in range(2000)]
+        hasher = MinHasher()
+        tracemalloc.start()
+        try:
+            signatures = hasher.signatures(texts)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertTrue((signatures[0] == signatures[2]).all())
+        # 中間矩陣與排列結果各約 BATCH_ELEMENTS 個 uint64，其餘為每題的雜湊與簽章
+        self.assertLess(peak, 4 * BATCH_ELEMENTS * 8)
+
+
+@unittest.skipIf(skip_numpy_tests, skip_numpy_message)
+class TestNearDuplicateIndex(unittest.TestCase):
+    def test_incremental_matches(self):
+        index = NearDuplicateIndex()
+        self.assertEqual(index.add(QUESTION, "a"), [])
+        self.assertEqual(index.add(OTHER, "b"), [])
+        self.assertEqual([key for key, _ in index.add(NOISY, "c")], ["a"])
+        self.assertEqual([key for key, _ in index.query(QUESTION)], ["a", "c"])
+        self.assertEqual(len(index), 3)
+
+    def test_batch_matches_earlier_in_same_batch(self):
+        self.assertEqual([(a, b) for a, b, _ in find_near_duplicates([QUESTION, OTHER, NOISY])], [(0, 2)])
+
+    def test_save_and_load(self):
+        index = NearDuplicateIndex()
+        index.add_many([QUESTION, OTHER], ["a", "b"])
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        path = Path(temp_dir.name) / "signatures.npz"
+        index.save(path)
+        loaded = NearDuplicateIndex.load(path)
+        self.assertEqual(loaded.keys, ["a", "b"])
+        self.assertEqual([key for key, _ in loaded.add(NOISY, "c")], ["a"])
+
+    def test_save_does_not_need_pickle(self):
+        index = NearDuplicateIndex()
+        index.add_many([QUESTION, OTHER], ["題目-1", "b"])
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        path = Path(temp_dir.name) / "signatures.npz"
+        index.save(path)
+        with np.load(path, allow_pickle=False) as data:
+            self.assertEqual(data["keys"].dtype.kind, "U")
+            self.assertEqual(data["keys"].tolist(), ["題目-1", "b"])
+
+    def test_bands_must_divide_num_perm(self):
+        with self.assertRaises(ValueError):
+            NearDuplicateIndex(num_perm=100, bands=32)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import random
+import re
+import unittest
+
+from parsers.exam_lexer import lex_line
+from parsers.normalize import FoldedText, fold_width
+
+# 改寫前含全形字元類別的 regex 與對應的 ASCII 版本
+PATTERN_PAIRS = [
+    (r"^[（(]\s*([Ａ-ＤABCD])\s*[）)]\s*(\d+\.?)?", r"^\(\s*([A-D])\s*\)\s*(\d+\.?)?"),
+    (r"^[（(]\s*[Ａ-ＤABCD]\s*[）)]\s*\d+[.、]\s*", r"^\(\s*[A-D]\s*\)\s*\d+[.、]\s*"),
+    (r"[（(]\s*[Ａ-ＦABCDEF]\s*[）)]\s*(\d+)[．.]", r"\(\s*[A-F]\s*\)\s*(\d+)[．.]"),
+    (r"[　 \t]{2,}", r"[ \t]{2,}"),
+]
+
+ALPHABET = ["(", ")", "（", "）", "A", "Ｂ", "ｂ", "F", "Ｇ", "1", "１", ".", "．", "、",
+            " ", "　", "\t", "x", "甲", "＃", "＊"]
+
+
+def _random_lines(count, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 12)))
+
+
+class TestFoldWidth(unittest.TestCase):
+    def test_folds_letters_digits_brackets_and_space(self):
+        self.assertEqual(fold_width("（Ａ）ｘ＝１２　"), "(A)x＝12 ")
+
+    def test_other_full_width_punctuation_is_kept(self):
+        self.assertEqual(fold_width("＃＊．：，"), "＃＊．：，")
+
+    def test_length_is_preserved(self):
+        for text in _random_lines(2000):
+            self.assertEqual(len(fold_width(text)), len(text))
+
+
+class TestFoldedText(unittest.TestCase):
+    def test_span_comes_from_original(self):
+        folded = FoldedText.of("( Ｂ )１２．題目")
+        match = re.match(r"\(\s*([A-F])\s*\)(\d+)", folded.folded)
+        self.assertEqual(folded.span(match, 1), "Ｂ")
+        self.assertEqual(folded.span(match, 2), "１２")
+
+    def test_sub_matches_old_patterns(self):
+        for old, new in PATTERN_PAIRS:
+            old_re, new_re = re.compile(old), re.compile(new)
+            for text in _random_lines(5000, seed=1):
+                self.assertEqual(FoldedText.of(text).sub(new_re, "____"), old_re.sub("____", text), (old, repr(text)))
+                old_match, new_match = old_re.search(text), new_re.search(fold_width(text))
+                self.assertEqual(None if new_match is None else new_match.span(),
+                                 None if old_match is None else old_match.span(), (old, repr(text)))
+
+    def test_sub_count(self):
+        self.assertEqual(FoldedText.of("ａ　　ｂ　　ｃ").sub(re.compile(r" {2,}"), "_", count=1), "ａ_ｂ　　ｃ")
+
+
+class TestLexerKeepsOriginalText(unittest.TestCase):
+    def test_fields_keep_full_width_characters(self):
+        token = lex_line("（　Ｂ　）（１）題目")
+        self.assertEqual(token.folded, "( B )(1)題目")
+        self.assertEqual((token.letter, token.answer, token.sub_number, token.rest), ("Ｂ", "B", "１", "題目"))
+        self.assertEqual(lex_line("(Ａ)甲 (B)乙").markers, ((0, 3, "Ａ"), (5, 8, "B")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+try:
+    from extractor.ocr import resolve_ocr_model_paths, variant_model_path
+    skip_ocr_tests = False
+except ImportError:
+    skip_ocr_tests = True
+skip_message = "Skipping OCR variant tests as doc_page_extractor is not installed."
+
+
+@unittest.skipIf(skip_ocr_tests, skip_message)
+class TestOCRVariants(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        for parts in (("ppocrv4", "rec", "rec.onnx"), ("ppocrv4", "cls", "cls.onnx"),
+                      ("ppocrv4", "det", "det.onnx"), ("ch_ppocr_server_v2.0", "ppocr_keys_v1.txt")):
+            path = self.root.joinpath(*parts)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.touch()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_variant_model_path(self):
+        self.assertEqual(variant_model_path(Path("det/det.onnx"), "fp32"), Path("det/det.onnx"))
+        self.assertEqual(variant_model_path(Path("det/det.onnx"), "int8_dynamic"), Path("det/det.int8_dynamic.onnx"))
+
+    def test_resolve_prefers_quantized_det_and_rec(self):
+        (self.root / "ppocrv4" / "det" / "det.int8_static.onnx").touch()
+        (self.root / "ppocrv4" / "rec" / "rec.int8_static.onnx").touch()
+        rec, cls, det, keys = resolve_ocr_model_paths(self.root, "int8_static")
+        self.assertEqual(rec.name, "rec.int8_static.onnx")
+        self.assertEqual(cls.name, "cls.onnx")
+        self.assertEqual(det.name, "det.int8_static.onnx")
+        self.assertEqual(keys.name, "ppocr_keys_v1.txt")
+
+    def test_resolve_falls_back_to_fp32(self):
+        rec, _, det, _ = resolve_ocr_model_paths(self.root, "int8_dynamic")
+        self.assertEqual(rec.name, "rec.onnx")
+        self.assertEqual(det.name, "det.onnx")
+
+    def test_unknown_variant(self):
+        with self.assertRaises(ValueError):
+            resolve_ocr_model_paths(self.root, "fp16")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+try:
+    import numpy as np
+    import onnx
+    from onnx import TensorProto, helper
+    from extractor.onnx_session import create_onnx_session, session_cache_key
+    skip_onnx_tests = False
+except ImportError:
+    skip_onnx_tests = True
+skip_message = "Skipping ONNX session cache tests as onnx/onnxruntime is not installed."
+
+
+def _write_model(path: Path):
+    """y = relu(x + 1) + 0，留一些可被最佳化的節點"""
+    one = helper.make_tensor("one", TensorProto.FLOAT, [1], [1.0])
+    zero = helper.make_tensor("zero", TensorProto.FLOAT, [1], [0.0])
+    graph = helper.make_graph(
+        [
+            helper.make_node("Add", ["x", "one"], ["a"]),
+            helper.make_node("Relu", ["a"], ["r"]),
+            helper.make_node("Add", ["r", "zero"], ["y"]),
+        ],
+        "tiny",
+        [helper.make_tensor_value_info("x", TensorProto.FLOAT, [None, 4])],
+        [helper.make_tensor_value_info("y", TensorProto.FLOAT, [None, 4])],
+        initializer=[one, zero],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 13)])
+    model.ir_version = 8
+    onnx.save(model, str(path))
+
+
+@unittest.skipIf(skip_onnx_tests, skip_message)
+class TestOnnxSessionCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.model_path = self.root / "tiny.onnx"
+        _write_model(self.model_path)
+        self.cache_dir = self.root / "cache"
+        self.x = np.array([[-2.0, -1.0, 0.0, 1.0]], dtype=np.float32)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _run(self, session):
+        return session.run(None, {"x": self.x})[0]
+
+    def test_cache_is_written_then_reused(self):
+        first = create_onnx_session(self.model_path, cache_dir=self.cache_dir)
+        cached_files = list(self.cache_dir.glob("tiny.*.onnx"))
+        self.assertEqual(len(cached_files), 1)
+        mtime = cached_files[0].stat().st_mtime_ns
+
+        second = create_onnx_session(self.model_path, cache_dir=self.cache_dir)
+        self.assertEqual(cached_files[0].stat().st_mtime_ns, mtime)
+        np.testing.assert_allclose(self._run(first), self._run(second))
+        np.testing.assert_allclose(self._run(second), [[0.0, 0.0, 1.0, 2.0]])
+
+    def test_no_cache_dir(self):
+        session = create_onnx_session(self.model_path)
+        np.testing.assert_allclose(self._run(session), [[0.0, 0.0, 1.0, 2.0]])
+        self.assertFalse(self.cache_dir.exists())
+
+    def test_key_depends_on_model_and_providers(self):
+        key = session_cache_key(self.model_path, ["CPUExecutionProvider"])
+        self.assertNotEqual(key, session_cache_key(self.model_path, ["CUDAExecutionProvider"]))
+        other = self.root / "other.onnx"
+        other.write_bytes(self.model_path.read_bytes() + b"\0")
+        self.assertNotEqual(key, session_cache_key(other, ["CPUExecutionProvider"]))
+
+    def test_corrupted_cache_is_rebuilt(self):
+        create_onnx_session(self.model_path, cache_dir=self.cache_dir)
+        cached_file = next(self.cache_dir.glob("tiny.*.onnx"))
+        cached_file.write_bytes(b"broken")
+        session = create_onnx_session(self.model_path, cache_dir=self.cache_dir)
+        np.testing.assert_allclose(self._run(session), [[0.0, 0.0, 1.0, 2.0]])
+        self.assertNotEqual(cached_file.read_bytes(), b"broken")
+
+
+if __name__ == '__main__':
+    unittest.main()
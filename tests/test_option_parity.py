@@ -0,0 +1,107 @@
+import random
+import re
+import time
+import unittest
+
+from parsers.exam_lexer import HEADER_RE, LEAD_RE, lex_line, option_items, scan_markers
+from parsers.normalize import fold_width
+
+try:
+    from parsers.math_parser import _extract_options_from_text, _text_options
+    from parsers.social_parser import _group_intro
+except ImportError:  # utils.image_naming 等相依套件未安裝
+    _text_options = None
+
+# 改寫前的 regex，作為線性掃描的對照
+OLD_OPTION_RE = re.compile(r"[（(]([Ａ-ＤABCD])[）)]\s*([^（()]+?)(?=[（(][Ａ-ＤABCD][）)]|$)")
+OLD_LEAD_RE = re.compile(r"[（(]\s*([Ａ-ＦA-F]?)\s*[）)]\s*")
+OLD_HEADER_RE = re.compile(r"(?:#+\s*)?(\*\*)?\s*(?:([一二三四五六七八九十]+)、|[AＡBＢ]部分)")
+OLD_GROUP_INTRO_RE = re.compile(r"^[⊙○●]\s*(.*?)\s*請問[:：]?\s*$")
+FW_MAP = str.maketrans("ＡＢＣＤ", "ABCD")
+
+ALPHABET = ["(", ")", "（", "）", "A", "B", "Ｃ", "D", "E", " ", "　", "\n", "x", "甲", "1", ".",
+            "#", "*", "一", "、", "部分", "⊙", "請問", ":", "：", "(A)", "（Ｂ）", "( C )", "**"]
+
+FIXTURES = [
+    "(A) 四十 (B) 五十三 (C) 六十 (D) 七十二",
+    "( B )1. 下列何者為質數？(A)四十(B)五十三(C)六十",
+    "(A)甲（註）(B)乙 (C)丙",
+    "(A) (B)x (C)",
+    "（Ａ）$x+1$ （Ｂ）$x-1$",
+    "**二、文法：每題2分**",
+    "## A部分實力養成題",
+    "(　) (3) What is the main idea?",
+    "⊙ 閱讀下文，回答問題。請問：",
+]
+
+
+def _old_options(text):
+    return [(m.group(1).translate(FW_MAP), m.group(2).strip(), m.start()) for m in OLD_OPTION_RE.finditer(text)]
+
+
+def _new_options(text):
+    items = option_items(text, scan_markers(text), "ＡＢＣＤABCD", stops="（()", terminated=True, nonempty=True)
+    return [(item.letter, item.content, item.start) for item in items]
+
+
+def _groups(match):
+    return None if match is None else (match.end(), match.groups())
+
+
+def _random_lines(count, seed=0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 14)))
+
+
+class TestOptionScannerParity(unittest.TestCase):
+    def test_fixtures(self):
+        for text in FIXTURES:
+            self.assertEqual(_new_options(text), _old_options(text), text)
+
+    def test_random_lines(self):
+        for text in _random_lines(20000):
+            self.assertEqual(_new_options(text), _old_options(text), repr(text))
+
+    def test_lexer_prefix_patterns(self):
+        for text in list(_random_lines(20000, seed=1)) + FIXTURES:
+            text = text.strip()
+            folded = fold_width(text)
+            old, new = OLD_LEAD_RE.match(text), LEAD_RE.match(folded)
+            self.assertEqual(None if new is None else (new.end(), text[new.start(1):new.end(1)] if new.group(1) else ""),
+                             None if old is None else (old.end(), old.group(1)), repr(text))
+            self.assertEqual(_groups(HEADER_RE.match(folded)), _groups(OLD_HEADER_RE.match(text)), repr(text))
+
+    def test_adversarial_lines_are_linear(self):
+        lines = [
+            "(A)" + " " * 20000 + "x)",
+            "(" + " " * 20000 + "x",
+            "#" + " " * 20000 + "x",
+            "(A)" * 5000 + "x" * 20000,
+            "(A)x" * 5000,
+        ]
+        for line in lines:
+            start_time = time.perf_counter()
+            lex_line(line)
+            _new_options(line)
+            self.assertLess(time.perf_counter() - start_time, 0.5, line[:10])
+
+
+@unittest.skipIf(_text_options is None, "parsers 相依套件未安裝")
+class TestParserHelpersParity(unittest.TestCase):
+    def test_math_text_options(self):
+        for text in list(_random_lines(5000, seed=2)) + FIXTURES:
+            self.assertEqual([(i.letter, i.content, i.start) for i in _text_options(text)], _old_options(text), repr(text))
+        self.assertEqual(_extract_options_from_text(FIXTURES[0]), {"A": "四十", "B": "五十三", "C": "六十", "D": "七十二"})
+
+    def test_social_group_intro(self):
+        rng = random.Random(3)
+        pieces = ["⊙", "○", " ", "\n", "請問", ":", "：", "甲", "x", "　"]
+        lines = ["".join(rng.choice(pieces) for _ in range(rng.randint(0, 10))) for _ in range(20000)] + FIXTURES
+        for line in lines:
+            old = OLD_GROUP_INTRO_RE.match(line)
+            self.assertEqual(_group_intro(line), None if old is None else old.group(1).strip(), repr(line))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+
+from extractor.orientation import (
+    ORIENTATION_MIXED,
+    ORIENTATION_ROTATED,
+    ORIENTATION_UPRIGHT,
+    vote_page_orientation,
+)
+
+try:
+    import numpy as np
+    from extractor.text_system import ExamTextSystem, OCRRoutingStats
+except ImportError:  # numpy、doc_page_extractor 或 cv2 未安裝
+    ExamTextSystem = None
+
+
+class TestVotePageOrientation(unittest.TestCase):
+    def test_upright_page(self):
+        self.assertEqual(vote_page_orientation([["0", 0.99]] * 5), ORIENTATION_UPRIGHT)
+
+    def test_rotated_page(self):
+        self.assertEqual(vote_page_orientation([["180", 0.97]] * 5), ORIENTATION_ROTATED)
+
+    def test_disagreement_is_mixed(self):
+        results = [["0", 0.99], ["180", 0.99], ["0", 0.99]]
+        self.assertEqual(vote_page_orientation(results), ORIENTATION_MIXED)
+
+    def test_low_confidence_is_mixed(self):
+        results = [["0", 0.99], ["0", 0.6], ["0", 0.99]]
+        self.assertEqual(vote_page_orientation(results), ORIENTATION_MIXED)
+
+    def test_too_few_lines_is_mixed(self):
+        self.assertEqual(vote_page_orientation([["0", 0.99]] * 2), ORIENTATION_MIXED)
+
+
+class _FakeClassifier:
+    """以影像左上角像素值當作方向標記：1 表示倒置"""
+
+    cls_thresh = 0.9
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, img_list):
+        self.calls.append(len(img_list))
+        img_list = [img.copy() for img in img_list]
+        results = []
+        for i, img in enumerate(img_list):
+            rotated = img[0, 0] == 1
+            results.append(["180" if rotated else "0", 0.99])
+            if rotated:
+                img_list[i] = np.rot90(img, 2)
+        return img_list, results
+
+
+def _crop(rotated: bool) -> "np.ndarray":
+    img = np.zeros((4, 8), dtype=np.uint8)
+    img[0, 0] = 1 if rotated else 0
+    return img
+
+
+@unittest.skipIf(ExamTextSystem is None, "numpy / doc_page_extractor 未安裝")
+class TestClassifyOrientation(unittest.TestCase):
+    def _text_system(self):
+        text_system = ExamTextSystem.__new__(ExamTextSystem)
+        text_system.text_classifier = _FakeClassifier()
+        text_system.orientation_sample_size = 4
+        text_system.routing_stats = OCRRoutingStats()
+        return text_system
+
+    def test_upright_page_skips_per_line_cls(self):
+        text_system = self._text_system()
+        crops = [_crop(False) for _ in range(20)]
+        result = text_system._classify_orientation(crops)
+        self.assertEqual(text_system.text_classifier.calls, [4])
+        self.assertEqual(len(result), len(crops))
+        self.assertEqual(text_system.routing_stats.orientation["cls_skipped"], 16)
+
+    def test_rotated_page_rotates_all_lines(self):
+        text_system = self._text_system()
+        crops = [_crop(True) for _ in range(20)]
+        result = text_system._classify_orientation(crops)
+        self.assertEqual(text_system.text_classifier.calls, [4])
+        self.assertTrue(all(img[0, 0] == 0 and img[-1, -1] == 1 for img in result))
+        self.assertEqual(text_system.routing_stats.orientation["rotated"], 1)
+
+    def test_mixed_page_falls_back_to_per_line(self):
+        text_system = self._text_system()
+        crops = [_crop(i % 2 == 0) for i in range(20)]
+        result = text_system._classify_orientation(crops)
+        self.assertEqual(text_system.text_classifier.calls, [4, 16])
+        self.assertTrue(all(img[0, 0] == 0 for img in result))
+        self.assertEqual(text_system.routing_stats.orientation["cls_lines"], 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import json
+import unittest
+
+from parsers.golden import FIXTURE_ROOT, GoldenScore, find_fixtures, load_expected, parse_fixture, score_questions
+
+try:
+    import utils.image_naming  # noqa: F401
+except ImportError:  # 各科 parser 都需要 utils.image_naming
+    PARSERS_AVAILABLE = False
+else:
+    PARSERS_AVAILABLE = True
+
+# 目前 parser 還答錯的正確題目（索引），修好後從這裡移除；不在清單中的題目答錯即視為退步
+KNOWN_MISSES = {
+    "111A/7/Hanlin/Math/L1.md": {2, 5, 6, 7},    # 單字元選項被略過；填充 / 非選題的答案輸出為 "None"
+    "111A/7/Hanlin/Chinese/L1.docx": {3, 4},     # 往後看選項時併入了下一題的行內選項
+}
+
+
+class TestGoldenScore(unittest.TestCase):
+    def test_lost_and_wrong_questions(self):
+        expected = [
+            {"question": "甲", "options": {"A": "1", "B": "2"}, "answer": "A", "image": False},
+            {"question": "乙", "options": {"A": "1", "B": "2"}, "answer": "B", "image": False},
+            {"question": "丙", "options": {}, "answer": "", "image": True},
+        ]
+        parsed = [
+            {"question": "甲", "options": {"B": "2", "A": "1"}, "answer": "A", "image_path": None},
+            {"question": "乙", "options": {"A": "1", "B": "2"}, "answer": "C", "image_path": None},
+            {"question": "丁", "options": None, "answer": None, "image_path": "x.png"},
+        ]
+        score = score_questions(expected, parsed)
+        self.assertEqual((score.lost, score.wrong), ([2], [1]))
+        self.assertEqual((score.found, score.exact), (2, 1))
+        self.assertAlmostEqual(score.precision, 1 / 3)
+
+    def test_empty_score(self):
+        self.assertEqual(GoldenScore(0, 0).accuracy, 1.0)
+
+
+@unittest.skipIf(not PARSERS_AVAILABLE, "parsers 相依套件未安裝")
+class TestParserFixtures(unittest.TestCase):
+    def test_every_parser_has_fixtures(self):
+        from parsers.corpus import parser_for
+
+        self.assertEqual({parser_for(str(path)) for path in find_fixtures()},
+                         {"math", "chinese", "english", "science", "social"})
+
+    def test_no_new_misses(self):
+        for path in find_fixtures():
+            name = path.relative_to(FIXTURE_ROOT).as_posix()
+            with self.subTest(name):
+                score = score_questions(load_expected(path), parse_fixture(path))
+                self.assertLessEqual(set(score.lost + score.wrong), KNOWN_MISSES.get(name, set()))
+
+    def test_entry_points_return_json_ready_dicts(self):
+        from parsers.corpus import parser_for
+        from parsers.docx_reader import iter_docx_paragraphs
+        from parsers.result_cache import ENTRY_POINTS, PATH_ENTRY_POINTS, parser_module
+
+        for path in find_fixtures():
+            name = parser_for(str(path))
+            with self.subTest(path.relative_to(FIXTURE_ROOT).as_posix()):
+                parse = getattr(parser_module(name), ENTRY_POINTS[name][1])
+                if name in PATH_ENTRY_POINTS:
+                    questions = parse(str(path))
+                else:
+                    questions = parse(iter_docx_paragraphs(str(path)), str(path))
+                self.assertTrue(questions)
+                self.assertTrue(all(type(q) is dict for q in questions))
+                self.assertEqual(json.loads(json.dumps(questions, ensure_ascii=False)), questions)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from parsers.profiling import BatchProfiler, ProfileRecord, active_profiler, disable_profiling, enable_profiling, profiled
+
+
+@profiled("demo", lambda path, size=1000: path)
+def _build(path, size=1000):
+    return [str(i) * 10 for i in range(size)]
+
+
+@profiled("outer", lambda path: path)
+def _outer(path):
+    return _build(path, 10)
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        self.previous = active_profiler()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.temp_dir = Path(directory.name)
+
+    def tearDown(self):
+        enable_profiling(self.previous) if self.previous else disable_profiling()
+
+    def test_disabled_runs_function_directly(self):
+        disable_profiling()
+        self.assertEqual(len(_build(self.temp_dir / "a.md", 5)), 5)
+        self.assertEqual(_build.__name__, "_build")
+        self.assertEqual(list(self.temp_dir.iterdir()), [])
+
+    def test_enabled_writes_reports_next_to_output(self):
+        profiler = enable_profiling(BatchProfiler(top=5, allocations=3))
+        _build(self.temp_dir / "exam.md", size=20000)
+        record = profiler.records[-1]
+        self.assertEqual((record.label, record.source), ("demo", str(self.temp_dir / "exam.md")))
+        self.assertGreater(record.peak_bytes, 0)
+        report = (self.temp_dir / "exam.demo.profile.txt").read_text(encoding="utf-8")
+        self.assertIn("_build", report)
+        self.assertTrue((self.temp_dir / "exam.demo.prof").exists())
+
+    def test_nested_entry_points_are_profiled_once(self):
+        profiler = enable_profiling(BatchProfiler())
+        self.assertEqual(len(_outer(self.temp_dir / "exam.md")), 10)
+        self.assertEqual([record.label for record in profiler.records], ["outer"])
+
+    def test_missing_output_path_skips_report(self):
+        profiler = enable_profiling(BatchProfiler())
+        _build("", 10)
+        self.assertIsNone(profiler.records[-1].report_path)
+
+    def test_outliers_against_median(self):
+        profiler = BatchProfiler(factor=3.0)
+        profiler.records = [ProfileRecord("parse", f"{i}.md", 1.0, 1000) for i in range(4)]
+        profiler.records.append(ProfileRecord("parse", "slow.md", 5.0, 1000))
+        profiler.records.append(ProfileRecord("parse", "big.md", 1.0, 10000))
+        profiler.records.append(ProfileRecord("convert", "only.pdf", 100.0, 10 ** 9))
+        self.assertEqual([(record.source, len(reasons)) for record, reasons in profiler.outliers()],
+                         [("slow.md", 1), ("big.md", 1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
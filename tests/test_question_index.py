@@ -0,0 +1,82 @@
+import multiprocessing as mp
+import tempfile
+import unittest
+from pathlib import Path
+
+from parsers.question_index import QuestionIndex, question_hash, question_key
+
+
+def _questions(count: int):
+    return [{"question": f"第{n}題：下列何者正確？", "options": {"A": f"甲{n}", "B": "乙"}} for n in range(count)]
+
+
+def _add_from_process(index_path: str, source: str, result_queue) -> None:
+    with QuestionIndex(index_path) as index:
+        result_queue.put(sum(index.add_many(_questions(200), source)))
+
+
+class TestQuestionHash(unittest.TestCase):
+    def test_normalization(self):
+        self.assertEqual(question_hash("12 下列何者，正確？"), question_hash("下列何者正確"))
+        self.assertEqual(question_hash("Which IS"), question_hash("which is"))
+        self.assertNotEqual(question_hash("下列何者正確"), question_hash("下列何者錯誤"))
+
+    def test_options_are_part_of_key(self):
+        stem = "下列何者正確？"
+        self.assertNotEqual(question_key({"question": stem, "options": {"A": "甲", "B": "乙"}}),
+                            question_key({"question": stem, "options": {"A": "丙", "B": "丁"}}))
+        self.assertEqual(question_key({"question": stem, "options": {"B": "乙", "A": "甲"}}),
+                         question_key({"question": " " + stem, "options": {"A": "甲", "B": "乙"}}))
+
+
+class TestQuestionIndex(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "index.sqlite"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_insert_or_skip_records_sources(self):
+        question = {"question": "水的化學式為何？", "options": {"A": "H2O", "B": "CO2"}}
+        with QuestionIndex(self.path) as index:
+            self.assertTrue(index.add(question, "111A/Hanlin/L1.md", 3))
+            self.assertFalse(index.add(dict(question, question="1 水的化學式為何"), "112A/Knsh/L2.md", 0))
+            self.assertIn(question, index)
+            self.assertEqual(len(index), 1)
+            self.assertEqual(index.sources(question), [("111A/Hanlin/L1.md", 3), ("112A/Knsh/L2.md", 0)])
+            self.assertEqual([count for _, count in index.duplicates()], [2])
+
+    def test_persists_between_connections(self):
+        with QuestionIndex(self.path) as index:
+            self.assertEqual(index.add_many(_questions(3), "a.md"), [True, True, True])
+        with QuestionIndex(self.path) as index:
+            self.assertEqual(index.add_many(_questions(4), "b.md"), [False, False, False, True])
+
+    def test_reregistering_a_file_keeps_its_questions(self):
+        questions = _questions(2) + _questions(1)   # 第三題與第一題重複
+        with QuestionIndex(self.path) as index:
+            self.assertEqual(index.add_many(questions, "a.md"), [True, True, False])
+            self.assertEqual(index.add_many(questions, "a.md"), [True, True, False])
+            self.assertEqual(index.add_many(questions, "b.md"), [False, False, False])
+            self.assertEqual(index.add_many(questions[1:], "a.md"), [True, True])   # 檔案內容改變，題目換了位置
+            self.assertEqual(index.sources(questions[0]), [("a.md", 1), ("b.md", 0), ("b.md", 2)])
+
+    def test_concurrent_writers(self):
+        context = mp.get_context()
+        result_queue = context.Queue()
+        processes = [context.Process(target=_add_from_process, args=(str(self.path), f"{n}.md", result_queue))
+                     for n in range(4)]
+        for process in processes:
+            process.start()
+        inserted = [result_queue.get(timeout=60) for _ in processes]
+        for process in processes:
+            process.join()
+        self.assertEqual(sum(inserted), 200)
+        with QuestionIndex(self.path) as index:
+            self.assertEqual(len(index), 200)
+            self.assertEqual(len(index.sources(_questions(1)[0])), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import json
+import unittest
+
+from parsers.base_parser import (
+    QUESTION_KEYS,
+    FileInfo,
+    QuestionRecord,
+    file_info,
+    question_dicts,
+    question_record,
+    standard_question_dict,
+)
+
+FILE_PATH = "input_md/111A/7/Hanlin/Math/Ch1-2.md"
+
+
+class TestQuestionRecord(unittest.TestCase):
+    def test_same_fields_as_standard_dict(self):
+        record = question_record("題目", {"A": "甲"}, "A", FILE_PATH, "img_001.png")
+        expected = standard_question_dict("題目", {"A": "甲"}, "A", FILE_PATH, "img_001.png")
+        self.assertEqual(record.to_dict(), expected)
+        self.assertEqual(list(record.to_dict()), list(QUESTION_KEYS))
+        self.assertEqual(record["subject"], "數學")
+        self.assertEqual(record.get("chapter"), "Ch1-2")
+
+    def test_file_info_is_shared(self):
+        first = question_record("一", {}, "", FILE_PATH)
+        second = question_record("二", {}, "", FILE_PATH)
+        self.assertIs(first.info, second.info)
+
+    def test_empty_path_uses_defaults(self):
+        self.assertEqual(file_info(""), FileInfo())
+        self.assertEqual(question_record("題目", {}, "")["scope"], "國中")
+
+    def test_overrides(self):
+        record = question_record("題目", {}, "", FILE_PATH, subject="理化", scope="高中")
+        self.assertEqual(record["subject"], "理化")
+        self.assertEqual(record["scope"], "高中")
+        self.assertEqual(record["grade"], "七年級")
+        self.assertEqual(file_info(FILE_PATH).subject, "數學")
+
+    def test_record_is_slotted(self):
+        record = QuestionRecord("題目", {}, "")
+        self.assertFalse(hasattr(record, "__dict__"))
+        with self.assertRaises(KeyError):
+            record["question_text"]
+
+    def test_question_dicts_are_json_ready(self):
+        records = [question_record("題目", {"A": "甲"}, "A", FILE_PATH), {"question": "舊格式"}]
+        data = json.loads(json.dumps(question_dicts(records), ensure_ascii=False))
+        self.assertEqual(data[0]["publisher"], "翰林")
+        self.assertEqual(data[1], {"question": "舊格式"})
+
+
+if __name__ == "__main__":
+    unittest.main()
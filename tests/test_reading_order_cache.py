@@ -0,0 +1,56 @@
+import unittest
+
+from extractor.reading_order_cache import ReadingOrderCache
+
+PAGE = [[60, 50, 400, 68], [60, 100, 380, 118], [540, 50, 900, 68], [540, 100, 860, 118]]
+
+
+def _shift(boxes, dx, dy):
+    return [[x0 + dx, y0 + dy, x1 + dx, y1 + dy] for x0, y0, x1, y1 in boxes]
+
+
+class TestReadingOrderCache(unittest.TestCase):
+    def test_hit_within_same_cells(self):
+        cache = ReadingOrderCache(tolerance=10)
+        cache.store(PAGE, [0, 1, 2, 3])
+        self.assertEqual(cache.lookup(_shift(PAGE, 2, 1)), [0, 1, 2, 3])
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_miss_outside_tolerance(self):
+        cache = ReadingOrderCache(tolerance=10)
+        cache.store(PAGE, [0, 1, 2, 3])
+        self.assertIsNone(cache.lookup(_shift(PAGE, 0, 15)))
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_lookup_returns_copy(self):
+        cache = ReadingOrderCache(tolerance=10)
+        cache.store(PAGE, [0, 1, 2, 3])
+        cache.lookup(PAGE).reverse()
+        self.assertEqual(cache.lookup(PAGE), [0, 1, 2, 3])
+
+    def test_boxes_in_same_cell_are_ambiguous(self):
+        cache = ReadingOrderCache(tolerance=10)
+        page = PAGE + [[62, 53, 200, 70]]
+        cache.store(page, [0, 4, 1, 2, 3])
+        self.assertEqual(len(cache), 0)
+        self.assertIsNone(cache.lookup(page))
+        self.assertEqual(cache.stats()["ambiguous"], 1)
+
+    def test_lru_eviction(self):
+        cache = ReadingOrderCache(tolerance=10, max_entries=2)
+        pages = [_shift(PAGE, 0, 20 * i) for i in range(3)]
+        cache.store(pages[0], [0, 1, 2, 3])
+        cache.store(pages[1], [1, 0, 2, 3])
+        cache.lookup(pages[0])
+        cache.store(pages[2], [2, 3, 0, 1])
+        self.assertEqual(cache.lookup(pages[0]), [0, 1, 2, 3])
+        self.assertIsNone(cache.lookup(pages[1]))
+        self.assertEqual(len(cache), 2)
+
+    def test_invalid_tolerance(self):
+        with self.assertRaises(ValueError):
+            ReadingOrderCache(tolerance=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from parsers.blocks import blocks_path_for
+from parsers.result_cache import ResultCache, content_key
+
+try:
+    import parsers.math_parser as math_parser
+except ImportError:  # utils.image_naming 等相依套件未安裝
+    math_parser = None
+
+MATH_EXAM = "一、單選題\n( B )1. 下列何者為質數？\n(A) 四十 (B) 五十三 (C) 六十\n"
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_key_depends_on_path_and_content(self):
+        key = content_key("111A/7/Hanlin/Math/L1.md", b"exam")
+        self.assertEqual(key, content_key("111A/7/Hanlin/Math/L1.md", b"exam"))
+        self.assertNotEqual(key, content_key("111A/7/Knsh/Math/L1.md", b"exam"))
+        self.assertNotEqual(key, content_key("111A/7/Hanlin/Math/L1.md", b"exam!"))
+
+    def test_version_bump_invalidates_only_that_parser(self):
+        cache = ResultCache(self.root, {"english": "1", "social": "1"})
+        cache.store_lines("english", "ab12", ['{"question":"a"}'])
+        cache.store_lines("social", "ab12", ['{"question":"b"}', '{"question":"c"}'])
+        self.assertEqual(cache.load_lines("english", "ab12"), ['{"question":"a"}'])
+
+        bumped = ResultCache(self.root, {"english": "2", "social": "1"})
+        self.assertIsNone(bumped.load_lines("english", "ab12"))
+        self.assertEqual(len(bumped.load_lines("social", "ab12")), 2)
+        self.assertEqual((bumped.hits, bumped.misses), (1, 1))
+        self.assertEqual(bumped.prune(), 1)
+        self.assertFalse((self.root / "english" / "1").exists())
+
+    def test_empty_result_is_cached(self):
+        cache = ResultCache(self.root, {"chinese": "1"})
+        cache.store_lines("chinese", "cd34", [])
+        self.assertEqual(cache.load_lines("chinese", "cd34"), [])
+
+    @unittest.skipIf(math_parser is None, "parsers 相依套件未安裝")
+    def test_unchanged_input_skips_parser(self):
+        path = self.root / "input_md/111A/7/Hanlin/Math/L1.md"
+        path.parent.mkdir(parents=True)
+        path.write_text(MATH_EXAM, encoding="utf-8")
+        cache = ResultCache(self.root / "cache")
+        first = cache.parse("math", str(path))
+        with mock.patch.object(math_parser, "parse_math_markdown", side_effect=AssertionError("re-parsed")):
+            second = cache.parse("math", str(path))
+        self.assertEqual(second, first)
+        self.assertEqual(second[0]["answer"], "B")
+
+        path.write_text(MATH_EXAM.replace("( B )", "( C )"), encoding="utf-8")
+        self.assertEqual(cache.parse("math", str(path))[0]["answer"], "C")
+
+    @unittest.skipIf(math_parser is None, "parsers 相依套件未安裝")
+    def test_math_key_uses_blocks_sidecar(self):
+        path = self.root / "input_md/111A/7/Hanlin/Math/L1.md"
+        path.parent.mkdir(parents=True)
+        path.write_text(MATH_EXAM, encoding="utf-8")
+        cache = ResultCache(self.root / "cache")
+        self.assertEqual(cache.parse("math", str(path))[0]["answer"], "B")
+        # 區塊檔比 .md 新時 parse_math_markdown 讀的是區塊檔，key 也要跟著區塊檔變
+        blocks = [{"kind": "text", "content": line} for line in MATH_EXAM.replace("( B )", "( C )").splitlines()]
+        blocks_path_for(path).write_text("".join(json.dumps(b) + "\n" for b in blocks), encoding="utf-8")
+        self.assertEqual(cache.parse("math", str(path))[0]["answer"], "C")
+        self.assertEqual(cache.hits, 0)
+
+    @unittest.skipIf(math_parser is None, "parsers 相依套件未安裝")
+    def test_paragraph_entry_point(self):
+        paragraphs = ["( Ａ )1. 題目一 (A)甲 (B)乙 (C)丙 (D)丁"]
+        cache = ResultCache(self.root / "cache")
+        first = cache.parse("chinese", paragraphs, "input_md/111A/7/Hanlin/Chinese/L1.docx")
+        second = cache.parse("chinese", paragraphs, "input_md/111A/7/Hanlin/Chinese/L1.docx")
+        self.assertEqual((cache.misses, cache.hits), (1, 1))
+        # 未命中與命中回傳相同的 dict，都能直接 json.dumps
+        self.assertEqual(first, second)
+        self.assertEqual(json.dumps(first, ensure_ascii=False), json.dumps(second, ensure_ascii=False))
+
+    @unittest.skipIf(math_parser is None, "parsers 相依套件未安裝")
+    def test_markdown_path_for_paragraph_parser(self):
+        path = self.root / "input_md/111A/7/Hanlin/Chinese/L1.md"
+        path.parent.mkdir(parents=True)
+        path.write_text("( Ａ )1. 題目一 (A)甲 (B)乙 (C)丙 (D)丁\n", encoding="utf-8")
+        cache = ResultCache(self.root / "cache")
+        questions = cache.parse("chinese", str(path))
+        self.assertEqual([q["answer"] for q in questions], ["A"])
+        self.assertEqual(cache.parse("chinese", path), questions)
+
+
+if __name__ == "__main__":
+    unittest.main()
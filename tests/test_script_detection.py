@@ -0,0 +1,40 @@
+import unittest
+
+from extractor.script_detection import (
+    SCRIPT_CJK,
+    SCRIPT_LATIN,
+    SCRIPT_UNKNOWN,
+    classify_script,
+    count_scripts,
+    sample_indices,
+)
+
+
+class TestScriptDetection(unittest.TestCase):
+    def test_count_scripts(self):
+        self.assertEqual(count_scripts(["下列何者正確？(A) apple", "ㄅㄆ"]), (8, 6))
+
+    def test_english_page(self):
+        texts = ["( C )1. Tom ___ to school every day.", "(A) go (B) goes (C) going (D) went"]
+        self.assertEqual(classify_script(texts), SCRIPT_LATIN)
+
+    def test_chinese_page(self):
+        texts = ["( B )1. 下列哪一個選項的字音正確？", "(A)蹣跚 (B)踟躕 (C)躊躇 (D)徘徊"]
+        self.assertEqual(classify_script(texts), SCRIPT_CJK)
+
+    def test_mixed_page_stays_on_default(self):
+        texts = ["Read the passage and answer the questions.", "閱讀下文，回答問題"]
+        self.assertEqual(classify_script(texts), SCRIPT_CJK)
+
+    def test_too_few_letters(self):
+        self.assertEqual(classify_script(["1.", "(A) 3", "x"]), SCRIPT_UNKNOWN)
+
+    def test_sample_indices_cover_page(self):
+        self.assertEqual(sample_indices(3, 6), [0, 1, 2])
+        indices = sample_indices(100, 6)
+        self.assertEqual(len(indices), 6)
+        self.assertEqual((indices[0], indices[-1]), (0, 99))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""build_question_bank.py
+整批解析 input_md（.md / .docx）成一個題庫 JSONL，依科目資料夾自動選擇 parser，
+以多個行程平行解析，最後列出各 parser 的檔案數、題數、耗時與錯誤數。
+
+    python tools/build_question_bank.py input_md --out question_bank.jsonl.gz --workers 8
+    python tools/build_question_bank.py input_md --index question_index.sqlite   # 跨檔案去除完全重複題
+    python tools/build_question_bank.py input_md --cache .parser_cache           # 沒變的檔案直接讀回上次結果
+    python tools/build_question_bank.py input_md --profile                       # 每個檔案的剖析報告寫在輸入檔旁邊
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from parsers.corpus import build_corpus, find_corpus_files
+from parsers.profiling import active_profiler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse every exam under a folder into one JSONL question bank")
+    parser.add_argument("root_dir", nargs="?", type=Path, default=Path("input_md"), help="題庫資料夾 (default: input_md)")
+    parser.add_argument("--out", type=Path, default=Path("question_bank.jsonl"), help="輸出 JSONL，副檔名 .gz 時以 gzip 壓縮 (default: question_bank.jsonl)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="平行解析的行程數 (default: CPU 核心數)")
+    parser.add_argument("--chunksize", type=int, help="每次分派給 worker 的檔案數 (default: 檔案數 / (workers * 4))")
+    parser.add_argument("--index", type=Path, help="重複題索引 (SQLite)，已登記過的題目不再輸出，可跨多次執行共用")
+    parser.add_argument("--cache", type=Path, help="解析結果快取資料夾，內容與 parser 版本都沒變的檔案不重新解析")
+    parser.add_argument("--profile", action="store_true", help="剖析每個解析的檔案並列出明顯偏慢的檔案（也可設定環境變數 PDF2MD_PROFILE=1）")
+    args = parser.parse_args()
+
+    files = find_corpus_files(args.root_dir)
+    if not files:
+        print(f"❌ 找不到任何 .md / .docx 檔案: {args.root_dir}")
+        sys.exit(1)
+    print(f"🔍 找到 {len(files)} 個檔案，使用 {args.workers} 個行程解析")
+
+    report = build_corpus(files, args.out, workers=args.workers, chunksize=args.chunksize, index_path=args.index,
+                          cache_dir=args.cache, profile=args.profile)
+
+    print("📊 各 parser 統計:")
+    print(f"  {'parser':<10}{'檔案':>6}{'題數':>8}{'重複':>6}{'快取':>6}{'耗時(秒)':>10}{'錯誤':>6}")
+    for name, stats in sorted(report.parsers.items()):
+        print(f"  {name:<10}{stats.files:>6}{stats.questions:>8}{stats.duplicates:>6}{stats.cached:>6}{stats.seconds:>10.2f}{stats.errors:>6}")
+    if report.skipped:
+        print(f"⚠️ 略過 {len(report.skipped)} 個無法對應科目的檔案")
+    for path, error in report.errors:
+        print(f"❌ {path}: {error}")
+    print(f"✅ 共 {report.questions} 題 → {args.out} (耗時: {report.wall_seconds:.1f}秒)")
+
+    profiler = active_profiler()
+    if profiler is not None:
+        profiler.print_summary()
+
+
+if __name__ == "__main__":
+    main()
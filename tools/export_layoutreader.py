@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""export_layoutreader.py
+把 LayoutReader（閱讀順序模型）匯出成 ONNX，batch 與序列長度皆為動態，
+可選擇另外產生 INT8 動態量化版本。輸出檔放在模型資料夾，ExamLayoutOrder 會自動使用：
+    layoutreader.onnx       (fp32)
+    layoutreader.int8.onnx  (--quantize)
+
+    python tools/export_layoutreader.py --model-dir model/models--hantian--layoutreader/snapshots/<rev> --quantize
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+import torch
+
+sys.path.append(str(Path(__file__).parent.parent))
+from extractor.layout_order import load_layoutreader_mmap
+from extractor.layoutreader_onnx import (
+    LAYOUTREADER_INT8_ONNX_NAME,
+    LAYOUTREADER_ONNX_NAME,
+    build_batch_inputs,
+)
+
+ONNX_OPSET = 17
+INPUT_NAMES = ["input_ids", "bbox", "attention_mask"]
+
+
+def export_onnx(model, output_path: Path, opset: int = ONNX_OPSET) -> Path:
+    """匯出 ONNX，input_ids / bbox / attention_mask 的 batch 與序列長度為動態"""
+    model = model.eval().float()
+    sample = build_batch_inputs([[[100, 100, 400, 120], [100, 140, 400, 160], [500, 100, 900, 120]]] * 2)
+    args = tuple(torch.from_numpy(sample[name]) for name in INPUT_NAMES)
+    dynamic_axes = {
+        "input_ids": {0: "batch", 1: "sequence"},
+        "bbox": {0: "batch", 1: "sequence"},
+        "attention_mask": {0: "batch", 1: "sequence"},
+        "logits": {0: "batch", 1: "sequence"},
+    }
+    export_kwargs = dict(
+        input_names=INPUT_NAMES,
+        output_names=["logits"],
+        dynamic_axes=dynamic_axes,
+        opset_version=opset,
+        do_constant_folding=True,
+    )
+    temp_path = output_path.with_name(f"{output_path.name}.tmp")
+    with torch.no_grad():
+        try:
+            # 新版 torch 預設使用 dynamo 匯出，這裡固定使用 TorchScript 匯出器
+            torch.onnx.export(model, args, str(temp_path), dynamo=False, **export_kwargs)
+        except TypeError:
+            torch.onnx.export(model, args, str(temp_path), **export_kwargs)
+    temp_path.replace(output_path)
+    return output_path
+
+
+def quantize_onnx(fp32_path: Path, output_path: Optional[Path] = None) -> Path:
+    """INT8 動態量化（只量化 MatMul 權重，不需要校正資料）"""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    output_path = output_path or fp32_path.with_name(LAYOUTREADER_INT8_ONNX_NAME)
+    quantize_dynamic(fp32_path, output_path, weight_type=QuantType.QInt8, op_types_to_quantize=["MatMul"])
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the LayoutReader reading-order model to ONNX")
+    parser.add_argument("--model-dir", type=Path, required=True, help="layoutreader snapshot 資料夾（含 config.json 與 model.safetensors）")
+    parser.add_argument("--output-dir", type=Path, help="輸出資料夾 (default: 與 --model-dir 相同)")
+    parser.add_argument("--opset", type=int, default=ONNX_OPSET, help=f"ONNX opset (default: {ONNX_OPSET})")
+    parser.add_argument("--quantize", action="store_true", help="另外產生 INT8 動態量化版本")
+    args = parser.parse_args()
+
+    output_dir = args.output_dir or args.model_dir
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    start_time = time.time()
+    model = load_layoutreader_mmap(args.model_dir)
+    onnx_path = export_onnx(model, output_dir / LAYOUTREADER_ONNX_NAME, args.opset)
+    print(f"✅ 匯出完成: {onnx_path} (耗時: {time.time() - start_time:.1f}秒)")
+
+    if args.quantize:
+        start_time = time.time()
+        int8_path = quantize_onnx(onnx_path)
+        print(f"✅ INT8 量化完成: {int8_path} (耗時: {time.time() - start_time:.1f}秒)")
+
+
+if __name__ == "__main__":
+    main()
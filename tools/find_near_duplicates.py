@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""find_near_duplicates.py
+在題庫 JSONL（build_question_bank.py 的輸出）中找出近似重複的題目，每組配對輸出一行 JSONL：
+{"line": 題目所在行號, "duplicate_of": 較早出現的題目行號, "similarity": 估計相似度, ...}
+
+指定 --signatures 時會先載入上次保存的簽章，新題目也會和舊題庫比對，結束後寫回（增量使用）。
+
+    python tools/find_near_duplicates.py question_bank.jsonl.gz --out near_duplicates.jsonl
+    python tools/find_near_duplicates.py new_bank.jsonl --signatures bank_signatures.npz
+"""
+
+import argparse
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from parsers.jsonl_io import iter_jsonl, write_jsonl
+from parsers.near_duplicates import THRESHOLD, NearDuplicateIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find near-duplicate questions in a JSONL question bank")
+    parser.add_argument("bank", type=Path, help="題庫 JSONL / JSONL.gz")
+    parser.add_argument("--out", type=Path, default=Path("near_duplicates.jsonl"), help="輸出配對 JSONL (default: near_duplicates.jsonl)")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help=f"估計 Jaccard 相似度門檻 (default: {THRESHOLD})")
+    parser.add_argument("--signatures", type=Path, help="簽章檔 (.npz)，存在時先載入，結束後寫回")
+    parser.add_argument("--batch", type=int, default=10000, help="每批計算簽章的題數 (default: 10000)")
+    args = parser.parse_args()
+
+    if args.signatures and args.signatures.exists():
+        index = NearDuplicateIndex.load(args.signatures)
+        index.threshold = args.threshold
+        print(f"🔍 載入 {len(index)} 題的簽章: {args.signatures}")
+    else:
+        index = NearDuplicateIndex(args.threshold)
+
+    start_time = time.time()
+    key_prefix = f"{args.bank}:"
+    questions = iter_jsonl(args.bank)
+    pairs = []
+    line = 0
+    while True:
+        batch = list(islice(questions, args.batch))
+        if not batch:
+            break
+        keys = [f"{key_prefix}{line + n + 1}" for n in range(len(batch))]
+        for n, matches in enumerate(index.add_many(batch, keys)):
+            for key, similarity in matches:
+                pairs.append({
+                    "line": keys[n],
+                    "duplicate_of": key,
+                    "similarity": round(similarity, 3),
+                    "question": batch[n].get("question"),
+                })
+        line += len(batch)
+        print(f"📊 已處理 {line} 題，找到 {len(pairs)} 組近似重複")
+
+    write_jsonl(pairs, args.out)
+    if args.signatures:
+        index.save(args.signatures)
+        print(f"✅ 簽章已保存: {args.signatures}（共 {len(index)} 題）")
+    print(f"✅ {line} 題 → {args.out}（{len(pairs)} 組，耗時: {time.time() - start_time:.1f}秒）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""quantize_ocr_models.py
+為 PP-OCR 的 det / rec ONNX 模型建立 INT8 版本，並產生與 FP32 的比較報告。
+
+建立量化模型（動態量化 + 以本地校正集做靜態量化）：
+    python tools/quantize_ocr_models.py build --model-dir model --calib-dir calib_crops
+
+比較各精度的字元正確率與每秒行數：
+    python tools/quantize_ocr_models.py report --model-dir model --calib-dir calib_crops
+
+校正集格式與 PaddleOCR 辨識資料相同：`calib_crops/labels.txt` 每行為
+`圖片相對路徑<TAB>正確文字`，圖片為考卷上裁切下來的單行文字。
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+from extractor.ocr import ExamOCR, OCR_VARIANTS, variant_model_path
+
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+def load_labels(calib_dir: Path, labels_name: str = "labels.txt") -> List[Tuple[Path, str]]:
+    """讀取校正集標註，回傳 (圖片路徑, 正確文字) 列表"""
+    labels_path = calib_dir / labels_name
+    samples = []
+    with open(labels_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line or "\t" not in line:
+                continue
+            image_name, text = line.split("\t", 1)
+            samples.append((calib_dir / image_name, text))
+    return samples
+
+
+def iter_images(image_dir: Path, limit: Optional[int] = None) -> Iterator[np.ndarray]:
+    """依檔名順序讀取資料夾內的圖片"""
+    count = 0
+    for path in sorted(image_dir.rglob("*")):
+        if path.suffix.lower() not in IMAGE_SUFFIXES:
+            continue
+        image = cv2.imread(str(path))
+        if image is None:
+            continue
+        yield image
+        count += 1
+        if limit is not None and count >= limit:
+            return
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein 距離"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def _create_ocr(model_dir: Path, variant: str) -> ExamOCR:
+    from doc_page_extractor import HuggingfaceModel
+    return ExamOCR("cpu", HuggingfaceModel(model_dir), variant=variant)
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 量化
+# ────────────────────────────────────────────────────────────────────────────────
+
+def _calibration_reader(session_input: str, tensors: List[np.ndarray]):
+    from onnxruntime.quantization import CalibrationDataReader
+
+    class _TensorReader(CalibrationDataReader):
+        def __init__(self):
+            self._iter = iter(tensors)
+
+        def get_next(self) -> Optional[Dict[str, np.ndarray]]:
+            tensor = next(self._iter, None)
+            return None if tensor is None else {session_input: tensor}
+
+    return _TensorReader()
+
+
+def _det_calibration_tensors(text_system, images: List[np.ndarray]) -> List[np.ndarray]:
+    from doc_page_extractor.onnxocr.imaug import transform
+
+    tensors = []
+    for image in images:
+        data = transform({"image": image}, text_system.text_detector.preprocess_op)
+        if data is None or data[0] is None:
+            continue
+        tensors.append(np.expand_dims(data[0], axis=0).astype(np.float32))
+    return tensors
+
+
+def _rec_calibration_tensors(text_system, images: List[np.ndarray]) -> List[np.ndarray]:
+    recognizer = text_system.text_recognizer
+    _, img_h, img_w = recognizer.rec_image_shape
+    max_wh_ratio = img_w / float(img_h)
+    return [
+        recognizer.resize_norm_img(image, max_wh_ratio)[np.newaxis, :].astype(np.float32)
+        for image in images
+    ]
+
+
+def build_variants(model_dir: Path, calib_dir: Path, variants: List[str],
+                   pages_dir: Optional[Path] = None, max_calib: int = 200) -> None:
+    """產生 det / rec 的量化模型"""
+    from onnxruntime.quantization import QuantFormat, QuantType, quantize_dynamic, quantize_static
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    ocr = _create_ocr(model_dir, "fp32")
+    text_system = ocr._get_text_system()
+    rec_path, _, det_path, _ = [Path(p) for p in ocr._make_model_paths()]
+
+    crops = list(iter_images(calib_dir, max_calib))
+    pages = list(iter_images(pages_dir, max_calib)) if pages_dir else crops
+    print(f"🔍 校正集：{len(crops)} 張文字行圖片，{len(pages)} 張偵測用圖片")
+
+    calibration = {
+        "det": (det_path, lambda: _det_calibration_tensors(text_system, pages)),
+        "rec": (rec_path, lambda: _rec_calibration_tensors(text_system, crops)),
+    }
+
+    for name, (fp32_path, make_tensors) in calibration.items():
+        for variant in variants:
+            output_path = variant_model_path(fp32_path, variant)
+            start_time = time.time()
+            if variant == "int8_dynamic":
+                quantize_dynamic(fp32_path, output_path, weight_type=QuantType.QInt8)
+            elif variant == "int8_static":
+                tensors = make_tensors()
+                if not tensors:
+                    print(f"   ⚠️  {name} 沒有可用的校正資料，跳過靜態量化")
+                    continue
+                preprocessed_path = output_path.with_name(f"{fp32_path.stem}.preprocessed.onnx")
+                quant_pre_process(fp32_path, preprocessed_path)
+                input_name = text_system.text_detector.det_input_name[0] if name == "det" \
+                    else text_system.text_recognizer.rec_input_name[0]
+                quantize_static(
+                    preprocessed_path,
+                    output_path,
+                    _calibration_reader(input_name, tensors),
+                    quant_format=QuantFormat.QDQ,
+                    per_channel=True,
+                    activation_type=QuantType.QUInt8,
+                    weight_type=QuantType.QInt8,
+                )
+                preprocessed_path.unlink(missing_ok=True)
+            else:
+                continue
+            elapsed = time.time() - start_time
+            print(f"✅ {name} {variant}: {output_path} (耗時: {elapsed:.1f}秒)")
+
+
+# ────────────────────────────────────────────────────────────────────────────────
+# 報告
+# ────────────────────────────────────────────────────────────────────────────────
+
+def evaluate_variant(model_dir: Path, variant: str, samples: List[Tuple[Path, str]],
+                     pages: List[np.ndarray]) -> Dict[str, float]:
+    """量測單一精度的字元正確率與每秒行數"""
+    ocr = _create_ocr(model_dir, variant)
+    text_system = ocr._get_text_system()
+
+    images, truths = [], []
+    for image_path, text in samples:
+        image = cv2.imread(str(image_path))
+        if image is not None:
+            images.append(image)
+            truths.append(text)
+
+    # 先跑一次讓 session 建立，避免把載入時間算進速度
+    text_system.text_recognizer(images[:1])
+    start_time = time.perf_counter()
+    results = text_system.text_recognizer(images)
+    rec_elapsed = time.perf_counter() - start_time
+
+    errors = sum(edit_distance(pred, truth) for (pred, _), truth in zip(results, truths))
+    total_chars = sum(len(truth) for truth in truths) or 1
+    exact = sum(pred == truth for (pred, _), truth in zip(results, truths))
+
+    metrics = {
+        "char_accuracy": max(0.0, 1.0 - errors / total_chars),
+        "line_accuracy": exact / max(len(truths), 1),
+        "rec_lines_per_sec": len(images) / rec_elapsed if rec_elapsed > 0 else 0.0,
+    }
+
+    if pages:
+        text_system(pages[0])
+        line_count = 0
+        start_time = time.perf_counter()
+        for page in pages:
+            boxes, _ = text_system(page)
+            line_count += len(boxes or [])
+        page_elapsed = time.perf_counter() - start_time
+        metrics["page_lines_per_sec"] = line_count / page_elapsed if page_elapsed > 0 else 0.0
+    return metrics
+
+
+def write_report(model_dir: Path, calib_dir: Path, variants: List[str], output_path: Path,
+                 pages_dir: Optional[Path] = None) -> None:
+    """輸出 Markdown 比較報告"""
+    samples = load_labels(calib_dir)
+    pages = list(iter_images(pages_dir)) if pages_dir else []
+    print(f"🔍 評估資料：{len(samples)} 行文字，{len(pages)} 頁")
+
+    rows = {}
+    for variant in variants:
+        rows[variant] = evaluate_variant(model_dir, variant, samples, pages)
+        print(f"✅ {variant}: 字元正確率 {rows[variant]['char_accuracy']:.4f}，"
+              f"{rows[variant]['rec_lines_per_sec']:.1f} 行/秒")
+
+    baseline = rows.get("fp32")
+    lines = [
+        "# OCR INT8 量化報告",
+        "",
+        f"- 校正/評估資料：`{calib_dir}`（{len(samples)} 行）",
+        f"- 整頁測試：{len(pages)} 頁" if pages else "- 整頁測試：未提供",
+        f"- 產生時間：{time.strftime('%Y-%m-%d %H:%M:%S')}",
+        "",
+        "| 精度 | 字元正確率 | 整行正確率 | 辨識 行/秒 | 整頁 行/秒 | 速度倍率 | 正確率差異 |",
+        "|---|---|---|---|---|---|---|",
+    ]
+    for variant, metrics in rows.items():
+        speedup = accuracy_delta = "-"
+        if baseline and variant != "fp32":
+            speedup = f"{metrics['rec_lines_per_sec'] / max(baseline['rec_lines_per_sec'], 1e-9):.2f}x"
+            accuracy_delta = f"{(metrics['char_accuracy'] - baseline['char_accuracy']) * 100:+.2f}%"
+        page_speed = f"{metrics['page_lines_per_sec']:.1f}" if "page_lines_per_sec" in metrics else "-"
+        lines.append(
+            f"| {variant} | {metrics['char_accuracy']:.4f} | {metrics['line_accuracy']:.4f} | "
+            f"{metrics['rec_lines_per_sec']:.1f} | {page_speed} | {speedup} | {accuracy_delta} |"
+        )
+
+    output_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    print(f"📊 報告已輸出: {output_path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and evaluate INT8 variants of the PP-OCR ONNX models")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="產生量化模型")
+    build.add_argument("--model-dir", type=Path, default=Path("model"), help="模型快取資料夾 (default: model)")
+    build.add_argument("--calib-dir", type=Path, required=True, help="考卷文字行圖片資料夾")
+    build.add_argument("--pages-dir", type=Path, help="偵測模型校正用的整頁圖片資料夾（預設使用 calib-dir）")
+    build.add_argument("--variants", nargs="+", choices=OCR_VARIANTS[1:], default=list(OCR_VARIANTS[1:]))
+    build.add_argument("--max-calib", type=int, default=200, help="最多使用幾張校正圖片 (default: 200)")
+
+    report = sub.add_parser("report", help="比較各精度的正確率與速度")
+    report.add_argument("--model-dir", type=Path, default=Path("model"), help="模型快取資料夾 (default: model)")
+    report.add_argument("--calib-dir", type=Path, required=True, help="含 labels.txt 的文字行圖片資料夾")
+    report.add_argument("--pages-dir", type=Path, help="整頁圖片資料夾，提供時會加測整頁行/秒")
+    report.add_argument("--variants", nargs="+", choices=OCR_VARIANTS, default=list(OCR_VARIANTS))
+    report.add_argument("--output", type=Path, default=Path("ocr_int8_report.md"))
+
+    args = parser.parse_args()
+    if args.command == "build":
+        build_variants(args.model_dir, args.calib_dir, args.variants, args.pages_dir, args.max_calib)
+    else:
+        write_report(args.model_dir, args.calib_dir, args.variants, args.output, args.pages_dir)
+
+
+if __name__ == "__main__":
+    main()